@@ -0,0 +1,90 @@
+import os
+import json
+import pickle
+import argparse
+import datetime
+import numpy as np
+
+# Model classes written into the synthetic config.json files
+MODEL_NAMES = ["RandomForestClassifier", "LogisticRegression", "GradientBoostingClassifier", "SVC"]
+DATASETS = ["heart.csv", "credit.csv", "churn.csv"]
+
+
+def make_test_set(n_rows, n_features=20, seed=0):
+    """Synthetic binary classification test set (X float32 matrix, y int labels)."""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_rows, n_features), dtype=np.float32)
+    weights = rng.standard_normal(n_features)
+    y = (X @ weights + rng.standard_normal(n_rows) > 0).astype(np.int64)
+    return X, y
+
+
+def make_model(n_features=20, seed=0):
+    """A small fitted model, used both for the model.pkl files and the evaluation benchmarks."""
+    from sklearn.linear_model import LogisticRegression
+    X, y = make_test_set(2000, n_features, seed)
+    return LogisticRegression(max_iter=200).fit(X, y)
+
+
+def _experiment_documents(rng, i):
+    accuracy = float(rng.uniform(0.5, 0.99))
+    tp, fn, fp, tn = rng.integers(0, 500, size=4).tolist()
+    metrics = {
+        "accuracy": accuracy,
+        "f1_score": float(np.clip(accuracy + rng.normal(0, 0.02), 0, 1)),
+        "precision": float(np.clip(accuracy + rng.normal(0, 0.03), 0, 1)),
+        "recall": float(np.clip(accuracy + rng.normal(0, 0.03), 0, 1)),
+        "confusion_matrix": [[tn, fp], [fn, tp]],
+        "loss": 0.0,
+        "timestamp": datetime.datetime(2025, 1, 1).isoformat(),
+    }
+    config = {
+        "model_name": MODEL_NAMES[i % len(MODEL_NAMES)],
+        "parameters": {
+            "n_estimators": int(rng.choice([50, 100, 200, 400])),
+            "max_depth": int(rng.integers(2, 32)),
+            "random_state": i,
+        },
+        "dataset": DATASETS[i % len(DATASETS)],
+        "created_at": "2025-01-01 00:00:00",
+        "model_artifact": {"file": "model.pkl", "format": "pickle"},
+    }
+    return metrics, config
+
+
+def generate_experiment_tree(root, n_experiments, seed=0, with_models=True):
+    """
+    Create a synthetic experiments/ tree with exp1..expN folders.
+
+    Every folder gets a realistic metrics.json and config.json, and (with_models) the same
+    pickled LogisticRegression as model.pkl.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(root, exist_ok=True)
+    model_bytes = pickle.dumps(make_model(seed=seed)) if with_models else None
+    for i in range(1, n_experiments + 1):
+        exp_path = os.path.join(root, f"exp{i}")
+        os.makedirs(exp_path, exist_ok=True)
+        metrics, config = _experiment_documents(rng, i)
+        with open(os.path.join(exp_path, "metrics.json"), 'w') as f:
+            json.dump(metrics, f, indent=2)
+        with open(os.path.join(exp_path, "config.json"), 'w') as f:
+            json.dump(config, f, indent=2)
+        if model_bytes is not None:
+            with open(os.path.join(exp_path, "model.pkl"), 'wb') as f:
+                f.write(model_bytes)
+    return root
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic experiments tree.")
+    parser.add_argument("root", help="Folder to create the experiments in")
+    parser.add_argument("--size", type=int, default=1000, help="Number of experiment folders")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-models", action="store_true", help="Do not write model.pkl files")
+    args = parser.parse_args()
+    generate_experiment_tree(args.root, args.size, args.seed, with_models=not args.no_models)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import datetime
+import tempfile
+import subprocess
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+
+from benchmarks.generate import generate_experiment_tree, make_test_set, make_model
+from scripts.experiment_catalog import CATALOG_FILENAME
+
+
+def measure(fn, setup=None, repeat=3, memory=True):
+    """
+    Time fn (best of `repeat` runs) and measure its peak Python memory in one extra traced run.
+
+    setup is called before every run and is not timed (e.g. to drop the catalog for a cold load).
+    Returns (seconds, peak_mb).
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return min(times), peak_mb
+
+
+def _record(results, stage, size, seconds, peak_mb):
+    results.append({
+        "stage": stage,
+        "size": size,
+        "seconds": seconds,
+        "items_per_second": size / seconds if seconds > 0 else None,
+        "peak_mb": peak_mb,
+    })
+    peak = f"{peak_mb:.1f} MB" if peak_mb is not None else "-"
+    print(f"{stage:<28} {size:>10}  {seconds * 1000:>10.1f} ms  {peak:>10}")
+
+
+def bench_experiment_tree(root, size, results, repeat=3, memory=True):
+    """Benchmark loading, ranking and plotting on a synthetic tree of `size` experiments."""
+    from scripts.compare_metrics import (load_exp_metrics, load_exp_configs, conversion_to_df,
+                                         give_recommendation, leaderboard, plot_metrics)
+    from scripts.run_dashboard import load_all_metrics
+    import matplotlib.pyplot as plt
+
+    generate_experiment_tree(root, size)
+    catalog_path = os.path.join(root, CATALOG_FILENAME)
+
+    def drop_catalog():
+        if os.path.exists(catalog_path):
+            os.remove(catalog_path)
+
+    _record(results, "load_exp_metrics_cold", size,
+            *measure(lambda: load_exp_metrics(root), setup=drop_catalog, repeat=repeat, memory=memory))
+    load_exp_metrics(root)
+    _record(results, "load_exp_metrics_warm", size, *measure(lambda: load_exp_metrics(root), repeat=repeat, memory=memory))
+    _record(results, "load_exp_configs_warm", size, *measure(lambda: load_exp_configs(root), repeat=repeat, memory=memory))
+    _record(results, "dashboard_load", size,
+            *measure(lambda: conversion_to_df(load_all_metrics(root)), repeat=repeat, memory=memory))
+
+    metrics_df = conversion_to_df(load_exp_metrics(root))
+    _record(results, "give_recommendation", size,
+            *measure(lambda: give_recommendation(metrics_df, priority_metric="f1_score"), repeat=repeat, memory=memory))
+    _record(results, "leaderboard_top20", size,
+            *measure(lambda: leaderboard(metrics_df, "f1_score", k=20), repeat=repeat, memory=memory))
+
+    plot_path = os.path.join(root, "plot.png")
+
+    def plot():
+        plot_metrics(metrics_df, plot_path)
+        plt.close("all")
+
+    _record(results, "plot_metrics", size, *measure(plot, repeat=repeat, memory=memory))
+
+
+def bench_evaluation(workdir, n_rows, results, repeat=3, memory=True):
+    """Benchmark evaluation and packaging on a synthetic test set of n_rows rows."""
+    from scripts.package_results import evaluate_classification_model, package_results
+
+    X, y = make_test_set(n_rows)
+    model = make_model()
+    _record(results, "evaluate_classification_model", n_rows,
+            *measure(lambda: evaluate_classification_model(model, X, y), repeat=repeat, memory=memory))
+
+    output_dir = os.path.join(workdir, f"packaging_{n_rows}")
+    _record(results, "package_results", n_rows,
+            *measure(lambda: package_results(model, X, y, output_dir=output_dir), repeat=repeat, memory=memory))
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(old, new):
+    """Print the speed ratio of every stage found in both result files (>1 means new is faster)."""
+    old_index = {(r["stage"], r["size"]): r for r in old["results"]}
+    print(f"\n{'stage':<28} {'size':>10}  {'old ms':>10}  {'new ms':>10}  {'speedup':>8}")
+    for r in new["results"]:
+        before = old_index.get((r["stage"], r["size"]))
+        if before is None:
+            continue
+        print(f"{r['stage']:<28} {r['size']:>10}  {before['seconds'] * 1000:>10.1f}  {r['seconds'] * 1000:>10.1f}"
+              f"  {before['seconds'] / r['seconds']:>7.2f}x")
+
+
+def run_benchmarks(sizes=(1000,), test_rows=(100_000,), repeat=3, memory=True, workdir=None):
+    """
+    Run the whole suite and return the results as a JSON-serializable dict.
+
+    Parameters:
+    -----------
+    sizes : iterable of int
+        Number of experiment folders of each synthetic tree (e.g. 1000, 10000, 100000)
+    test_rows : iterable of int
+        Number of rows of each synthetic test set
+    repeat : int
+        Runs per stage, the best time is kept
+    memory : bool
+        Also measure the peak memory of each stage with tracemalloc (one extra run)
+    workdir : str or None
+        Where the synthetic data is created (default: a temporary folder, removed afterwards)
+    """
+    # package_results configures INFO logging when imported, keep the benchmark output readable
+    import scripts.package_results  # noqa: F401
+    logging.getLogger().setLevel(logging.WARNING)
+    cleanup = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="mlops_bench_")
+    results = []
+    try:
+        for size in sizes:
+            bench_experiment_tree(os.path.join(workdir, f"experiments_{size}"), size, results, repeat, memory)
+        for n_rows in test_rows:
+            bench_evaluation(workdir, n_rows, results, repeat, memory)
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created_at": datetime.datetime.now().isoformat(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of the platform.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000],
+                        help="Number of experiments of each synthetic tree (e.g. 1000 10000 100000)")
+    parser.add_argument("--test-rows", type=int, nargs="+", default=[100_000],
+                        help="Number of rows of each synthetic test set")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage, the best time is kept")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory run")
+    parser.add_argument("--workdir", default=None, help="Keep the synthetic data in this folder")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON file to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.test_rows, args.repeat, not args.no_memory, args.workdir)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
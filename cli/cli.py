@@ -1,15 +1,11 @@
 import click
-import pickle
-import subprocess
-import os
-import pandas as pd
-import json
-import matplotlib.pyplot as plt 
-from pathlib import Path
-
-from scripts.package_results import package_results
-from scripts.compare_metrics import run_compare_metrics
-from scripts.run_dashboard import run_dashboard_ui
+
+# Only light modules are imported here: pandas, matplotlib, sklearn and streamlit are imported
+# inside the commands that need them, so `mlops hello` and `mlops --help` start instantly
+from scripts.defaults import (DEFAULT_BATCH_SIZE, DEFAULT_BENCHMARK_BATCH_SIZES, DEFAULT_BENCHMARK_REPEATS,
+                             DEFAULT_GC_GRACE_SECONDS, DEFAULT_COMPACT_MIN_AGE_SECONDS, DEFAULT_PACK_EXPERIMENTS,
+                             DEFAULT_WATCH_DEBOUNCE_SECONDS, DEFAULT_WATCH_MAX_LATENCY_SECONDS, DEFAULT_WATCH_TOP_K,
+                             DEFAULT_API_HOST, DEFAULT_API_PORT, DEFAULT_API_REFRESH_SECONDS, DEFAULT_STREAM_FLUSH_SECONDS)
 
 @click.group()
 def cli():
@@ -34,49 +30,90 @@ So, we allow users to specify the label column name via a parameter.
 After receiving the file, the system automatically splits the data into features (X) and labels (y),
 which are used for model evaluation and result packaging.
 
+The test file is streamed in chunks (--chunksize rows at a time) and every chunk goes straight to
+evaluation, so even very large test sets are packaged in constant memory.
+Parquet and Feather files are also accepted, which skips CSV parsing entirely.
+
+With --benchmark-inference, predict is also timed on the first rows of the test data at several
+batch sizes, and the latency percentiles, throughput and model size are stored in metrics.json
+so that experiments can be ranked by serving cost as well as by accuracy.
+
 Finally, the package_results function from scripts/package_results.py is called to complete the packaging.
 '''
 
 @cli.command()
 @click.option('--model-path', required=True, help='Path to model.pkl')
-@click.option('--test-csv', default=None, help='Path to combined test CSV (features + label)')
+@click.option('--test-csv', default=None, help='Path to combined test data (features + label), CSV, Parquet or Feather')
 @click.option('--label-col', default="label", help='Column name of label in CSV')
 @click.option('--dataset-name', default="unknown_dataset", help='Name of dataset')
-def package_results_cli(model_path, test_csv, label_col, dataset_name):
+@click.option('--test-format', type=click.Choice(['auto', 'csv', 'parquet', 'feather']), default='auto',
+              help='Format of the test data file (auto: from the file extension)')
+@click.option('--chunksize', type=int, default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Number of test rows read and evaluated at once')
+@click.option('--csv-engine', type=click.Choice(['c', 'python', 'pyarrow']), default='c',
+              help='Parser used for CSV test data')
+@click.option('--dtype', default=None, help="dtype of the feature columns, e.g. float32 or age:int16,chol:float32")
+@click.option('--downcast', is_flag=True, help='Downcast float64 features to float32 and integers to the smallest type')
+@click.option('--model-format', type=click.Choice(['pickle', 'joblib']), default='pickle',
+              help='Serialization format of the packaged model (joblib is faster for large NumPy-based models)')
+@click.option('--compress', type=click.IntRange(0, 9), default=0,
+              help='joblib compression level, 0 keeps the model memory-mappable')
+@click.option('--trace', is_flag=True, help='Also export the packaging stages as a Chrome trace (trace.json)')
+@click.option('--cprofile', is_flag=True, help='Run the packaging under cProfile and save cprofile.prof')
+@click.option('--benchmark-inference', is_flag=True,
+              help='Measure predict latency, throughput and model size (saved in metrics.json and inference.json)')
+@click.option('--benchmark-batch-sizes', default=",".join(map(str, DEFAULT_BENCHMARK_BATCH_SIZES)), show_default=True,
+              help='Comma-separated batch sizes timed by --benchmark-inference')
+@click.option('--benchmark-repeats', type=click.IntRange(1), default=DEFAULT_BENCHMARK_REPEATS, show_default=True,
+              help='Timed predict calls per batch size')
+@click.option('--save-predictions/--no-save-predictions', default=True, show_default=True,
+              help='Cache labels, predictions and probabilities as .npy files for the reevaluate command')
+@click.option('--bootstrap', type=click.IntRange(0), default=0,
+              help='Number of bootstrap resamples for confidence intervals of the metrics (0 = none, e.g. 1000)')
+@click.option('--confidence', type=click.FloatRange(0, 1, min_open=True, max_open=True), default=0.95, show_default=True,
+              help='Confidence level of the bootstrap intervals')
+@click.option('--dedup', is_flag=True,
+              help='Store the model once in the content-addressed blob store (experiments/.blobs) instead of expN/')
+def package_results_cli(model_path, test_csv, label_col, dataset_name, test_format, chunksize, csv_engine, dtype, downcast,
+                        model_format, compress, trace, cprofile, benchmark_inference, benchmark_batch_sizes,
+                        benchmark_repeats, save_predictions, bootstrap, confidence, dedup):
     """Package experiment results"""
     click.echo("Packaging experiment results ...")
 
     try:
-        # Load model object from .pkl file
-        # Deserialize the provided model.pkl file into a Python model object
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        from scripts.package_results import package_results
+        from scripts.data_loading import iter_labeled_batches, read_columns, parse_dtype
+        from scripts.serialization import load_model
 
-        # Prepare test data if CSV is provided
-        # Split the test data into X (features) and y (labels) as numpy arrays
-        test_x = None
-        test_y = None
+        # Load model object from .pkl (or .joblib) file
+        # Deserialize the provided model file into a Python model object
+        model = load_model(model_path)
 
-        if test_csv:
-            # Load CSV file as a DataFrame
-            df = pd.read_csv(test_csv)
+        # Prepare test data if a file is provided
+        # The file is streamed in chunks of (X features, y labels), so it never has to fit in memory
+        test_batches = None
 
-            # Check if the label column exists to avoid user input errors
-            if label_col not in df.columns:
+        if test_csv:
+            # Check if the label column exists to avoid user input errors (only the header is read)
+            if label_col not in read_columns(test_csv, test_format):
                 raise ValueError(f"Label column '{label_col}' not found in CSV.")
 
-            # Split label and feature columns
-            test_y = df[label_col].to_numpy()
-            test_x = df.drop(columns=[label_col])
+            test_batches = iter_labeled_batches(test_csv, label_col, chunksize=chunksize, file_format=test_format,
+                                                engine=csv_engine, dtype=parse_dtype(dtype), downcast=downcast)
 
-            click.echo(f"Loaded test CSV and split into features (X) and label column '{label_col}' (Y)")
+            click.echo(f"Streaming test data in chunks of {chunksize} rows, label column '{label_col}' (Y)")
         else:
             # If no CSV is provided, use default evaluation (accuracy and loss = 0.0)
             click.echo("No test CSV provided. Using default metrics.")
 
         # Call the core function package_results to generate experiment folder
         # Save model file, evaluation results, and model parameters into experiments/expN/
-        output_path = package_results(model, test_x, test_y, dataset_name)
+        batch_sizes = [int(b) for b in benchmark_batch_sizes.split(",") if b.strip()]
+        output_path = package_results(model, dataset_name=dataset_name, test_batches=test_batches,
+                                      model_format=model_format, compress=compress, trace=trace, cprofile=cprofile,
+                                      benchmark_inference=benchmark_inference, benchmark_batch_sizes=batch_sizes,
+                                      benchmark_repeats=benchmark_repeats, save_predictions=save_predictions,
+                                      bootstrap=bootstrap, confidence=confidence, dedup=dedup)
         click.echo(f"\nResults saved to: {output_path}")
 
     except Exception as e:
@@ -84,6 +121,197 @@ def package_results_cli(model_path, test_csv, label_col, dataset_name):
         click.echo(f"Failed to package results: {str(e)}")
 
 
+# Call function 1b-batch result_package
+'''
+Design idea:
+Hyperparameter sweeps produce many models evaluated on the same test set.
+This command packages all of them at once with package_results_batch from scripts/batch_packaging.py:
+the test data is written once and memory-mapped by a pool of worker processes, and every model
+gets its own experiment folder.
+'''
+
+@cli.command()
+@click.option('--model-path', 'model_paths', required=True, multiple=True, help='Path to a model file (repeat for each model)')
+@click.option('--test-csv', default=None, help='Path to combined test data (features + label), CSV, Parquet or Feather')
+@click.option('--label-col', default="label", help='Column name of label in CSV')
+@click.option('--dataset-name', default="unknown_dataset", help='Name of dataset')
+@click.option('--test-format', type=click.Choice(['auto', 'csv', 'parquet', 'feather']), default='auto',
+              help='Format of the test data file (auto: from the file extension)')
+@click.option('--chunksize', type=int, default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Number of test rows read and evaluated at once')
+@click.option('--n-jobs', type=int, default=None, help='Number of worker processes (default: number of CPUs)')
+@click.option('--model-format', type=click.Choice(['pickle', 'joblib']), default='pickle',
+              help='Serialization format of the packaged models')
+@click.option('--compress', type=click.IntRange(0, 9), default=0, help='joblib compression level')
+@click.option('--dedup', is_flag=True, help='Store identical models only once in the content-addressed blob store')
+def package_batch(model_paths, test_csv, label_col, dataset_name, test_format, chunksize, n_jobs, model_format, compress,
+                  dedup):
+    """Package many models against one test set in parallel"""
+    click.echo(f"Packaging {len(model_paths)} models ...")
+
+    try:
+        from scripts.batch_packaging import package_results_batch
+        from scripts.data_loading import iter_labeled_batches, read_columns
+
+        test_batches = None
+        if test_csv:
+            if label_col not in read_columns(test_csv, test_format):
+                raise ValueError(f"Label column '{label_col}' not found in CSV.")
+            test_batches = iter_labeled_batches(test_csv, label_col, chunksize=chunksize, file_format=test_format)
+
+        results = package_results_batch(list(model_paths), dataset_name=dataset_name, n_jobs=n_jobs,
+                                        batch_size=chunksize, test_batches=test_batches,
+                                        model_format=model_format, compress=compress, dedup=dedup)
+
+        # Report per-model timings
+        for result in results:
+            if result["error"]:
+                click.echo(f"- {result['model']}: FAILED ({result['error']})")
+            else:
+                click.echo(f"- {result['model']}: {result['exp_path']} ({result['seconds']:.2f}s)")
+
+    except Exception as e:
+        click.echo(f"Failed to package results: {str(e)}")
+
+
+# Call function 1c-reevaluate
+'''
+Design idea:
+package_results caches y_true, y_pred (and y_proba) of every experiment in expN/predictions/.
+After a metric is added or changed, this command recomputes metrics.json of all experiments
+from those arrays with reevaluate_experiments from scripts/reevaluate.py, in parallel and
+without unpickling a single model.
+'''
+
+@cli.command()
+@click.option('--experiments-dir', default="experiments", help='Folder containing the experiment folders')
+@click.option('--n-jobs', type=int, default=None, help='Number of worker processes (default: number of CPUs)')
+def reevaluate(experiments_dir, n_jobs):
+    """Recompute metrics from cached predictions"""
+    try:
+        from scripts.reevaluate import reevaluate_experiments
+
+        results, packed = reevaluate_experiments(experiments_dir, n_jobs=n_jobs)
+        if not results:
+            click.echo("No experiments with cached predictions found.")
+        if packed:
+            click.echo(f"Skipped {len(packed)} experiments compacted into packs (read-only): {', '.join(packed)}")
+        for result in results:
+            if result["error"]:
+                click.echo(f"- {result['experiment']}: FAILED ({result['error']})")
+            else:
+                click.echo(f"- {result['experiment']}: updated ({result['seconds']:.2f}s)")
+
+    except Exception as e:
+        click.echo(f"Failed to re-evaluate experiments: {str(e)}")
+
+
+# Call function 1c2-evaluate-stream
+'''
+Design idea:
+package-results evaluates a model once on a fixed test set. For a model scoring live traffic, this command
+keeps evaluating an existing experiment as labeled data arrives: the batches are predicted one at a time,
+only a running confusion matrix is kept, and metrics.json is replaced atomically with a new snapshot every
+--flush-seconds (or --flush-rows). compare-metrics (and --watch), the dashboard and mlops serve read the
+snapshots like any other metrics.json. --window-rows also records a time series of windowed metrics.
+'''
+
+@cli.command()
+@click.option('--experiment', 'exp_path', required=True, help='Experiment folder whose model is evaluated, e.g. experiments/exp3')
+@click.option('--test-csv', required=True, help='Labeled data (features + label), CSV, Parquet or Feather, read in chunks')
+@click.option('--label-col', default="label", help='Column name of label in CSV')
+@click.option('--test-format', type=click.Choice(['auto', 'csv', 'parquet', 'feather']), default='auto',
+              help='Format of the test data file (auto: from the file extension)')
+@click.option('--chunksize', type=click.IntRange(1), default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Number of rows per evaluated batch')
+@click.option('--flush-seconds', type=click.FloatRange(0), default=DEFAULT_STREAM_FLUSH_SECONDS, show_default=True,
+              help='Write a metrics.json snapshot at most this often')
+@click.option('--flush-rows', type=click.IntRange(1), default=None, help='Also write a snapshot every this many rows')
+@click.option('--window-rows', type=click.IntRange(1), default=None,
+              help='Append the metrics of every window of this many rows to metrics_timeseries.jsonl')
+@click.option('--bootstrap', type=click.IntRange(0), default=0,
+              help='Number of bootstrap resamples for confidence intervals in each snapshot (0 = none)')
+@click.option('--resume', is_flag=True, help='Continue the counts of a previous streaming evaluation of this experiment')
+def evaluate_stream(exp_path, test_csv, label_col, test_format, chunksize, flush_seconds, flush_rows, window_rows,
+                    bootstrap, resume):
+    """Keep evaluating an experiment on streamed labeled data"""
+    try:
+        from scripts.data_loading import iter_labeled_batches, read_columns
+        from scripts.streaming_evaluation import evaluate_stream as run_stream
+
+        if label_col not in read_columns(test_csv, test_format):
+            raise ValueError(f"Label column '{label_col}' not found in CSV.")
+        batches = iter_labeled_batches(test_csv, label_col, chunksize=chunksize, file_format=test_format)
+        metrics = run_stream(exp_path, batches, flush_seconds=flush_seconds, flush_rows=flush_rows,
+                             window_rows=window_rows, bootstrap=bootstrap, resume=resume)
+        click.echo(f"Evaluated {metrics['stream']['rows']} rows: accuracy = {metrics['accuracy']:.4f}, "
+                   f"f1_score = {metrics['f1_score']:.4f} (saved to {exp_path}/metrics.json)")
+
+    except Exception as e:
+        click.echo(f"Failed to evaluate stream: {str(e)}")
+
+
+# Call function 1d-gc
+'''
+Design idea:
+With --dedup, models are stored once in experiments/.blobs/ under the SHA-256 of their content,
+and config.json references the blob by digest. Deleting experiment folders leaves their blobs behind,
+this command removes the blobs no config.json references any more. Recent blobs are kept
+(--grace-seconds) because a packaging in progress writes its blob before its config.json.
+'''
+
+@cli.command()
+@click.option('--experiments-dir', default="experiments", help='Folder containing the experiment folders')
+@click.option('--grace-seconds', type=click.IntRange(0), default=DEFAULT_GC_GRACE_SECONDS, show_default=True,
+              help='Keep unreferenced blobs modified more recently than this')
+@click.option('--dry-run', is_flag=True, help='Only report what would be removed')
+def gc(experiments_dir, grace_seconds, dry_run):
+    """Remove model blobs no experiment references"""
+    try:
+        from scripts.blob_store import collect_garbage
+
+        stats = collect_garbage(experiments_dir, grace_seconds, dry_run)
+        action = "Would remove" if dry_run else "Removed"
+        click.echo(f"{action} {stats['removed']} blobs ({stats['freed_bytes'] / 1e6:.1f} MB), {stats['kept']} kept.")
+
+    except Exception as e:
+        click.echo(f"Failed to collect garbage: {str(e)}")
+
+
+# Call function 1e-compact
+'''
+Design idea:
+Hundreds of thousands of experiment folders full of small files make every directory scan, backup and
+NFS metadata operation slow. This command moves completed experiments (metrics.json and config.json
+present, nothing modified recently) into a few pack files in experiments/.packs/ with
+compact_experiments from scripts/packs.py. Each pack holds the files back to back plus an index, so
+loading thousands of documents means opening one file and seeking. compare-metrics, the dashboard and
+load_model read packed and loose experiments alike.
+'''
+
+@cli.command()
+@click.option('--experiments-dir', default="experiments", help='Folder containing the experiment folders')
+@click.option('--min-age-seconds', type=click.IntRange(0), default=DEFAULT_COMPACT_MIN_AGE_SECONDS, show_default=True,
+              help='Only pack experiments with no file modified more recently than this')
+@click.option('--pack-size', type=click.IntRange(1), default=DEFAULT_PACK_EXPERIMENTS, show_default=True,
+              help='Maximum number of experiments per pack file')
+@click.option('--dry-run', is_flag=True, help='Only list the experiments that would be packed')
+def compact(experiments_dir, min_age_seconds, pack_size, dry_run):
+    """Pack completed experiments into indexed archive files"""
+    try:
+        from scripts.packs import compact_experiments
+
+        stats = compact_experiments(experiments_dir, min_age_seconds, pack_size, dry_run)
+        if dry_run:
+            click.echo(f"Would pack {len(stats['experiments'])} experiments: {', '.join(stats['experiments'])}")
+        else:
+            click.echo(f"Packed {len(stats['experiments'])} experiments ({stats['files']} files) "
+                       f"into {len(stats['packs'])} pack files.")
+
+    except Exception as e:
+        click.echo(f"Failed to compact experiments: {str(e)}")
+
+
 # Call function 2-compare_metrics
 '''
 Design idea:
@@ -92,19 +320,92 @@ This CLI command calls the run_compare_metrics function from scripts/compare_met
 The function loads metrics and configs, creates a bar chart, and gives model recommendations.
 
 The CLI accepts folder paths, an optional save path, and a priority metric, then passes them to the function.
+
+--where filters on config.json and metrics.json fields (model_name, dataset, parameters.*, created_at, accuracy...)
+and --group-by picks the best experiment per value of a field. Both are answered by the indexed fields table
+of the catalog, so only the matching experiments are loaded.
+
+--watch keeps the command running during a sweep: a watchdog observer reports the experiment folders
+whose metrics.json or config.json changed, only those are reloaded, and the leaderboard is kept sorted
+incrementally. The outputs are refreshed once the folders stay quiet for --debounce-seconds, or after
+--max-latency-seconds when a sweep keeps writing.
+
+--objective trades several metrics against each other (e.g. accuracy vs latency and model size): the
+experiments dominated on every objective are filtered out with a skyline algorithm, and the Pareto front
+is ranked by a weighted score of the min-max normalized metrics.
 '''
 
 @cli.command()
 @click.option('--metrics-dir', default='experiments', help='Directory with experiment metrics JSON files')
 @click.option('--configs-dir', default='experiments', help='Directory with experiment configs JSON files')
 @click.option('--save-path', default=None, help='Path to save the comparison plot (e.g. comparison.png)')
-@click.option('--priority-metric', 'priority_metric', default='accuracy', help='Priority metric for recommendations (e.g. accuracy, f1_score)')
-def compare_metrics(metrics_dir, configs_dir, save_path, priority_metric):
+@click.option('--priority-metric', 'priority_metric', default='accuracy', help='Priority metric for recommendations (e.g. accuracy, f1_score, latency_p95_ms; latency and size metrics rank the smallest first)')
+@click.option('--top-k', type=int, default=None, help='Also print the leaderboard of the best k experiments by the priority metric')
+@click.option('--profile-path', default=None, help='Save the time spent in each stage to this JSON file')
+@click.option('--trace-path', default=None, help='Also export the stages as a Chrome trace file')
+@click.option('--table', 'table_path', default=None,
+              help='Read the experiments from a table written by `mlops export` (memory-mapped, metric columns only)')
+@click.option('--where', multiple=True,
+              help="Only compare matching experiments, e.g. \"model_name == RandomForestClassifier and parameters.n_estimators >= 200\" (repeatable)")
+@click.option('--group-by', default=None, help='Also print the best experiment of each value of this config field (e.g. model_name)')
+@click.option('--objective', 'objectives', multiple=True,
+              help="Rank the Pareto front of several metrics, as metric[:max|min][:weight], e.g. --objective accuracy:max "
+                   "--objective latency_p95_ms:min:0.5 (repeatable)")
+@click.option('--watch', is_flag=True,
+              help='Keep running and refresh the leaderboard, recommendation and saved plot as experiments are written')
+@click.option('--debounce-seconds', type=click.FloatRange(0), default=DEFAULT_WATCH_DEBOUNCE_SECONDS, show_default=True,
+              help='With --watch, refresh once no file changed for this long')
+@click.option('--max-latency-seconds', type=click.FloatRange(0), default=DEFAULT_WATCH_MAX_LATENCY_SECONDS,
+              show_default=True, help='With --watch, refresh at the latest this long after a change, even if files keep changing')
+def compare_metrics(metrics_dir, configs_dir, save_path, priority_metric, top_k, profile_path, trace_path, table_path,
+                    where, group_by, objectives, watch, debounce_seconds, max_latency_seconds):
     """
     Compare experiment metrics and provide recommendations.
     """
     click.echo("Running experiment metrics comparison...")
-    run_compare_metrics(metrics_dir, configs_dir, save_path, priority_metric)
+    if save_path or watch:
+        # Saving only: render headless with the non-interactive Agg backend
+        import matplotlib
+        matplotlib.use("Agg")
+    if watch:
+        if table_path or where or group_by or objectives:
+            click.echo("Failed to compare metrics: --watch cannot be combined with --table, --where, --group-by or --objective")
+            return
+        from scripts.watch_metrics import watch_compare_metrics
+        click.echo(f"Watching {metrics_dir} for new or changed experiments, press Ctrl+C to stop.")
+        watch_compare_metrics(metrics_dir, configs_dir, save_path, priority_metric, top_k or DEFAULT_WATCH_TOP_K,
+                              debounce_seconds, max_latency_seconds=max_latency_seconds)
+        return
+    from scripts.compare_metrics import run_compare_metrics
+    try:
+        run_compare_metrics(metrics_dir, configs_dir, save_path, priority_metric, top_k, profile_path, trace_path,
+                            table_path, list(where), group_by, list(objectives))
+    except ValueError as e:
+        click.echo(f"Failed to compare metrics: {str(e)}")
+
+# Call function 2b-export
+'''
+Design idea:
+Writes every experiment into one columnar file with export_experiment_table from scripts/experiment_table.py:
+metrics as columns, configs flattened into typed columns (parameters.n_estimators is an integer column).
+The .arrow output can be memory-mapped by compare-metrics --table and the dashboard, which then only
+read the columns they need. A .parquet output is handy for ad-hoc analysis with pandas, DuckDB or Spark.
+'''
+
+@cli.command()
+@click.option('--experiments-dir', default="experiments", help='Folder containing the experiment folders')
+@click.option('--output', default=None,
+              help='Output file, .arrow/.feather (memory-mappable) or .parquet (default: <experiments-dir>/experiments.arrow)')
+def export(experiments_dir, output):
+    """Export all experiments as one Arrow/Parquet table"""
+    try:
+        from scripts.experiment_table import export_experiment_table
+
+        path = export_experiment_table(experiments_dir, output)
+        click.echo(f"Experiment table saved to: {path}")
+
+    except Exception as e:
+        click.echo(f"Failed to export experiments: {str(e)}")
 
 # Call function 3-run dashboard
 '''
@@ -117,11 +418,39 @@ def run_dashboard():
     """Launch the Streamlit experiment comparison dashboard."""
     click.echo("Launching dashboard in background...")
     try:
+        # The launcher only starts `streamlit run`, streamlit itself is not imported here
+        from scripts.dashboard_launcher import run_dashboard_ui
         run_dashboard_ui()
         click.echo("Dashboard launched. Open your browser to view it.")
     except Exception as e:
         click.echo(f"Failed to launch dashboard: {str(e)}")
 
 
+# Call function 3b-serve
+'''
+Design idea:
+A small read-only JSON API (scripts/api_server.py) for other services and for browsing without Streamlit.
+It runs on asyncio from the standard library: one process serves many concurrent readers, responses are
+cached per fingerprint of the experiments root, and that fingerprint is the ETag, so clients polling with
+If-None-Match get an empty 304 until an experiment is added or changed.
+'''
+
+@cli.command()
+@click.option('--experiments-dir', default="experiments", help='Folder containing the experiment folders')
+@click.option('--host', default=DEFAULT_API_HOST, show_default=True, help='Address to listen on')
+@click.option('--port', type=click.IntRange(0, 65535), default=DEFAULT_API_PORT, show_default=True, help='Port to listen on')
+@click.option('--refresh-seconds', type=click.FloatRange(0), default=DEFAULT_API_REFRESH_SECONDS, show_default=True,
+              help='How often the experiments folder is checked for new or changed experiments')
+def serve(experiments_dir, host, port, refresh_seconds):
+    """Serve experiments, leaderboards and recommendations as a JSON API"""
+    try:
+        from scripts.api_server import serve as serve_api
+
+        serve_api(experiments_dir, host, port, refresh_seconds)
+
+    except Exception as e:
+        click.echo(f"Failed to serve experiments: {str(e)}")
+
+
 if __name__ == '__main__':
     cli()
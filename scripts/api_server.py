@@ -0,0 +1,381 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs, unquote
+from scripts.defaults import (DEFAULT_API_HOST, DEFAULT_API_PORT, DEFAULT_API_PAGE_SIZE, MAX_API_PAGE_SIZE,
+                             DEFAULT_API_REFRESH_SECONDS)
+from scripts.experiment_catalog import ExperimentCatalog
+
+logger = logging.getLogger(__name__)
+
+# Encoded responses kept per experiment-root fingerprint
+DEFAULT_CACHE_ENTRIES = 256
+# Largest request head accepted, requests are GET/HEAD only and carry no body
+MAX_REQUEST_HEAD_BYTES = 16384
+
+
+# Documents served together: a request never sees the metrics of one scan with the configs of another
+Snapshot = namedtuple("Snapshot", ["fingerprint", "metrics", "configs"])
+
+
+class APIError(Exception):
+    """Error answered as {"error": message} with the given HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    # numpy scalars coming from pandas
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _records(df):
+    """DataFrame rows as JSON-ready dicts, NaN becomes null."""
+    df = df.astype(object).where(df.notna(), None)
+    return [{"experiment": exp, **row} for exp, row in zip(df.index, df.to_dict(orient="records"))]
+
+
+def _int_param(query, name, default, low=0, high=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[-1])
+    except ValueError:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer")
+    if high is None and value < low:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"'{name}' must be >= {low}")
+    if high is not None and not low <= value <= high:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"'{name}' must be between {low} and {high}")
+    return value
+
+
+def _str_param(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+class ExperimentAPI:
+    """
+    Read-only JSON API over an experiments root, independent of any HTTP server.
+
+    Routes (GET or HEAD):
+        /health                                     experiment count and root fingerprint
+        /experiments?offset=&limit=&where=          paginated metrics and configs (where: see scripts/query.py)
+        /experiments/<name>                         metrics and config of one experiment
+        /leaderboard?metric=accuracy&offset=&limit= ranked experiments (same columns as compare-metrics --top-k)
+        /recommendations?metric=accuracy            give_recommendation output
+
+    The documents are kept in memory and the root is re-checked through the catalog at most every
+    refresh_seconds. Every response carries the fingerprint of the root as its ETag, a valid request
+    whose If-None-Match matches gets an empty 304 (unknown paths and bad parameters still get their
+    404 or 400). Encoded responses are cached until the fingerprint changes,
+    so concurrent readers of the same page share one computation.
+    """
+
+    def __init__(self, exp_dir="experiments", refresh_seconds=DEFAULT_API_REFRESH_SECONDS,
+                 cache_entries=DEFAULT_CACHE_ENTRIES):
+        self.exp_dir = exp_dir
+        self.refresh_seconds = refresh_seconds
+        self.cache_entries = cache_entries
+        self.snapshot = Snapshot(None, {}, {})
+        self._checked_at = None
+        self._cache = OrderedDict()
+        self._frames_cache = None
+        # _lock guards the snapshot swap and the response cache and is only held briefly,
+        # _refresh_lock lets a single thread rescan the root
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def fingerprint(self):
+        return self.snapshot.fingerprint
+
+    @property
+    def metrics(self):
+        return self.snapshot.metrics
+
+    @property
+    def configs(self):
+        return self.snapshot.configs
+
+    def _refresh_due(self, force):
+        return force or self._checked_at is None or time.monotonic() - self._checked_at >= self.refresh_seconds
+
+    def refresh(self, force=False):
+        """Reload the documents when the root changed, at most every refresh_seconds. Returns the current Snapshot."""
+        with self._lock:
+            if not self._refresh_due(force) and self.snapshot.fingerprint is not None:
+                return self.snapshot
+        # While one thread rescans, the others keep answering from the current snapshot
+        # (only the very first load and a forced refresh wait for it)
+        if not self._refresh_lock.acquire(blocking=force or self.snapshot.fingerprint is None):
+            return self.snapshot
+        try:
+            with self._lock:
+                if not self._refresh_due(force) and self.snapshot.fingerprint is not None:
+                    return self.snapshot
+                self._checked_at = time.monotonic()
+            # The rescan runs outside _lock, cache hits and 304s of other threads never wait for it
+            with ExperimentCatalog(self.exp_dir) as catalog:
+                changed = catalog.refresh("metrics.json") + catalog.refresh("config.json")
+                if not changed and self.snapshot.fingerprint is not None:
+                    return self.snapshot
+                snapshot = Snapshot(self._fingerprint(catalog), catalog.load("metrics.json", refresh=False),
+                                    catalog.load("config.json", refresh=False))
+            with self._lock:
+                self.snapshot = snapshot
+                self._cache.clear()
+            return snapshot
+        finally:
+            self._refresh_lock.release()
+
+    @staticmethod
+    def _fingerprint(catalog):
+        """Hash of the (experiment, file, mtime, size) of every indexed document."""
+        digest = hashlib.sha1()
+        rows = catalog.conn.execute(
+            "SELECT experiment, filename, mtime_ns, size FROM documents "
+            "WHERE filename IN ('metrics.json', 'config.json') ORDER BY experiment, filename")
+        for row in rows:
+            digest.update(repr(row).encode())
+        return digest.hexdigest()[:20]
+
+    def handle(self, method, target, headers=None):
+        """
+        Answer one request.
+
+        Returns:
+        --------
+        tuple
+            (status, headers dict, body bytes)
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if method not in ("GET", "HEAD"):
+            return self._error(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported", {"Allow": "GET, HEAD"})
+        try:
+            snapshot = self.refresh()
+        except Exception as e:
+            logger.exception("Could not refresh the experiments")
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, f"Could not read the experiments: {e}")
+
+        url = urlsplit(target)
+        # Experiment names may be percent-encoded (e.g. /experiments/exp%201), parse_qs decodes the query
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+        key = (snapshot.fingerprint, path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+        if body is None:
+            try:
+                payload = self._route(snapshot, path.rstrip("/") or "/", query)
+            except APIError as e:
+                return self._error(e.status, str(e))
+            body = json.dumps(payload, default=_json_default).encode()
+            with self._lock:
+                if snapshot is self.snapshot:
+                    self._cache[key] = body
+                    while len(self._cache) > self.cache_entries:
+                        self._cache.popitem(last=False)
+
+        # Only once the request is known to be valid, a 304 must not hide a 404 or a 400
+        etag = f'"{snapshot.fingerprint}"'
+        response_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            return HTTPStatus.NOT_MODIFIED, response_headers, b""
+        response_headers["Content-Type"] = "application/json"
+        return HTTPStatus.OK, response_headers, body
+
+    def _error(self, status, message, headers=None):
+        headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        return status, headers, json.dumps({"error": message}).encode()
+
+    def _route(self, snapshot, path, query):
+        if path == "/health":
+            return {"status": "ok", "experiments": len(snapshot.metrics), "fingerprint": snapshot.fingerprint}
+        if path == "/experiments":
+            return self._experiments(snapshot, query)
+        if path.startswith("/experiments/"):
+            return self._experiment(snapshot, path[len("/experiments/"):])
+        if path == "/leaderboard":
+            return self._leaderboard(snapshot, query)
+        if path == "/recommendations":
+            return self._recommendations(snapshot, query)
+        raise APIError(HTTPStatus.NOT_FOUND, f"Unknown path {path}")
+
+    def _page(self, query, total):
+        offset = _int_param(query, "offset", 0)
+        limit = _int_param(query, "limit", DEFAULT_API_PAGE_SIZE, low=1, high=MAX_API_PAGE_SIZE)
+        next_offset = offset + limit if offset + limit < total else None
+        return offset, limit, {"total": total, "offset": offset, "limit": limit, "next_offset": next_offset}
+
+    def _experiments(self, snapshot, query):
+        names = list(snapshot.metrics)
+        where = _str_param(query, "where")
+        if where:
+            from scripts.query import parse_conditions, select_experiments
+            try:
+                conditions = parse_conditions(where)
+            except ValueError as e:
+                raise APIError(HTTPStatus.BAD_REQUEST, str(e))
+            with ExperimentCatalog(self.exp_dir) as catalog:
+                names = select_experiments(catalog, conditions)
+        offset, limit, page = self._page(query, len(names))
+        page["items"] = [{"experiment": exp, "metrics": snapshot.metrics.get(exp), "config": snapshot.configs.get(exp)}
+                         for exp in names[offset:offset + limit]]
+        return page
+
+    def _experiment(self, snapshot, name):
+        if name not in snapshot.metrics and name not in snapshot.configs:
+            raise APIError(HTTPStatus.NOT_FOUND, f"Experiment '{name}' not found")
+        return {"experiment": name, "metrics": snapshot.metrics.get(name), "config": snapshot.configs.get(name)}
+
+    def _frames(self, snapshot):
+        """Metrics and configs DataFrames, built once per snapshot (outside the lock, like the rescan)."""
+        from scripts.compare_metrics import conversion_to_df
+        cached = self._frames_cache
+        if cached is not None and cached[0] is snapshot:
+            return cached[1]
+        frames = conversion_to_df(snapshot.metrics), conversion_to_df(snapshot.configs) if snapshot.configs else None
+        self._frames_cache = (snapshot, frames)
+        return frames
+
+    def _leaderboard(self, snapshot, query):
+        from scripts.compare_metrics import leaderboard, numeric_column
+        metric = _str_param(query, "metric", "accuracy")
+        metrics_df, _ = self._frames(snapshot)
+        offset, limit, page = self._page(query, int(numeric_column(metrics_df, metric).notna().sum()))
+        # Partial sort of the rows up to the requested page only
+        board = leaderboard(metrics_df, metric, k=offset + limit)
+        page["metric"] = metric
+        page["items"] = _records(board.iloc[offset:offset + limit])
+        return page
+
+    def _recommendations(self, snapshot, query):
+        from scripts.compare_metrics import give_recommendation
+        metric = _str_param(query, "metric", "accuracy")
+        metrics_df, configs_df = self._frames(snapshot)
+        if metrics_df.empty:
+            return {"metric": metric, "recommendations": {}}
+        return {"metric": metric, "recommendations": give_recommendation(metrics_df, configs_df, metric)}
+
+
+class TestClient:
+    """
+    In-process client calling ExperimentAPI.handle directly, no socket involved.
+
+    Usage:
+        client = TestClient(ExperimentAPI("experiments"))
+        response = client.get("/leaderboard?metric=f1_score")
+        response.status, response.headers["ETag"], response.json()
+    """
+
+    __test__ = False  # not a pytest test class
+
+    class Response:
+        def __init__(self, status, headers, body):
+            self.status, self.headers, self.body = int(status), headers, body
+
+        def json(self):
+            return json.loads(self.body)
+
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, target, headers=None):
+        return self.Response(*self.app.handle("GET", target, headers))
+
+
+async def _read_request(reader):
+    """(method, target, HTTP version, headers) of the next request on a connection, None once the client closed it."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise APIError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request head too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise APIError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _encode_response(status, headers, body, method, keep_alive):
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    headers = dict(headers, **{"Content-Length": str(len(body)),
+                               "Connection": "keep-alive" if keep_alive else "close"})
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head if method == "HEAD" else head + body
+
+
+async def start_server(app, host=DEFAULT_API_HOST, port=DEFAULT_API_PORT):
+    """
+    Start serving app on host:port and return the asyncio.Server (port 0 picks a free port).
+
+    Connections are kept alive (HTTP/1.1). Requests run in the default thread pool, so computing a
+    leaderboard never blocks the event loop, and concurrent readers mostly get cached bytes.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except APIError as e:
+                    writer.write(_encode_response(*app._error(e.status, str(e)), "GET", False))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                response = await loop.run_in_executor(None, app.handle, method, target, headers)
+                writer.write(_encode_response(*response, method, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle_connection, host, port, limit=MAX_REQUEST_HEAD_BYTES)
+
+
+def serve(exp_dir="experiments", host=DEFAULT_API_HOST, port=DEFAULT_API_PORT,
+          refresh_seconds=DEFAULT_API_REFRESH_SECONDS):
+    """Serve the JSON API of exp_dir until interrupted."""
+    app = ExperimentAPI(exp_dir, refresh_seconds)
+    app.refresh(force=True)
+
+    async def main():
+        server = await start_server(app, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Serving {len(app.metrics)} experiments from {exp_dir} on http://{address[0]}:{address[1]}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
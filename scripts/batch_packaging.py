@@ -0,0 +1,133 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scripts.evaluation import DEFAULT_BATCH_SIZE
+from scripts.package_results import package_results
+from scripts.serialization import load_model
+
+logger = logging.getLogger(__name__)
+
+
+def write_shared_test_data(folder, batches):
+    """
+    Write (x, y) batches once to raw files that every worker memory-maps.
+
+    The feature matrix is appended chunk by chunk, so a streamed test file never has to be
+    fully in memory. Returns the spec that open_shared_test_data needs.
+    """
+    x_path = os.path.join(folder, "test_x.bin")
+    y_path = os.path.join(folder, "test_y.npy")
+    spec = {"x_path": x_path, "y_path": y_path, "columns": None, "x_dtype": None, "n_rows": 0, "n_features": 0}
+    labels = []
+
+    with open(x_path, 'wb') as f:
+        for x, y in batches:
+            if spec["x_dtype"] is None:
+                # The first chunk fixes the column names and the dtype of the shared matrix
+                if hasattr(x, "columns"):
+                    spec["columns"] = list(x.columns)
+                values = np.asarray(x)
+                if values.dtype == object:
+                    raise ValueError("Batch packaging needs numeric feature columns")
+                spec["x_dtype"] = values.dtype.str
+                spec["n_features"] = values.shape[1]
+            values = np.ascontiguousarray(np.asarray(x), dtype=spec["x_dtype"])
+            f.write(values.tobytes())
+            spec["n_rows"] += len(values)
+            labels.append(np.asarray(y))
+
+    y_all = np.concatenate(labels) if labels else np.array([])
+    if y_all.dtype == object:
+        y_all = y_all.astype(str)
+    np.save(y_path, y_all)
+    return spec
+
+
+def open_shared_test_data(spec):
+    """Memory-map the shared test set written by write_shared_test_data (no copy per worker)."""
+    test_x = np.memmap(spec["x_path"], dtype=spec["x_dtype"], mode='r',
+                       shape=(spec["n_rows"], spec["n_features"]))
+    test_y = np.load(spec["y_path"], mmap_mode='r')
+    if spec["columns"] is not None:
+        # Keep the feature names the model was fitted with, the DataFrame is a view on the memmap
+        import pandas as pd
+        test_x = pd.DataFrame(test_x, columns=spec["columns"], copy=False)
+    return test_x, test_y
+
+
+def _package_one(model, spec, dataset_name, output_dir, batch_size, model_format, compress, dedup=False):
+    """Worker: load the model if needed, then evaluate and package it against the shared test set."""
+    start = time.perf_counter()
+    name = model if isinstance(model, str) else model.__class__.__name__
+    result = {"model": name, "exp_path": None, "error": None}
+    try:
+        if isinstance(model, str):
+            model = load_model(model)
+        loaded = time.perf_counter()
+        test_x, test_y = open_shared_test_data(spec) if spec else (None, None)
+        result["exp_path"] = package_results(model, test_x, test_y, dataset_name, output_dir,
+                                             batch_size=batch_size, model_format=model_format, compress=compress,
+                                             dedup=dedup)
+        result["load_seconds"] = loaded - start
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def package_results_batch(models, test_x=None, test_y=None, dataset_name="unknown_dataset", output_dir="experiments",
+                          n_jobs=None, batch_size=DEFAULT_BATCH_SIZE, test_batches=None,
+                          model_format="pickle", compress=0, dedup=False):
+    """
+    Package many models against one test set, in parallel.
+
+    Parameters:
+    -----------
+    models : list
+        Trained model objects, or paths to model files (preferred: workers load them
+        themselves instead of receiving a pickled copy)
+    test_x, test_y : array-like or None
+        Test set shared by every model
+    test_batches : iterable or None
+        (x, y) chunks used instead of test_x/test_y, e.g. from iter_labeled_batches
+    n_jobs : int or None
+        Number of worker processes (default: number of CPUs)
+    dedup : bool
+        Store the models in the content-addressed blob store of output_dir
+
+    The test set is written once to a temporary folder and memory-mapped by every worker,
+    so it is never pickled per model. Each worker gets its own expN folder through the
+    atomic allocator of package_results.
+
+    Returns:
+    --------
+    list of dict
+        One entry per model, in input order: model, exp_path, seconds, load_seconds, error
+    """
+    if test_batches is None and test_x is not None and test_y is not None:
+        test_batches = [(test_x, test_y)]
+
+    os.makedirs(output_dir, exist_ok=True)
+    shared_dir = tempfile.mkdtemp(prefix="mlops_batch_")
+    start = time.perf_counter()
+    try:
+        spec = write_shared_test_data(shared_dir, test_batches) if test_batches is not None else None
+        results = [None] * len(models)
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = {
+                pool.submit(_package_one, model, spec, dataset_name, output_dir, batch_size, model_format, compress,
+                            dedup): i
+                for i, model in enumerate(models)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    failed = sum(1 for r in results if r["error"])
+    logger.info(f"Packaged {len(models) - failed}/{len(models)} models in {time.perf_counter() - start:.2f}s")
+    return results
@@ -0,0 +1,146 @@
+import os
+import time
+import hashlib
+import logging
+from scripts.defaults import DEFAULT_GC_GRACE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Content-addressed store under the experiments root: .blobs/sha256/<2 first hex chars>/<digest>
+BLOBS_DIRNAME = ".blobs"
+HASH_ALGORITHM = "sha256"
+
+
+class _HashingWriter:
+    """File-like object hashing the bytes on their way to the underlying file."""
+
+    def __init__(self, f):
+        self.f = f
+        self.hash = hashlib.new(HASH_ALGORITHM)
+        self.size = 0
+
+    def write(self, data):
+        self.hash.update(data)
+        self.size += len(data)
+        return self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
+
+    def tell(self):
+        return self.f.tell()
+
+
+class BlobStore:
+    """
+    Deduplicated storage of artifacts, addressed by the hash of their content.
+
+    Usage:
+        store = BlobStore("experiments")
+        blob = store.write(lambda f: pickle.dump(model, f))
+        store.path(blob["digest"])
+
+    A blob is written once to a temporary file while being hashed, then moved into place with
+    os.replace, or dropped when a blob with the same digest already exists. Identical models
+    packaged many times therefore take the disk space of one.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.join(root, BLOBS_DIRNAME)
+
+    def path(self, digest):
+        algorithm, hexdigest = digest.split(":", 1)
+        return os.path.join(self.root, algorithm, hexdigest[:2], hexdigest)
+
+    def has(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def write(self, dump):
+        """
+        Store the bytes written by dump(file_object).
+
+        Returns:
+        --------
+        dict
+            digest ('sha256:<hex>'), bytes, and deduplicated (True when the blob already existed)
+        """
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, f"{os.getpid()}.{time.time_ns()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                writer = _HashingWriter(f)
+                dump(writer)
+            digest = f"{HASH_ALGORITHM}:{writer.hash.hexdigest()}"
+            blob_path = self.path(digest)
+            deduplicated = os.path.exists(blob_path)
+            if deduplicated:
+                # Touch it so a running gc sees it as recently used
+                os.utime(blob_path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(tmp_path, blob_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return {"digest": digest, "bytes": writer.size, "deduplicated": deduplicated}
+
+    def iter_blobs(self):
+        """Yield (digest, path) of every stored blob."""
+        for algorithm in (HASH_ALGORITHM,):
+            base = os.path.join(self.root, algorithm)
+            if not os.path.isdir(base):
+                continue
+            for fan_out in os.scandir(base):
+                if fan_out.is_dir():
+                    for entry in os.scandir(fan_out.path):
+                        yield f"{algorithm}:{entry.name}", entry.path
+
+    def gc(self, referenced, grace_seconds=DEFAULT_GC_GRACE_SECONDS, dry_run=False):
+        """
+        Remove the blobs whose digest is not in referenced, and leftover temporary files.
+
+        Files modified less than grace_seconds ago are kept, so a blob written by a packaging
+        that has not saved its config.json yet is never collected.
+
+        Returns:
+        --------
+        dict
+            removed (number of blobs), freed_bytes, kept (number of blobs still stored)
+        """
+        cutoff = time.time() - grace_seconds
+        stats = {"removed": 0, "freed_bytes": 0, "kept": 0}
+        for digest, path in list(self.iter_blobs()):
+            st = os.stat(path)
+            if digest in referenced or st.st_mtime > cutoff:
+                stats["kept"] += 1
+                continue
+            if not dry_run:
+                os.remove(path)
+            stats["removed"] += 1
+            stats["freed_bytes"] += st.st_size
+
+        tmp_dir = os.path.join(self.root, "tmp")
+        if not dry_run and os.path.isdir(tmp_dir):
+            for entry in os.scandir(tmp_dir):
+                if entry.stat().st_mtime <= cutoff:
+                    os.remove(entry.path)
+        return stats
+
+
+def referenced_blobs(experiments_dir="experiments"):
+    """Digests of the model artifacts referenced by the config.json of every experiment."""
+    from scripts.experiment_catalog import load_documents
+    referenced = set()
+    for config in load_documents(experiments_dir, "config.json").values():
+        artifact = config.get("model_artifact") if isinstance(config, dict) else None
+        if isinstance(artifact, dict) and artifact.get("blob"):
+            referenced.add(artifact["blob"])
+    return referenced
+
+
+def collect_garbage(experiments_dir="experiments", grace_seconds=DEFAULT_GC_GRACE_SECONDS, dry_run=False):
+    """Remove the blobs of experiments_dir that no experiment references any more."""
+    stats = BlobStore(experiments_dir).gc(referenced_blobs(experiments_dir), grace_seconds, dry_run)
+    logger.info(f"Blob gc: removed {stats['removed']} blobs ({stats['freed_bytes']} bytes), kept {stats['kept']}")
+    return stats
@@ -1,37 +1,61 @@
-import json
+import os
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import argparse
-from pathlib import Path
+from scripts.experiment_catalog import load_documents
+from scripts.profiling import StageProfiler
 
 def load_exp_metrics(directory="experiments"):
-    """Load experiment metrics from JSON files in the specified directory."""
-    metrics = {}
-    for path in Path(directory).glob("*/metrics.json"):
-        with open(path) as f:
-            data = json.load(f)
-        metrics[path.parent.name] = data
-    return metrics
+    """Load experiment metrics from JSON files in the specified directory (through the incremental catalog)."""
+    return load_documents(directory, "metrics.json")
 
 def load_exp_configs(directory="experiments"):
-    """Load experiment configurations from JSON files in the specified directory."""
-    configs = {}
-    for path in Path(directory).glob("*/config.json"):
-        with open(path) as f:
-            data = json.load(f)
-        configs[path.parent.name] = data
-    return configs
+    """Load experiment configurations from JSON files in the specified directory (through the incremental catalog)."""
+    return load_documents(directory, "config.json")
 
 def conversion_to_df(metrics):
     """Convert metrics dictionary to pd DataFrame."""
     return pd.DataFrame.from_dict(metrics, orient='index')
 
-def plot_metrics(metrics_df, save_path=None):
-    """Plot the metrics from the DataFrame."""
+# Above this many experiments, plot_metrics draws one box plot per metric instead of grouped bars
+MAX_BAR_EXPERIMENTS = 50
+# Values stored in metrics.json that are not scores to plot
+NON_METRIC_COLUMNS = ("timestamp", "confusion_matrix", "confidence_intervals", "confidence_level",
+                      "bootstrap_resamples", "stream")
+
+def select_metric_columns(metrics_df):
+    """Keep only the numeric metric columns (drops timestamp, confusion_matrix and other non-numeric values)."""
+    metrics_df = metrics_df.drop(columns=[c for c in NON_METRIC_COLUMNS if c in metrics_df.columns])
+    numeric_df = metrics_df.apply(pd.to_numeric, errors='coerce')
+    return numeric_df.dropna(axis=1, how='all')
+
+def plot_metrics(metrics_df, save_path=None, top_k=None, sort_by=None, max_bars=MAX_BAR_EXPERIMENTS):
+    """
+    Plot the metrics from the DataFrame.
+
+    Only numeric metric columns are drawn. With top_k, only the best top_k experiments by
+    sort_by (default: first metric column) are shown. When more than max_bars experiments
+    remain, the chart shows the distribution of each metric as a box plot instead of one bar
+    per experiment.
+    """
+    # matplotlib is only needed here, loading and ranking experiments does not import it
+    import matplotlib.pyplot as plt
+
+    numeric_df = select_metric_columns(metrics_df)
+    if top_k and len(numeric_df.columns):
+        sort_by = sort_by if sort_by in numeric_df.columns else numeric_df.columns[0]
+        numeric_df = numeric_df.loc[leaderboard(numeric_df, sort_by, k=top_k).index]
+
     fig, ax = plt.subplots(figsize=(10, 6))
-    metrics_df.plot(kind='bar', ax=ax)
-    plt.title("Experiment Metrics Comparison")
-    plt.xlabel("Experiment")
+    if len(numeric_df) > max_bars:
+        columns = list(numeric_df.columns)
+        ax.boxplot([numeric_df[c].dropna().to_numpy() for c in columns], tick_labels=columns)
+        plt.title(f"Experiment Metrics Distribution ({len(numeric_df)} experiments)")
+        plt.xlabel("Metric")
+    else:
+        numeric_df.plot(kind='bar', ax=ax)
+        plt.title("Experiment Metrics Comparison")
+        plt.xlabel("Experiment")
     plt.ylabel("Value")
     plt.xticks(rotation=45)
     plt.tight_layout()
@@ -40,77 +64,230 @@ def plot_metrics(metrics_df, save_path=None):
         print(f"Chart saved to {save_path}")
     return fig
 
+# Thresholds of the Good/Average/Poor performance tiers
+GOOD_THRESHOLD = 0.9
+AVERAGE_THRESHOLD = 0.7
+
+# Metrics where a smaller value is better (serving cost recorded by the inference benchmark, loss)
+LOWER_IS_BETTER = ("loss", "latency_p50_ms", "latency_p95_ms", "latency_p99_ms",
+                   "model_size_bytes", "model_memory_bytes")
+
+# Metrics where a larger value is better but that are not scores between 0 and 1 (rows per second)
+UNBOUNDED_METRICS = ("throughput_rows_per_s",)
+
+def lower_is_better(metric):
+    """True when experiments should be ranked by increasing values of this metric."""
+    return metric in LOWER_IS_BETTER or metric.endswith(("_ms", "_seconds", "_bytes"))
+
+def has_performance_tiers(metric):
+    """True for scores between 0 and 1 where higher is better, the only ones the Good/Average/Poor tiers apply to."""
+    return not lower_is_better(metric) and metric not in UNBOUNDED_METRICS and not metric.endswith("_per_s")
+
+def numeric_column(metrics_df, metric):
+    """Return one metric column as floats, NaN where the value is missing or not a number."""
+    if metric not in metrics_df.columns:
+        return pd.Series(np.nan, index=metrics_df.index, dtype=float)
+    return pd.to_numeric(metrics_df[metric], errors='coerce')
+
+def confidence_bounds(metrics_df, metric):
+    """Lower and upper bootstrap bounds of one metric (NaN for experiments evaluated without bootstrap)."""
+    bounds = np.full((len(metrics_df), 2), np.nan)
+    if "confidence_intervals" in metrics_df.columns:
+        # One lookup per experiment, then every [low, high] pair is converted in a single array
+        pairs = metrics_df["confidence_intervals"].map(lambda d: d.get(metric) if isinstance(d, dict) else None)
+        valid = pairs.notna().to_numpy()
+        if valid.any():
+            bounds[valid] = np.array(list(pairs[valid]), dtype=float)
+    return (pd.Series(bounds[:, 0], index=metrics_df.index, dtype=float),
+            pd.Series(bounds[:, 1], index=metrics_df.index, dtype=float))
+
+def tied_with(metrics_df, metric, best_model):
+    """
+    Experiments whose confidence interval overlaps the one of best_model (best_model included).
+
+    Overlapping intervals mean the difference with the best model may just be noise of the test set.
+    Empty when best_model has no interval.
+    """
+    low, high = confidence_bounds(metrics_df, metric)
+    if best_model is None or np.isnan(low[best_model]):
+        return []
+    overlaps = (high >= low[best_model]) & (low <= high[best_model])
+    return list(metrics_df.index[overlaps.to_numpy()])
+
+def performance_tiers(values):
+    """Vectorized Good/Average/Poor label for an array of scores."""
+    values = np.asarray(values, dtype=float)
+    return np.select([values > GOOD_THRESHOLD, values > AVERAGE_THRESHOLD], ["Good", "Average"], "Poor")
+
+def leaderboard(metrics_df, metric='accuracy', k=None, ascending=None):
+    """
+    Rank the experiments by one metric, best first.
+
+    Parameters:
+    -----------
+    metrics_df : pd.DataFrame
+        One row per experiment
+    metric : str
+        Column to rank by, experiments without a value for it are left out
+    k : int or None
+        Only return the best k experiments (uses a partial sort instead of sorting everything)
+    ascending : bool or None
+        True when lower values are better (e.g. loss), None to decide from the metric name
+        (see LOWER_IS_BETTER)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Indexed by experiment, with the columns rank, <metric> and tier (tier only for scores where
+        higher is better, see has_performance_tiers).
+        When bootstrap intervals are available, also <metric>_low, <metric>_high and tied_with_best.
+    """
+    if ascending is None:
+        ascending = lower_is_better(metric)
+    scores = numeric_column(metrics_df, metric).dropna()
+    if k is not None:
+        scores = scores.nsmallest(k) if ascending else scores.nlargest(k)
+    else:
+        scores = scores.sort_values(ascending=ascending, kind='stable')
+    board = pd.DataFrame({"rank": np.arange(1, len(scores) + 1), metric: scores})
+    if not ascending and has_performance_tiers(metric):
+        # The Good/Average/Poor thresholds only make sense for scores where higher is better
+        board["tier"] = performance_tiers(scores.to_numpy())
+    low, high = confidence_bounds(metrics_df, metric)
+    if low[board.index].notna().any():
+        board[f"{metric}_low"] = low[board.index]
+        board[f"{metric}_high"] = high[board.index]
+        # The best model is computed on all experiments, the board may only hold the top k
+        best = numeric_column(metrics_df, metric).dropna()
+        best = (best.idxmin() if ascending else best.idxmax()) if len(best) else None
+        board["tied_with_best"] = board.index.isin(tied_with(metrics_df, metric, best))
+    return board
+
+# Config fields naming an experiment in the recommendation summary
+DESCRIBE_COLUMNS = ["model_name", "dataset"]
+
+def describe_experiment(configs_df, exp):
+    """' (<model_name> on <dataset>)' from the config of an experiment, empty when it is unknown."""
+    if configs_df is None or exp not in configs_df.index:
+        return ""
+    config = configs_df.loc[exp]
+    model_name, dataset = config.get("model_name"), config.get("dataset")
+    if not isinstance(model_name, str):
+        return ""
+    return f" ({model_name} on {dataset})" if isinstance(dataset, str) else f" ({model_name})"
+
 def give_recommendation(metrics_df, configs_df=None, priority_metric='None'):
     """Provide recommendations of best model based on the metrics and configurations."""
     recommendations = {}
-    
-    # First see if there is a priority metric available
-    best_model = None
-    best_score = -1
-    
-    # First pass to find the best model according to priority metric
-    for exp in metrics_df.index:
-        if priority_metric in metrics_df.columns and not pd.isna(metrics_df.loc[exp, priority_metric]):
-            score = metrics_df.loc[exp, priority_metric]
-            if score > best_score:
-                best_score = score
-                best_model = exp
-    
-    # Second pass to generate recommendations for each model
-    for exp in metrics_df.index:
-        # Check if priority metric exists for this experiment
-        if priority_metric in metrics_df.columns and not pd.isna(metrics_df.loc[exp, priority_metric]):
-            val = metrics_df.loc[exp, priority_metric]
-            is_best = ""
-            if exp == best_model:
-                is_best = " (BEST MODEL)"
-            
-            if val > 0.9:
-                recommendations[exp] = f"Good performance ({priority_metric}: {val:.4f}){is_best}"
-            elif val > 0.7:
-                recommendations[exp] = f"Average performance ({priority_metric}: {val:.4f}){is_best}"
-            else:
-                recommendations[exp] = f"Poor performance ({priority_metric}: {val:.4f}){is_best}"
-                
-        # if no priority metric, first use accuracy, then F1-score
-        elif 'accuracy' in metrics_df.columns and not pd.isna(metrics_df.loc[exp, 'accuracy']):
-            acc = metrics_df.loc[exp, 'accuracy']
-            if acc > 0.9:
-                recommendations[exp] = f"Good performance (accuracy: {acc:.4f})"
-            elif acc > 0.7:
-                recommendations[exp] = f"Average performance (accuracy: {acc:.4f})"
-            else:
-                recommendations[exp] = f"Poor performance (accuracy: {acc:.4f})"
-                
-        elif 'f1_score' in metrics_df.columns and not pd.isna(metrics_df.loc[exp, 'f1_score']):
-            f1 = metrics_df.loc[exp, 'f1_score']
-            if f1 > 0.9:
-                recommendations[exp] = f"Good performance (F1-score: {f1:.4f})"
-            elif f1 > 0.7:
-                recommendations[exp] = f"Average performance (F1-score: {f1:.4f})"
+    index = metrics_df.index
+
+    # Best model according to the priority metric (first one in case of a tie), the smallest value
+    # for latency, size and loss metrics, the largest one for scores and throughput
+    priority = numeric_column(metrics_df, priority_metric)
+    ascending = lower_is_better(priority_metric)
+    # Costs and throughputs are not scores between 0 and 1, experiments get a rank instead of a tier
+    ranked = not has_performance_tiers(priority_metric)
+    if ranked:
+        candidates = priority.dropna()
+        ranks = priority.rank(method='min', ascending=ascending).to_numpy()
+    else:
+        candidates = priority[priority > -1]
+    if len(candidates):
+        best_model = candidates.idxmin() if ascending else candidates.idxmax()
+    else:
+        best_model = None
+
+    # Which metric describes each experiment: the priority metric, then accuracy, then F1-score,
+    # then the first available numeric metric
+    accuracy = numeric_column(metrics_df, 'accuracy')
+    f1 = numeric_column(metrics_df, 'f1_score')
+    numeric_df = metrics_df.drop(columns=[c for c in NON_METRIC_COLUMNS if c in metrics_df.columns])
+    numeric_df = numeric_df.apply(pd.to_numeric, errors='coerce')
+    has_any = numeric_df.notna().any(axis=1).to_numpy()
+    first_metric = numeric_df.notna().to_numpy().argmax(axis=1) if len(numeric_df.columns) else np.zeros(len(index), dtype=int)
+    first_value = numeric_df.to_numpy()[np.arange(len(index)), first_metric] if len(numeric_df.columns) else np.full(len(index), np.nan)
+
+    use_priority = priority.notna().to_numpy()
+    use_accuracy = ~use_priority & accuracy.notna().to_numpy()
+    use_f1 = ~use_priority & ~use_accuracy & f1.notna().to_numpy()
+    value = np.select([use_priority, use_accuracy, use_f1],
+                      [priority.to_numpy(), accuracy.to_numpy(), f1.to_numpy()], first_value)
+    tiers = performance_tiers(value)
+
+    # Experiments statistically tied with the best one (overlapping bootstrap confidence intervals)
+    tied = [exp for exp in tied_with(metrics_df, priority_metric, best_model) if exp != best_model]
+
+    low, high = confidence_bounds(metrics_df, priority_metric)
+    interval = [f" [{lo:.4f}, {hi:.4f}]" if lo == lo else "" for lo, hi in zip(low.to_numpy(), high.to_numpy())]
+
+    columns = list(numeric_df.columns)
+    for i, exp in enumerate(index):
+        if use_priority[i]:
+            is_best = " (BEST MODEL)" if exp == best_model else " (TIED WITH BEST)" if exp in tied else ""
+            if ranked:
+                # The Good/Average/Poor thresholds do not apply to costs and throughputs, report the rank instead
+                recommendations[exp] = f"Rank {int(ranks[i])}/{len(candidates)} ({priority_metric}: {value[i]:.4f}{interval[i]}){is_best}"
             else:
-                recommendations[exp] = f"Poor performance (F1-score: {f1:.4f})"
-                
+                recommendations[exp] = f"{tiers[i]} performance ({priority_metric}: {value[i]:.4f}{interval[i]}){is_best}"
+        elif use_accuracy[i]:
+            recommendations[exp] = f"{tiers[i]} performance (accuracy: {value[i]:.4f})"
+        elif use_f1[i]:
+            recommendations[exp] = f"{tiers[i]} performance (F1-score: {value[i]:.4f})"
+        elif has_any[i]:
+            recommendations[exp] = f"Performance based on {columns[first_metric[i]]}: {value[i]:.4f}"
         else:
-            # Use any available metric
-            for metric in metrics_df.columns:
-                if not pd.isna(metrics_df.loc[exp, metric]):
-                    val = metrics_df.loc[exp, metric]
-                    recommendations[exp] = f"Performance based on {metric}: {val:.4f}"
-                    break
-            else:
-                recommendations[exp] = "Error 404 No metrics available for evaluation"
-    
+            recommendations[exp] = "Error 404 No metrics available for evaluation"
+
     # Add summary recommendation about best model
-    if best_model:
-        best_value = metrics_df.loc[best_model, priority_metric]
-        summary = f"RECOMMENDATION: Model '{best_model}' is the best performer with {priority_metric} = {best_value:.4f}"
+    if best_model is not None:
+        best_value = priority[best_model]
+        summary = f"RECOMMENDATION: Model '{best_model}'{describe_experiment(configs_df, best_model)} is the best performer with {priority_metric} = {best_value:.4f}"
+        if tied:
+            level = pd.to_numeric(metrics_df.get("confidence_level", pd.Series(dtype=float)), errors='coerce').max()
+            level = f"{level:.0%} " if level == level else ""
+            summary += f", but it is statistically tied with {', '.join(map(str, tied))} (overlapping {level}confidence intervals)"
         recommendations['summary'] = summary
-    
+
     return recommendations
 
 
-def run_compare_metrics(metrics_dir="experiments", configs_dir="experiments", save_path=None, priority_metric='accuracy'):
+def query_experiments(metrics_dir="experiments", configs_dir="experiments", where=None, group_by=None,
+                      priority_metric='accuracy'):
+    """
+    Load only the experiments matching the where filters, and the best one per group_by value.
+
+    The filters and the grouping run on the indexed fields of the catalogs (see scripts/query.py),
+    so only the documents of the matching experiments are parsed into Python objects.
+
+    Returns:
+    --------
+    tuple
+        (metrics, configs, groups): {experiment: document} dicts, and the best_per_group DataFrame
+        (None without group_by)
+    """
+    from scripts.experiment_catalog import ExperimentCatalog
+    from scripts.query import parse_conditions, select_experiments, best_per_group, load_selected
+
+    conditions = parse_conditions(where)
+    with ExperimentCatalog(metrics_dir) as metrics_catalog, ExperimentCatalog(configs_dir) as configs_catalog:
+        same_root = os.path.abspath(metrics_dir) == os.path.abspath(configs_dir)
+        # Both document types live in the same catalog when metrics and configs share their root
+        catalogs = [metrics_catalog] if same_root else [metrics_catalog, configs_catalog]
+        metrics_catalog.refresh("metrics.json")
+        catalogs[-1].refresh("config.json")
+        selected = select_experiments(catalogs, conditions)
+        groups = None
+        if group_by:
+            groups = best_per_group(catalogs, group_by, priority_metric, experiments=selected if conditions else None,
+                                    ascending=lower_is_better(priority_metric))
+        metrics = load_selected(metrics_catalog, "metrics.json", selected)
+        configs = load_selected(catalogs[-1], "config.json", selected)
+    return metrics, configs, groups
+
+
+def run_compare_metrics(metrics_dir="experiments", configs_dir="experiments", save_path=None, priority_metric='accuracy',
+                        top_k=None, profile_path=None, trace_path=None, table_path=None, where=None, group_by=None,
+                        objectives=None):
     """
     Run the metrics comparison and generate recommendations.
     
@@ -124,37 +301,121 @@ def run_compare_metrics(metrics_dir="experiments", configs_dir="experiments", sa
         Path to save the comparison plot, if not specified, the program will show the plot but not save it (default: None)
     priority_metric : str
         Metric to use when giving recommendation (default: 'accuracy')
+    top_k : int or None
+        Also print the leaderboard of the best k experiments by the priority metric,
+        and only plot those experiments (default: None)
+    profile_path : str or None
+        Write the time spent in each stage and the peak RSS growth to this JSON file (default: None)
+    trace_path : str or None
+        Also export the stages as a Chrome trace file (default: None)
+    table_path : str or None
+        Read the experiments from a table written by export_experiment_table instead of the
+        JSON files. Only the metric columns are read from it (default: None)
+    where : str, list of str or None
+        Only compare the experiments matching these filters on config.json and metrics.json fields,
+        e.g. "model_name == RandomForestClassifier and parameters.n_estimators >= 200" (see scripts/query.py).
+        The filters are answered from the catalog indexes, only the matching documents are loaded (default: None)
+    group_by : str or None
+        Also print the best experiment of each value of this field, e.g. 'model_name' (default: None)
+    objectives : list of str or None
+        Also rank the Pareto front of several metrics by weighted score, each written as
+        'metric[:max|min][:weight]', e.g. ['accuracy:max', 'latency_p95_ms:min:0.5'] (see scripts/pareto.py).
+        Adds a 'pareto_summary' recommendation (default: None)
         
     Returns:
     --------
     tuple
         (metrics_df, recommendations, plot_fig)
     """
-    # Load data
-    metrics = load_exp_metrics(metrics_dir)
-    configs = load_exp_configs(configs_dir)
-    
-    if not metrics:
-        print("Error 404 - No experiment metrics found")
-        return None, None, None
-    
-    # Convert to DataFrames
-    metrics_df = conversion_to_df(metrics)
-    configs_df = conversion_to_df(configs) if configs else None
+    profiler = StageProfiler("run_compare_metrics")
+    groups = None
+
+    if table_path:
+        # Columnar export: memory-mapped, and only the metric columns are read
+        from scripts.experiment_table import read_experiment_table, metric_columns
+        with profiler.stage("load_table"):
+            columns = metric_columns(table_path)
+            if where or group_by:
+                # The filters and the grouping need the config columns as well
+                from scripts.query import parse_conditions, filter_frame, best_per_group_frame
+                table_df = filter_frame(read_experiment_table(table_path), parse_conditions(where))
+                if group_by:
+                    groups = best_per_group_frame(table_df, group_by, priority_metric, lower_is_better(priority_metric))
+                metrics_df = table_df[[c for c in columns if c in table_df.columns]]
+                configs_df = table_df[[c for c in DESCRIBE_COLUMNS if c in table_df.columns]]
+            else:
+                metrics_df = read_experiment_table(table_path, columns)
+                # Only what the recommendation summary shows of the configs
+                configs_df = read_experiment_table(table_path, DESCRIBE_COLUMNS)
+        if metrics_df.empty:
+            print("Error 404 - No experiment metrics found")
+            return None, None, None
+    else:
+        if where or group_by:
+            with profiler.stage("query"):
+                metrics, configs, groups = query_experiments(metrics_dir, configs_dir, where, group_by, priority_metric)
+        else:
+            # Load data
+            with profiler.stage("load_metrics"):
+                metrics = load_exp_metrics(metrics_dir)
+            with profiler.stage("load_configs"):
+                configs = load_exp_configs(configs_dir)
+
+        if not metrics:
+            print("Error 404 - No experiment metrics found")
+            return None, None, None
+
+        # Convert to DataFrames
+        with profiler.stage("to_dataframe"):
+            metrics_df = conversion_to_df(metrics)
+            configs_df = conversion_to_df(configs) if configs else None
     
     # Display metrics
     print("\nMetrics Comparison:")
     print(metrics_df)
     print("\n")
     
-    # Plot metrics
-    fig = plot_metrics(metrics_df, save_path)
+    # Plot metrics (only the top_k experiments by the priority metric when top_k is set)
+    with profiler.stage("plot"):
+        fig = plot_metrics(metrics_df, save_path, top_k=top_k, sort_by=priority_metric)
     
+    # Leaderboard of the best experiments, without building a recommendation string per row
+    if top_k:
+        with profiler.stage("leaderboard"):
+            board = leaderboard(metrics_df, priority_metric, k=top_k)
+        print(f"\nTop {top_k} experiments by {priority_metric}:")
+        print(board)
+
+    if group_by:
+        print(f"\nBest experiment per {group_by} by {priority_metric}:")
+        print(groups.to_string(index=False) if len(groups) else f"No experiment has both {group_by} and {priority_metric}")
+
     # Generate recommendations with priority metric
-    recommendations = give_recommendation(metrics_df, configs_df, priority_metric)
+    with profiler.stage("recommend"):
+        recommendations = give_recommendation(metrics_df, configs_df, priority_metric)
+
+    # Trade-offs between several metrics: only the non-dominated experiments, best weighted score first
+    if objectives:
+        from scripts.pareto import parse_objectives, pareto_ranking, pareto_recommendation, describe_objectives
+        with profiler.stage("pareto"):
+            parsed = parse_objectives(objectives)
+            front = pareto_ranking(metrics_df, parsed)
+            pareto_summary = pareto_recommendation(metrics_df, parsed, configs_df)
+        print(f"\nPareto front ({describe_objectives(parsed)}), dominated experiments filtered out:")
+        print(front.head(top_k) if top_k else front)
+        if pareto_summary:
+            recommendations["pareto_summary"] = pareto_summary
     print("\nRecommendations:")
     for exp, rec in recommendations.items():
         print(f"- {exp}: {rec}")
+
+    # Timing of each stage
+    if profile_path:
+        profiler.write(profile_path)
+        print(f"Profile saved to {profile_path}")
+    if trace_path:
+        profiler.write_chrome_trace(trace_path)
+        print(f"Chrome trace saved to {trace_path}")
     
     return metrics_df, recommendations, fig
 
@@ -168,9 +429,23 @@ def main():
                         help="Path to save the plot.")
     parser.add_argument("--priority", type=str, default="accuracy",
                         help="Priority metric used for recommendations, can be defined directly or selected in streamlit interface")
+    parser.add_argument("--top_k", type=int, default=None,
+                        help="Print the leaderboard of the best k experiments by the priority metric.")
+    parser.add_argument("--profile_path", type=str, default=None,
+                        help="Save the time spent in each stage to this JSON file.")
+    parser.add_argument("--table_path", type=str, default=None,
+                        help="Read the experiments from an exported Arrow/Parquet table instead of the JSON files.")
+    parser.add_argument("--where", type=str, action="append", default=None,
+                        help="Only compare experiments matching this filter, e.g. 'model_name == RandomForestClassifier'. Can be repeated.")
+    parser.add_argument("--group_by", type=str, default=None,
+                        help="Print the best experiment of each value of this config field, e.g. model_name.")
+    parser.add_argument("--objective", type=str, action="append", default=None,
+                        help="Objective of the Pareto front as metric[:max|min][:weight], e.g. latency_p95_ms:min. Can be repeated.")
     args = parser.parse_args()
     
-    run_compare_metrics(args.metrics_dir, args.configs_dir, args.save_path, args.priority)
+    run_compare_metrics(args.metrics_dir, args.configs_dir, args.save_path, args.priority, args.top_k, args.profile_path,
+                        table_path=args.table_path, where=args.where, group_by=args.group_by,
+                        objectives=args.objective)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
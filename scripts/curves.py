@@ -0,0 +1,127 @@
+import os
+import numpy as np
+
+# ROC/PR curves of binary classifiers, stored next to metrics.json
+CURVES_FILENAME = "curves.npz"
+# Points kept per curve, enough for a smooth plot while keeping the file a few KB
+DEFAULT_CURVE_POINTS = 200
+# np.trapezoid only exists since NumPy 2.0, np.trapz is the same function in NumPy 1.x
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def binary_curves(y_true, scores):
+    """
+    ROC and precision-recall curves at every distinct threshold, from one sort and cumulative sums.
+
+    Parameters:
+    -----------
+    y_true : array-like of bool
+        True for the positive class
+    scores : array-like of float
+        Score of the positive class (e.g. predict_proba[:, 1])
+
+    Returns:
+    --------
+    dict or None
+        roc_auc (trapezoidal, same as sklearn's roc_auc_score), pr_auc (average precision, same as
+        sklearn's average_precision_score) and the full curves. None when y_true has a single class.
+    """
+    y_true = np.asarray(y_true, dtype=bool).ravel()
+    scores = np.asarray(scores, dtype=np.float64).ravel()
+    n_pos = int(y_true.sum())
+    if n_pos == 0 or n_pos == len(y_true):
+        return None
+
+    # Decreasing scores, every distinct score is a threshold: only the last row of a run of ties counts
+    order = np.argsort(-scores, kind="mergesort")
+    scores, y_true = scores[order], y_true[order]
+    last_of_run = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tps = np.cumsum(y_true)[last_of_run]
+    fps = last_of_run + 1 - tps
+    thresholds = scores[last_of_run]
+
+    fpr = np.r_[0.0, fps / fps[-1]]
+    tpr = np.r_[0.0, tps / n_pos]
+    precision = tps / (tps + fps)
+    recall = tps / n_pos
+    return {
+        "roc_auc": float(_trapezoid(tpr, fpr)),
+        "pr_auc": float(np.sum(np.diff(np.r_[0.0, recall]) * precision)),
+        "roc_fpr": fpr,
+        "roc_tpr": tpr,
+        "roc_thresholds": np.r_[np.inf, thresholds],
+        # Starts at (recall 0, precision 1) like sklearn's precision_recall_curve
+        "pr_recall": np.r_[0.0, recall],
+        "pr_precision": np.r_[1.0, precision],
+        "pr_thresholds": np.r_[np.inf, thresholds],
+    }
+
+
+def downsample(n, n_points=DEFAULT_CURVE_POINTS):
+    """Indices of at most n_points evenly spaced points of a curve of n points, both ends included."""
+    if n <= n_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, n_points).round().astype(np.int64))
+
+
+def curves_from_predictions(predictions, n_points=DEFAULT_CURVE_POINTS):
+    """
+    Scores and downsampled curves from cached predictions (see scripts/predictions.py).
+
+    Only binary classifiers with probabilities get curves, the second entry of classes is the
+    positive class. Returns (scores, curves): scores holds roc_auc and pr_auc for metrics.json,
+    curves the float32 arrays for curves.npz. Both are None when no curve can be computed.
+    """
+    y_proba, classes = predictions.get("y_proba"), predictions.get("classes")
+    if y_proba is None or classes is None or len(classes) != 2:
+        return None, None
+    curves = binary_curves(np.asarray(predictions["y_true"]) == classes[1], y_proba[:, 1])
+    if curves is None:
+        return None, None
+    scores = {"roc_auc": curves.pop("roc_auc"), "pr_auc": curves.pop("pr_auc")}
+    compact = {}
+    for kind in ("roc", "pr"):
+        names = [name for name in curves if name.startswith(kind + "_")]
+        keep = downsample(len(curves[names[0]]), n_points)
+        for name in names:
+            compact[name] = curves[name][keep].astype(np.float32)
+    return scores, compact
+
+
+def write_curves(exp_path, curves):
+    path = os.path.join(exp_path, CURVES_FILENAME)
+    np.savez_compressed(path, **curves)
+    return path
+
+
+def load_curves(exp_path):
+    """The curves of an experiment (loose or packed) as a dict of arrays, None when it has no curves.npz."""
+    from scripts.packs import open_experiment_file
+    try:
+        f = open_experiment_file(exp_path, CURVES_FILENAME)
+    except FileNotFoundError:
+        return None
+    with f, np.load(f) as data:
+        return {name: data[name] for name in data.files}
+
+
+def plot_curves(curves_by_experiment, save_path=None):
+    """Overlay the ROC and precision-recall curves of several experiments ({experiment: curves})."""
+    # matplotlib is only needed here, computing and storing curves does not import it
+    import matplotlib.pyplot as plt
+
+    fig, (roc_ax, pr_ax) = plt.subplots(1, 2, figsize=(12, 5))
+    for exp, curves in curves_by_experiment.items():
+        roc_ax.plot(curves["roc_fpr"], curves["roc_tpr"], label=exp)
+        pr_ax.plot(curves["pr_recall"], curves["pr_precision"], label=exp)
+    roc_ax.plot([0, 1], [0, 1], linestyle="--", color="grey", linewidth=1)
+    roc_ax.set(title="ROC curve", xlabel="False positive rate", ylabel="True positive rate")
+    pr_ax.set(title="Precision-Recall curve", xlabel="Recall", ylabel="Precision")
+    for ax in (roc_ax, pr_ax):
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1.02)
+        ax.legend(loc="best", fontsize="small")
+    fig.tight_layout()
+    if save_path:
+        fig.savefig(save_path)
+    return fig
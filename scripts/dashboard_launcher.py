@@ -0,0 +1,14 @@
+import os
+import subprocess
+
+
+# Wrapper function for running inside a notebook
+def run_dashboard_ui():
+    """
+    Run the Streamlit dashboard from a notebook or external script.
+    Usage:
+        from scripts.run_dashboard import run_dashboard_ui
+        run_dashboard_ui()
+    """
+    script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_dashboard.py")
+    subprocess.Popen(["streamlit", "run", script_path])  # Launch Streamlit in a non-blocking way
@@ -0,0 +1,155 @@
+import os
+import numpy as np
+import pandas as pd
+from scripts.evaluation import DEFAULT_BATCH_SIZE
+
+# File extensions recognised when the test data format is 'auto'
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+
+
+def detect_format(path, file_format="auto"):
+    """Return 'csv', 'parquet' or 'feather' for the given test data file."""
+    if file_format != "auto":
+        return file_format
+    ext = os.path.splitext(str(path))[1].lower()
+    return FORMAT_EXTENSIONS.get(ext, "csv")
+
+
+def parse_dtype(spec):
+    """
+    Parse a dtype option from the CLI.
+
+    'float32' applies to every feature column, 'age:int16,chol:float32' to the named columns.
+    """
+    if not spec:
+        return None
+    if ":" not in spec:
+        return spec
+    return dict(item.split(":", 1) for item in spec.split(","))
+
+
+def read_columns(path, file_format="auto"):
+    """Read only the column names of the test data file."""
+    file_format = detect_format(path, file_format)
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    if file_format == "feather":
+        import pyarrow as pa
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _feature_dtypes(columns, label_col, dtype):
+    """Expand a single dtype to all feature columns, the label column keeps its own type."""
+    if dtype is None or isinstance(dtype, dict):
+        return dtype
+    return {col: dtype for col in columns if col != label_col}
+
+
+def downcast_frame(df):
+    """Shrink float64 columns to float32 and integers to the smallest integer type."""
+    for col in df.columns:
+        kind = df[col].dtype.kind
+        if kind == "f":
+            df[col] = df[col].astype(np.float32)
+        elif kind in "iu":
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def _split(chunk, label_col, downcast):
+    # pop moves the label out without copying the feature columns
+    y = chunk.pop(label_col).to_numpy()
+    if downcast:
+        chunk = downcast_frame(chunk)
+    return chunk, y
+
+
+def _iter_csv(path, chunksize, engine, dtype):
+    if engine == "pyarrow":
+        # pandas does not support chunksize with engine='pyarrow', use pyarrow's streaming reader
+        import pyarrow as pa
+        import pyarrow.csv as pv
+        column_types = {col: pa.type_for_alias(str(t)) for col, t in (dtype or {}).items()}
+        convert_options = pv.ConvertOptions(column_types=column_types)
+        with pv.open_csv(path, convert_options=convert_options) as reader:
+            for batch in reader:
+                for start in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(start, chunksize).to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, engine=engine, dtype=dtype)
+
+
+def _iter_parquet(path, chunksize, columns):
+    import pyarrow.parquet as pq
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+        yield batch.to_pandas()
+
+
+def _iter_feather(path, chunksize, columns):
+    import pyarrow as pa
+    # The file is memory-mapped, record batches are read without loading the whole table
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize).to_pandas()
+
+
+def iter_labeled_batches(path, label_col="label", chunksize=DEFAULT_BATCH_SIZE, file_format="auto",
+                         engine="c", dtype=None, downcast=False, columns=None):
+    """
+    Stream a test data file as (features DataFrame, label array) chunks.
+
+    Parameters:
+    -----------
+    path : str
+        CSV, Parquet or Feather file containing the features and the label column
+    label_col : str
+        Name of the label column
+    chunksize : int
+        Number of rows per chunk
+    file_format : str
+        'auto' (from the extension), 'csv', 'parquet' or 'feather'
+    engine : str
+        CSV parser, 'c', 'python' or 'pyarrow'
+    dtype : str, dict or None
+        dtype for every feature column, or a {column: dtype} mapping (CSV only)
+    downcast : bool
+        Shrink float64 features to float32 and integers to the smallest integer type
+    columns : list or None
+        Columns to read (Parquet/Feather only), the label column is always included
+
+    Yields:
+    -------
+    tuple
+        (x, y) for each chunk
+    """
+    file_format = detect_format(path, file_format)
+    if columns is not None and label_col not in columns:
+        columns = [*columns, label_col]
+
+    if file_format == "parquet":
+        chunks = _iter_parquet(path, chunksize, columns)
+    elif file_format == "feather":
+        chunks = _iter_feather(path, chunksize, columns)
+    elif file_format == "csv":
+        dtype = _feature_dtypes(read_columns(path, "csv"), label_col, dtype)
+        chunks = _iter_csv(path, chunksize, engine, dtype)
+    else:
+        raise ValueError(f"Unknown test data format '{file_format}'")
+
+    for chunk in chunks:
+        yield _split(chunk, label_col, downcast)
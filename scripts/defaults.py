@@ -0,0 +1,36 @@
+# Defaults shared by the CLI and the scripts, kept in a dependency-free module
+# so that importing them does not pull in numpy or pandas
+
+# Number of rows passed to model.predict at once when no batch size is given
+DEFAULT_BATCH_SIZE = 65536
+
+# Inference benchmark: batch sizes timed (single-row serving, small and large batches),
+# timed runs per batch size and untimed warm-up runs before them
+DEFAULT_BENCHMARK_BATCH_SIZES = (1, 32, 1024)
+DEFAULT_BENCHMARK_REPEATS = 20
+DEFAULT_BENCHMARK_WARMUP = 3
+
+# Unreferenced blobs younger than this are kept by the blob gc: their experiment may still be packaging
+DEFAULT_GC_GRACE_SECONDS = 3600
+
+# Compaction: experiments untouched for less than this are still being written and are never packed,
+# and at most this many experiments go into one pack file
+DEFAULT_COMPACT_MIN_AGE_SECONDS = 3600
+DEFAULT_PACK_EXPERIMENTS = 10_000
+
+# compare-metrics --watch: quiet period after the last file event before refreshing the outputs,
+# longest wait for that quiet period while files keep changing, and size of the leaderboard kept on screen
+DEFAULT_WATCH_DEBOUNCE_SECONDS = 2.0
+DEFAULT_WATCH_MAX_LATENCY_SECONDS = 10.0
+DEFAULT_WATCH_TOP_K = 20
+
+# mlops serve: listening address, page size of the list endpoints (and its upper bound), and how often
+# the experiments root is re-checked for changes (each check is one stat per experiment)
+DEFAULT_API_HOST = "127.0.0.1"
+DEFAULT_API_PORT = 8000
+DEFAULT_API_PAGE_SIZE = 100
+MAX_API_PAGE_SIZE = 1000
+DEFAULT_API_REFRESH_SECONDS = 1.0
+
+# Streaming evaluation: metrics.json snapshots are written at most this often (and at the end of the stream)
+DEFAULT_STREAM_FLUSH_SECONDS = 10.0
@@ -0,0 +1,183 @@
+import time
+import numpy as np
+from scripts.defaults import DEFAULT_BATCH_SIZE
+
+
+def iter_batches(test_x, test_y, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield (x, y) slices of the test set without copying the whole feature matrix."""
+    n_rows = len(test_y)
+    for start in range(0, n_rows, batch_size):
+        stop = min(start + batch_size, n_rows)
+        # DataFrames are sliced by position, arrays and sparse matrices directly
+        x = test_x.iloc[start:stop] if hasattr(test_x, "iloc") else test_x[start:stop]
+        y = test_y.iloc[start:stop] if hasattr(test_y, "iloc") else test_y[start:stop]
+        yield x, np.asarray(y)
+
+
+class ConfusionMatrixAccumulator:
+    """
+    Running confusion matrix over batches of (y_true, y_pred).
+
+    Labels are discovered on the fly and kept sorted, like sklearn's confusion_matrix,
+    so the final matrix is identical to the one computed on the full arrays.
+    Memory is O(n_classes²) whatever the number of rows.
+    """
+
+    def __init__(self, labels=None):
+        self.labels = np.asarray(labels) if labels is not None else None
+        n = 0 if self.labels is None else len(self.labels)
+        self.matrix = np.zeros((n, n), dtype=np.int64)
+
+    @property
+    def n_samples(self):
+        return int(self.matrix.sum())
+
+    def _grow(self, new_labels):
+        """Add unseen labels, keeping the label order sorted and the existing counts in place."""
+        if self.labels is None:
+            merged = np.unique(new_labels)
+        else:
+            merged = np.union1d(self.labels, new_labels)
+            if len(merged) == len(self.labels):
+                return
+        matrix = np.zeros((len(merged), len(merged)), dtype=np.int64)
+        if self.labels is not None and len(self.labels):
+            old = np.searchsorted(merged, self.labels)
+            matrix[np.ix_(old, old)] = self.matrix
+        self.labels = merged
+        self.matrix = matrix
+
+    def encode(self, values):
+        """Map label values to their row/column index, growing the label set if needed."""
+        values = np.asarray(values).ravel()
+        self._grow(np.unique(values))
+        return np.searchsorted(self.labels, values)
+
+    def update(self, y_true, y_pred):
+        true_idx = self.encode(y_true)
+        pred_idx = self.encode(y_pred)
+        self.update_encoded(true_idx, pred_idx)
+        return true_idx, pred_idx
+
+    def update_encoded(self, true_idx, pred_idx):
+        k = len(self.labels)
+        # One bincount over combined codes instead of one pass per metric
+        counts = np.bincount(true_idx * k + pred_idx, minlength=k * k)
+        self.matrix += counts.reshape(k, k)
+
+
+def metrics_from_confusion_matrix(cm):
+    """
+    Derive accuracy and weighted F1/precision/recall from a confusion matrix.
+
+    Works on a single (k, k) matrix or on a stack of shape (..., k, k), in which case
+    every value is an array over the leading dimensions. The results match sklearn's
+    average='weighted' scores with zero_division=0.
+    """
+    cm = np.asarray(cm, dtype=np.float64)
+    tp = np.diagonal(cm, axis1=-2, axis2=-1)
+    support = cm.sum(axis=-1)
+    predicted = cm.sum(axis=-2)
+    total = support.sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        denom = precision + recall
+        f1 = np.where(denom > 0, 2 * precision * recall / denom, 0.0)
+        weights = np.where(total[..., None] > 0, support / total[..., None], 0.0)
+        accuracy = np.where(total > 0, tp.sum(axis=-1) / total, 0.0)
+
+    return {
+        "accuracy": accuracy,
+        "f1_score": (f1 * weights).sum(axis=-1),
+        "precision": (precision * weights).sum(axis=-1),
+        "recall": (recall * weights).sum(axis=-1),
+    }
+
+
+# Bootstrap resamples drawn at once are limited to this many confusion matrix cells (float64: 32 MB)
+BOOTSTRAP_CHUNK_CELLS = 1 << 22
+
+
+def bootstrap_confidence_intervals(cm, n_resamples=1000, confidence=0.95, seed=0):
+    """
+    Percentile bootstrap confidence intervals of the confusion-matrix metrics.
+
+    Resampling the n test rows with replacement and counting them again gives a confusion matrix
+    drawn from a multinomial distribution over the k*k cells with the observed cell frequencies,
+    so the resampled matrices are drawn directly, in chunks of (B, k, k), and scored all at once
+    by metrics_from_confusion_matrix. The cost depends on n_resamples and k only, not on the
+    number of rows.
+
+    Returns:
+    --------
+    dict
+        {metric: [low, high]} for accuracy, f1_score, precision and recall
+    """
+    cm = np.asarray(cm, dtype=np.int64)
+    n, k = int(cm.sum()), cm.shape[0]
+    if n == 0:
+        return {}
+    rng = np.random.default_rng(seed)
+    cells = cm.ravel() / n
+    chunk = max(1, BOOTSTRAP_CHUNK_CELLS // max(1, k * k))
+    samples = {}
+    for start in range(0, n_resamples, chunk):
+        size = min(chunk, n_resamples - start)
+        resampled = rng.multinomial(n, cells, size=size).reshape(size, k, k)
+        for name, values in metrics_from_confusion_matrix(resampled).items():
+            samples.setdefault(name, []).append(values)
+    tail = (1 - confidence) / 2 * 100
+    return {name: [float(v) for v in np.percentile(np.concatenate(values), [tail, 100 - tail])]
+            for name, values in samples.items()}
+
+
+def evaluate_batches(model, batches, profiler=None, recorder=None):
+    """
+    Predict batch by batch and accumulate a single confusion matrix.
+
+    With a StageProfiler, the total time spent in model.predict and in the confusion matrix
+    updates is recorded as the 'predict' and 'confusion_matrix' stages of 'evaluate'.
+    With a PredictionRecorder, the labels and predictions of every batch (and the probabilities
+    when the model has predict_proba, timed as 'predict_proba') are kept for the predictions cache.
+    """
+    accumulator = ConfusionMatrixAccumulator()
+    predict_seconds = update_seconds = proba_seconds = 0.0
+    for x, y in batches:
+        start = time.perf_counter()
+        y_pred = model.predict(x)
+        predicted = time.perf_counter()
+        accumulator.update(y, y_pred)
+        predict_seconds += predicted - start
+        update_seconds += time.perf_counter() - predicted
+        if recorder is not None:
+            y_proba = None
+            if recorder.has_proba:
+                start = time.perf_counter()
+                y_proba = model.predict_proba(x)
+                proba_seconds += time.perf_counter() - start
+            recorder.add(y, y_pred, y_proba)
+    if profiler is not None:
+        profiler.add("predict", predict_seconds, parent="evaluate")
+        profiler.add("confusion_matrix", update_seconds, parent="evaluate")
+        if recorder is not None and recorder.has_proba:
+            profiler.add("predict_proba", proba_seconds, parent="evaluate")
+    return accumulator
+
+
+def confusion_matrix_metrics(accumulator):
+    """Build the metrics.json dictionary out of an accumulated confusion matrix."""
+    scores = metrics_from_confusion_matrix(accumulator.matrix)
+    metrics = {name: float(value) for name, value in scores.items()}
+    metrics["confusion_matrix"] = accumulator.matrix.tolist()
+    return metrics
+
+
+def bootstrap_metrics(cm, n_resamples=1000, confidence=0.95, seed=0):
+    """The metrics.json entries describing the bootstrap confidence intervals of a confusion matrix."""
+    return {
+        "confidence_intervals": bootstrap_confidence_intervals(cm, n_resamples, confidence, seed),
+        "confidence_level": confidence,
+        "bootstrap_resamples": n_resamples,
+    }
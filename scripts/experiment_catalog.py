@@ -0,0 +1,235 @@
+import os
+import re
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from scripts.packs import PackEntry, PackReader, packed_experiments
+
+logger = logging.getLogger(__name__)
+
+# The catalog lives next to the experiments it indexes (e.g. experiments/.mlops_catalog.sqlite)
+CATALOG_FILENAME = ".mlops_catalog.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    experiment TEXT NOT NULL,
+    filename   TEXT NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    size       INTEGER NOT NULL,
+    payload    TEXT NOT NULL,
+    PRIMARY KEY (experiment, filename)
+);
+CREATE TABLE IF NOT EXISTS fields (
+    experiment TEXT NOT NULL,
+    filename   TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    num_value  REAL,
+    text_value TEXT
+);
+CREATE INDEX IF NOT EXISTS fields_by_experiment ON fields (experiment, filename);
+CREATE INDEX IF NOT EXISTS fields_by_num ON fields (filename, key, num_value);
+CREATE INDEX IF NOT EXISTS fields_by_text ON fields (filename, key, text_value);
+"""
+
+
+def flatten_dict(data, prefix=""):
+    """Flatten nested dicts into dotted keys, e.g. {'parameters': {'n': 1}} -> {'parameters.n': 1}."""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten_dict(value, prefix=f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _field_row(value):
+    """Split a flattened value into the (num_value, text_value) columns of the fields table."""
+    if value is None:
+        return None, None
+    if isinstance(value, bool):
+        return float(value), str(value)
+    if isinstance(value, (int, float)):
+        return float(value), None
+    if isinstance(value, str):
+        return None, value
+    # Lists and other objects (e.g. confusion_matrix) are kept as JSON text
+    return None, json.dumps(value)
+
+
+def natural_key(name):
+    """Sort key so that exp2 comes before exp10."""
+    match = re.match(r"^(.*?)(\d+)$", name)
+    if match:
+        return (match.group(1), int(match.group(2)))
+    return (name, -1)
+
+
+class ExperimentCatalog:
+    """
+    Persistent, incremental index of the JSON files stored in each experiment folder.
+
+    Every document (metrics.json, config.json, ...) is recorded together with the
+    mtime and size of the file it came from, so a refresh only needs one stat per
+    experiment and re-parses just the folders that were added or changed.
+    The flattened fields of each document are stored in an indexed table as well.
+    Experiments compacted into packs (see scripts/packs.py) are read from the pack index,
+    a loose folder with the same name takes precedence.
+    """
+
+    def __init__(self, root="experiments"):
+        self.root = Path(root)
+        self.path = self.root / CATALOG_FILENAME
+        self.conn = self._connect()
+
+    def _connect(self):
+        if self.root.is_dir():
+            try:
+                conn = sqlite3.connect(self.path, timeout=30)
+                conn.executescript(_SCHEMA)
+                return conn
+            except sqlite3.Error as e:
+                # Read-only experiment roots still work, just without persistence
+                logger.warning(f"Could not open catalog at {self.path} ({e}), using an in-memory catalog")
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def store_selection(self, experiments, table="selected"):
+        """
+        Put experiment names in a temporary table, so a selection of any size can be joined
+        (an IN (...) list is bounded by the SQLite variable limit).
+        """
+        self.conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} (experiment TEXT PRIMARY KEY)")
+        self.conn.execute(f"DELETE FROM {table}")
+        self.conn.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?)", [(e,) for e in experiments])
+        # Close the implicit transaction, it would otherwise keep a read lock on the catalog
+        self.conn.commit()
+
+    def _scan(self, filename, experiments=None):
+        """
+        Return {experiment: (location, mtime_ns, size)} for the experiments containing filename.
+
+        The location is the path of a loose file, or a PackEntry for packed experiments.
+        """
+        found = {}
+        packed = packed_experiments(self.root)
+        if experiments is None:
+            try:
+                experiments = [entry.name for entry in os.scandir(self.root) if entry.is_dir()]
+            except FileNotFoundError:
+                experiments = []
+            experiments = set(experiments) | packed.keys()
+        for name in experiments:
+            path = self.root / name / filename
+            try:
+                st = os.stat(path)
+            except (FileNotFoundError, NotADirectoryError):
+                entry = packed.get(name, {}).get(filename)
+                if entry is not None:
+                    found[name] = (entry, entry.mtime_ns, entry.size)
+                continue
+            found[name] = (path, st.st_mtime_ns, st.st_size)
+        return found
+
+    def refresh(self, filename, experiments=None):
+        """
+        Bring the catalog up to date for one document type.
+
+        Parameters:
+        -----------
+        filename : str
+            Name of the JSON file inside each experiment folder (e.g. 'metrics.json')
+        experiments : iterable of str or None
+            Only re-check these experiment folders (e.g. names reported by a file watcher).
+            When None, the whole root is scanned.
+
+        Returns:
+        --------
+        int
+            Number of experiments that were added, updated or removed
+        """
+        if experiments is not None:
+            experiments = list(experiments)
+        on_disk = self._scan(filename, experiments)
+
+        if experiments is None:
+            rows = self.conn.execute(
+                "SELECT experiment, mtime_ns, size FROM documents WHERE filename = ?", (filename,))
+        else:
+            self.store_selection(experiments, "refreshed")
+            rows = self.conn.execute(
+                "SELECT experiment, mtime_ns, size FROM documents WHERE filename = ? "
+                "AND experiment IN (SELECT experiment FROM refreshed)", (filename,))
+        known = {name: (mtime_ns, size) for name, mtime_ns, size in rows}
+
+        changed = 0
+        with self.conn, PackReader() as reader:
+            for name in known.keys() - on_disk.keys():
+                self._delete(name, filename)
+                changed += 1
+
+            for name, (path, mtime_ns, size) in on_disk.items():
+                if known.get(name) == (mtime_ns, size):
+                    continue
+                try:
+                    if isinstance(path, PackEntry):
+                        data = json.loads(reader.read(path))
+                    else:
+                        with open(path) as f:
+                            data = json.load(f)
+                except (OSError, ValueError) as e:
+                    # Probably being written right now, it will be picked up on the next refresh
+                    logger.warning(f"Skipping unreadable {path}: {e}")
+                    continue
+                self._store(name, filename, mtime_ns, size, data)
+                changed += 1
+        return changed
+
+    def _delete(self, name, filename):
+        self.conn.execute("DELETE FROM documents WHERE experiment = ? AND filename = ?", (name, filename))
+        self.conn.execute("DELETE FROM fields WHERE experiment = ? AND filename = ?", (name, filename))
+
+    def _store(self, name, filename, mtime_ns, size, data):
+        self._delete(name, filename)
+        self.conn.execute(
+            "INSERT INTO documents (experiment, filename, mtime_ns, size, payload) VALUES (?, ?, ?, ?, ?)",
+            (name, filename, mtime_ns, size, json.dumps(data)))
+        if isinstance(data, dict):
+            self.conn.executemany(
+                "INSERT INTO fields (experiment, filename, key, num_value, text_value) VALUES (?, ?, ?, ?, ?)",
+                [(name, filename, key, *_field_row(value)) for key, value in flatten_dict(data).items()])
+
+    def load(self, filename, refresh=True, experiments=None):
+        """Return {experiment: document} for every experiment (or only the given ones) containing filename."""
+        if experiments is not None:
+            experiments = list(experiments)
+        if refresh:
+            self.refresh(filename, experiments)
+        if experiments is None:
+            rows = self.conn.execute(
+                "SELECT experiment, payload FROM documents WHERE filename = ?", (filename,)).fetchall()
+        else:
+            self.store_selection(experiments, "loaded")
+            rows = self.conn.execute(
+                "SELECT experiment, payload FROM documents WHERE filename = ? "
+                "AND experiment IN (SELECT experiment FROM loaded)", (filename,)).fetchall()
+        rows.sort(key=lambda row: natural_key(row[0]))
+        return {name: json.loads(payload) for name, payload in rows}
+
+
+def load_documents(directory="experiments", filename="metrics.json"):
+    """Load one JSON document per experiment folder through the on-disk catalog."""
+    with ExperimentCatalog(directory) as catalog:
+        return catalog.load(filename)
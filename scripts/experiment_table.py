@@ -0,0 +1,101 @@
+import os
+import json
+import pyarrow as pa
+from scripts.experiment_catalog import ExperimentCatalog, flatten_dict
+
+# Default export file, written in the experiments root
+EXPERIMENT_TABLE_FILENAME = "experiments.arrow"
+# Schema metadata key listing the columns that come from metrics.json
+METRIC_COLUMNS_KEY = b"mlops.metric_columns"
+
+
+def _column(values):
+    """Typed Arrow array for one column, values that mix types are stored as strings (JSON for objects)."""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        return pa.array([v if v is None or isinstance(v, str) else json.dumps(v) for v in values], pa.string())
+
+
+def build_experiment_table(experiments_dir="experiments"):
+    """
+    One row per experiment: the metrics.json values as columns, plus config.json flattened into
+    typed columns (e.g. parameters.n_estimators as an int64 column).
+
+    Nested metrics (confusion_matrix, confidence_intervals) are kept as list/struct columns, so a
+    DataFrame read back from the table looks like the one built by conversion_to_df.
+    A config column whose name is already a metric is prefixed with 'config.'.
+    """
+    with ExperimentCatalog(experiments_dir) as catalog:
+        metrics = catalog.load("metrics.json")
+        configs = catalog.load("config.json")
+
+    experiments = list(metrics) + [exp for exp in configs if exp not in metrics]
+    rows = []
+    for exp in experiments:
+        row = dict(metrics.get(exp, {}))
+        for key, value in flatten_dict(configs.get(exp, {})).items():
+            row[f"config.{key}" if key in row else key] = value
+        rows.append(row)
+
+    metric_columns = list(dict.fromkeys(key for doc in metrics.values() for key in doc))
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    arrays = [pa.array(experiments, pa.string())] + [_column([row.get(c) for row in rows]) for c in columns]
+    schema_metadata = {METRIC_COLUMNS_KEY: json.dumps(metric_columns).encode()}
+    return pa.Table.from_arrays(arrays, names=["experiment"] + columns).replace_schema_metadata(schema_metadata)
+
+
+def export_experiment_table(experiments_dir="experiments", path=None):
+    """
+    Write all experiments into one Arrow IPC (.arrow/.feather) or Parquet (.parquet) file.
+
+    The Arrow file is uncompressed so it can be memory-mapped without any copy.
+    Returns the path written (default: <experiments_dir>/experiments.arrow).
+    """
+    path = path or os.path.join(experiments_dir, EXPERIMENT_TABLE_FILENAME)
+    table = build_experiment_table(experiments_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if str(path).endswith(".parquet"):
+        import pyarrow.parquet as pq
+        pq.write_table(table, tmp_path)
+    else:
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_table_schema(path):
+    """Schema of an exported table, without reading any column."""
+    if str(path).endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_schema(path, memory_map=True)
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def metric_columns(path):
+    """Names of the columns of an exported table that came from metrics.json."""
+    metadata = read_table_schema(path).metadata or {}
+    return json.loads(metadata.get(METRIC_COLUMNS_KEY, b"[]"))
+
+
+def read_experiment_table(path, columns=None):
+    """
+    Load an exported table as a DataFrame indexed by experiment, reading only the given columns.
+
+    Arrow files are memory-mapped (the selected columns are not copied until pandas needs them),
+    Parquet files are read with column projection. Unknown columns are ignored.
+    """
+    schema = read_table_schema(path)
+    if columns is not None:
+        columns = ["experiment"] + [c for c in columns if c in schema.names and c != "experiment"]
+    if str(path).endswith(".parquet"):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+            if columns is not None:
+                table = table.select(columns)
+    return table.to_pandas(split_blocks=True).set_index("experiment").rename_axis(None)
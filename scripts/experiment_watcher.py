@@ -0,0 +1,81 @@
+import os
+import threading
+
+# Files whose creation or modification means an experiment has to be reloaded
+WATCHED_FILES = ("metrics.json", "config.json")
+
+
+class ExperimentWatcher:
+    """
+    Watch an experiments root with watchdog and collect the experiment folders that changed.
+
+    Consumers call drain() to get the names changed since the last call and refresh only
+    those experiments instead of rescanning the whole root. `generation` increases on every
+    relevant event and can be used as a cheap cache key.
+    """
+
+    def __init__(self, root="experiments", filenames=WATCHED_FILES, on_change=None):
+        self.root = os.path.abspath(root)
+        self.filenames = set(filenames)
+        self.on_change = on_change
+        self.generation = 0
+        self._changed = set()
+        self._lock = threading.Lock()
+        self._observer = None
+
+    def _experiment_of(self, path):
+        """Return the experiment name for root/<exp>/<watched file>, None for anything else."""
+        if not path:
+            return None
+        path = os.path.abspath(os.fsdecode(path))
+        exp_dir, filename = os.path.split(path)
+        if filename not in self.filenames or os.path.dirname(exp_dir) != self.root:
+            return None
+        return os.path.basename(exp_dir)
+
+    def notify(self, *paths):
+        """Record a change for the given file paths (called by the watchdog handler)."""
+        names = {name for name in map(self._experiment_of, paths) if name}
+        if not names:
+            return
+        with self._lock:
+            self._changed |= names
+            self.generation += 1
+        if self.on_change is not None:
+            self.on_change(names)
+
+    def drain(self):
+        """Return and forget the experiments changed since the previous call."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def start(self):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    # Moves (e.g. atomic os.replace writes) report the final path as dest_path
+                    watcher.notify(event.src_path, getattr(event, "dest_path", None))
+
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), self.root, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+        return self
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
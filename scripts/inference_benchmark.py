@@ -0,0 +1,93 @@
+import os
+import json
+import time
+import pickle
+import tracemalloc
+import numpy as np
+from scripts.defaults import (DEFAULT_BENCHMARK_BATCH_SIZES as DEFAULT_BATCH_SIZES,
+                              DEFAULT_BENCHMARK_REPEATS as DEFAULT_REPEATS,
+                              DEFAULT_BENCHMARK_WARMUP as DEFAULT_WARMUP)
+
+# Detailed per-batch-size results, written next to metrics.json
+INFERENCE_FILENAME = "inference.json"
+
+
+def _first_rows(test_x, n):
+    return test_x.iloc[:n] if hasattr(test_x, "iloc") else test_x[:n]
+
+
+def run_inference_benchmark(model, test_x, batch_sizes=DEFAULT_BATCH_SIZES, repeats=DEFAULT_REPEATS,
+                            warmup=DEFAULT_WARMUP):
+    """
+    Time model.predict at several batch sizes.
+
+    Each batch size is first run `warmup` times (not timed, to fill caches and lazy
+    initializations), then `repeats` times. Batches are taken from the first rows of test_x,
+    batch sizes larger than the test set are capped to its length.
+
+    Returns:
+    --------
+    list of dict
+        One entry per batch size: batch_size, p50_ms, p95_ms, p99_ms, mean_ms, rows_per_second
+    """
+    results = []
+    n_rows = len(test_x)
+    for batch_size in sorted(set(min(b, n_rows) for b in batch_sizes)):
+        batch = _first_rows(test_x, batch_size)
+        for _ in range(warmup):
+            model.predict(batch)
+        latencies = np.empty(repeats)
+        for i in range(repeats):
+            start = time.perf_counter()
+            model.predict(batch)
+            latencies[i] = time.perf_counter() - start
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        results.append({
+            "batch_size": batch_size,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "mean_ms": float(latencies.mean() * 1000),
+            "rows_per_second": float(batch_size / np.median(latencies)),
+        })
+    return results
+
+
+def model_memory_bytes(model):
+    """Approximate in-memory footprint: bytes allocated while unpickling a copy of the model."""
+    blob = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    tracemalloc.start()
+    try:
+        copy = pickle.loads(blob)
+        footprint = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del copy
+    return footprint
+
+
+def inference_metrics(results, model_path, model):
+    """
+    First-class serving-cost metrics for metrics.json. Lower is better for the latencies and
+    sizes, higher is better for the throughput.
+
+    Latencies come from the smallest batch size (single-row serving), the throughput is the
+    best one over all batch sizes.
+    """
+    metrics = {}
+    if results:
+        single = results[0]
+        metrics["latency_p50_ms"] = single["p50_ms"]
+        metrics["latency_p95_ms"] = single["p95_ms"]
+        metrics["latency_p99_ms"] = single["p99_ms"]
+        metrics["throughput_rows_per_s"] = max(r["rows_per_second"] for r in results)
+    metrics["model_size_bytes"] = os.path.getsize(model_path)
+    metrics["model_memory_bytes"] = model_memory_bytes(model)
+    return metrics
+
+
+def write_inference_results(exp_path, results, repeats, warmup):
+    path = os.path.join(exp_path, INFERENCE_FILENAME)
+    with open(path, 'w') as f:
+        json.dump({"repeats": repeats, "warmup": warmup, "batches": results}, f, indent=2)
+    return path
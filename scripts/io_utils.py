@@ -0,0 +1,16 @@
+import os
+import json
+
+
+def write_json_atomic(path, data, indent=2):
+    """
+    Write a JSON file through a temporary file and os.replace.
+
+    Readers (the catalog, the dashboard, compare-metrics) see either the old or the new
+    content, never a half-written file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
+    return path
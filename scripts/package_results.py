@@ -1,43 +1,44 @@
 import os
-import sys
 import json
-import shutil
-import argparse
 import logging
-import pickle
 import datetime
-import numpy as np
-from typing import Dict, Any, Optional, Union, Tuple
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, confusion_matrix
+try:
+    import fcntl
+except ImportError:
+    # Windows: the hint is updated without a lock, a hint left behind is corrected by the mkdir probe
+    fcntl = None
+from scripts.serialization import save_model, artifact_path
+from scripts.blob_store import BlobStore
+from scripts.packs import packed_experiments
+from scripts.profiling import StageProfiler, cprofile_to, PROFILE_FILENAME, TRACE_FILENAME, CPROFILE_FILENAME
+from scripts.evaluation import (DEFAULT_BATCH_SIZE, iter_batches, evaluate_batches, confusion_matrix_metrics,
+                                bootstrap_metrics)
+from scripts.predictions import PREDICTIONS_DIRNAME, PredictionRecorder
+from scripts.curves import DEFAULT_CURVE_POINTS, curves_from_predictions, write_curves
+from scripts.inference_benchmark import (DEFAULT_BATCH_SIZES, DEFAULT_REPEATS, DEFAULT_WARMUP, run_inference_benchmark,
+                                         inference_metrics, write_inference_results)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
-def evaluate_classification_model(model, test_x, test_y):
-    try:
-        #Predictions
-        y_pred = model.predict(test_x)
+def evaluate_classification_model(model, test_x, test_y, batch_size=DEFAULT_BATCH_SIZE, profiler=None, recorder=None,
+                                  bootstrap=0, confidence=0.95):
+    return evaluate_classification_batches(model, iter_batches(test_x, test_y, batch_size), profiler, recorder,
+                                           bootstrap, confidence)
 
-        #Metrics
-        metrics = {}
-        metrics["accuracy"] = float(accuracy_score(test_y, y_pred))
+def evaluate_classification_batches(model, batches, profiler=None, recorder=None, bootstrap=0, confidence=0.95):
+    try:
+        #Predictions, batch by batch into one running confusion matrix (and into the predictions cache if asked)
+        accumulator = evaluate_batches(model, batches, profiler, recorder)
 
-        #Other Metrics
-        try:
-            metrics["f1_score"] = float(f1_score(test_y, y_pred, average='weighted'))
-            metrics["precision"] = float(precision_score(test_y, y_pred, average='weighted'))
-            metrics["recall"] = float(recall_score(test_y, y_pred, average='weighted'))
-        except Exception as e:
-            logger.warning(f"Could not calculate some metrics: {str(e)}")
-            metrics["f1_score"] = None
-            metrics["precision"] = None
-            metrics["recall"] = None
-
-        #Confusion Matrix
-        cm = confusion_matrix(test_y, y_pred)
-        metrics["confusion_matrix"] = cm.tolist()
+        #Metrics (accuracy, f1_score, precision, recall) all derived from the confusion matrix
+        metrics = confusion_matrix_metrics(accumulator)
         metrics["loss"] = 0.0
 
+        #Optional bootstrap confidence intervals, resampled from the confusion matrix (no second pass over the data)
+        if bootstrap:
+            metrics.update(bootstrap_metrics(accumulator.matrix, bootstrap, confidence))
+
         return metrics
     #In case of error
     except Exception as e:
@@ -61,80 +62,215 @@ def get_model_info(model):
 
     return model_info
 
-def get_next_exp_number(experiments_dir="experiments"):
-    # Create directory if it doesn't exist
-    if not os.path.exists(experiments_dir):
-        os.makedirs(experiments_dir)
-        return 1
+# Hint file holding the next free experiment number, so allocation never scans the whole directory
+NEXT_EXP_FILENAME = ".next_exp"
 
-    #Get folders with the same name pattern, here start with exp and a number
+def _scan_max_exp_number(experiments_dir):
+    #Get folders with the same name pattern, here start with exp and a number (compacted ones included)
     exp_nums = []
-    for item in os.listdir(experiments_dir):
-        if os.path.isdir(os.path.join(experiments_dir, item)) and item.startswith("exp"):
+    packed = packed_experiments(experiments_dir)
+    for item in list(os.listdir(experiments_dir)) + list(packed):
+        if (item in packed or os.path.isdir(os.path.join(experiments_dir, item))) and item.startswith("exp"):
             try:
                 num = int(item[3:])
                 exp_nums.append(num)
             except:
                 continue
+    return max(exp_nums, default=0)
+
+def _read_next_exp_hint(experiments_dir):
+    try:
+        with open(os.path.join(experiments_dir, NEXT_EXP_FILENAME)) as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _write_next_exp_hint(experiments_dir, number):
+    """Move the hint forward to number, never backwards (a slower process must not undo a faster one)."""
+    hint_path = os.path.join(experiments_dir, NEXT_EXP_FILENAME)
+    # The hint file itself is swapped by os.replace, so the lock is taken on a separate file
+    with open(f"{hint_path}.lock", 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if (_read_next_exp_hint(experiments_dir) or 0) >= number:
+            return
+        # Write to a temporary file first so readers never see a half-written number
+        tmp_path = f"{hint_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(number))
+        os.replace(tmp_path, hint_path)
+
+def get_next_exp_number(experiments_dir="experiments"):
+    # Create directory if it doesn't exist
+    if not os.path.exists(experiments_dir):
+        os.makedirs(experiments_dir)
+        return 1
+
+    # Only experiment roots created before the hint file existed need one full scan (packs included).
+    # compact_experiments moves the hint past every number it packs, so the hint path never reads the packs
+    exp_num = _read_next_exp_hint(experiments_dir)
+    if exp_num is None:
+        exp_num = _scan_max_exp_number(experiments_dir) + 1
+
+    # The hint can lag behind when several processes package at the same time
+    while os.path.exists(os.path.join(experiments_dir, f"exp{exp_num}")):
+        exp_num += 1
 
     # Return the next experiment number number
-    return 1 if not exp_nums else max(exp_nums) + 1
+    return exp_num
+
+def allocate_exp_dir(experiments_dir="experiments"):
+    """Reserve the next expN folder. Safe when several processes package into the same root."""
+    os.makedirs(experiments_dir, exist_ok=True)
+    exp_num = get_next_exp_number(experiments_dir)
+    packed = None
+    while True:
+        exp_path = os.path.join(experiments_dir, f"exp{exp_num}")
+        try:
+            # mkdir is atomic: exactly one process can create a given folder
+            os.mkdir(exp_path)
+            break
+        except FileExistsError:
+            # Another process got this number: the hint is behind, so also skip the compacted numbers
+            if packed is None:
+                packed = packed_experiments(experiments_dir)
+            exp_num += 1
+            while f"exp{exp_num}" in packed:
+                exp_num += 1
+    _write_next_exp_hint(experiments_dir, exp_num + 1)
+    return exp_num, exp_path
 
-def package_results(model, test_x=None, test_y=None, dataset_name="unknown_dataset", output_dir="experiments"):
-    #Create the directory if needed
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+def _keep_first_batch(batches, kept):
+    # Streamed test data is only read once, keep the first chunk of rows for the inference benchmark
+    for x, y in batches:
+        if not kept:
+            kept.append(x)
+        yield x, y
 
-    #Experimentation Number
-    exp_num = get_next_exp_number(output_dir)
+def package_results(model, test_x=None, test_y=None, dataset_name="unknown_dataset", output_dir="experiments",
+                    batch_size=DEFAULT_BATCH_SIZE, test_batches=None, model_format="pickle", compress=0,
+                    trace=False, cprofile=False, benchmark_inference=False,
+                    benchmark_batch_sizes=DEFAULT_BATCH_SIZES, benchmark_repeats=DEFAULT_REPEATS,
+                    benchmark_warmup=DEFAULT_WARMUP, save_predictions=True, curves=True,
+                    curve_points=DEFAULT_CURVE_POINTS, bootstrap=0, confidence=0.95,
+                    dedup=False):
+    #Timing of every stage, written to profile.json at the end
+    profiler = StageProfiler("package_results")
+
+    #Experimentation Number, the associated folder is created atomically
+    with profiler.stage("allocate"):
+        exp_num, exp_path = allocate_exp_dir(output_dir)
     exp_folder = f"exp{exp_num}"
-    exp_path = os.path.join(output_dir, exp_folder)
 
-    #Create the associated folder
-    os.makedirs(exp_path)
+    #Optional cProfile of the whole packaging, saved as cprofile.prof
+    with cprofile_to(os.path.join(exp_path, CPROFILE_FILENAME) if cprofile else None):
+        #Saving the model (model.pkl, or model.joblib for the joblib format), or once in the blob store
+        #of the experiments root with dedup, identical models then share the same file
+        blob_store = BlobStore(output_dir) if dedup else None
+        with profiler.stage("save_model"):
+            model_artifact = save_model(model, exp_path, model_format, compress, blob_store)
+        model_path = artifact_path(exp_path, model_artifact)
+        profiler.record_artifact("model", model_path)
+        logger.info(f"Saved model to {model_path}")
 
-    #Saving the model.pkl
-    model_path = os.path.join(exp_path, "model.pkl")
-    with open(model_path, 'wb') as f:
-        pickle.dump(model, f)
-    logger.info(f"Saved model to {model_path}")
+        #Evaluate model and metrics
+        metrics_path = os.path.join(exp_path, "metrics.json")
 
-    #Evaluate model and metrics
-    metrics_path = os.path.join(exp_path, "metrics.json")
+        sample_x = []
+        if benchmark_inference and test_batches is not None:
+            test_batches = _keep_first_batch(test_batches, sample_x)
+        elif benchmark_inference and test_x is not None:
+            sample_x.append(test_x)
 
-    if test_x is not None and test_y is not None:
-        logger.info("Evaluating model on test data...")
-        metrics = evaluate_classification_model(model, test_x, test_y)
-    else:
-        # No test data provided, use placeholder metrics
-        logger.warning("No test data provided. Using placeholder metrics.")
-        metrics = {"accuracy": 0.0, "loss": 0.0}
+        #Labels, predictions and probabilities are cached so that metrics can be recomputed without the model,
+        #they are also needed for the ROC/PR curves. Every batch goes straight to disk (a temporary folder
+        #when only the curves need them), nothing grows with the number of test rows
+        recorder = None
+        if save_predictions or curves:
+            predictions_folder = os.path.join(exp_path, PREDICTIONS_DIRNAME) if save_predictions else None
+            recorder = PredictionRecorder(model, predictions_folder)
+
+        with profiler.stage("evaluate"):
+            if test_batches is not None:
+                # Streamed (x, y) chunks, e.g. read from a large CSV/Parquet file
+                logger.info("Evaluating model on streamed test data...")
+                metrics = evaluate_classification_batches(model, test_batches, profiler, recorder, bootstrap,
+                                                          confidence)
+            elif test_x is not None and test_y is not None:
+                logger.info("Evaluating model on test data...")
+                metrics = evaluate_classification_model(model, test_x, test_y, batch_size, profiler, recorder,
+                                                        bootstrap, confidence)
+            else:
+                # No test data provided, use placeholder metrics
+                logger.warning("No test data provided. Using placeholder metrics.")
+                metrics = {"accuracy": 0.0, "loss": 0.0}
+
+        if recorder is not None:
+            with recorder:
+                if recorder.n_rows and "confusion_matrix" in metrics:
+                    if save_predictions:
+                        with profiler.stage("save_predictions"):
+                            predictions_path = recorder.finalize()
+                        logger.info(f"Saved predictions to {predictions_path}")
+
+                    #ROC AUC, PR AUC and the downsampled curves (binary classifiers with predict_proba only),
+                    #from the memory-mapped predictions
+                    if curves:
+                        with profiler.stage("curves"):
+                            predictions = recorder.arrays()
+                            scores, curve_arrays = curves_from_predictions(predictions, curve_points)
+                            del predictions
+                            if scores is not None:
+                                metrics.update(scores)
+                                profiler.record_artifact("curves", write_curves(exp_path, curve_arrays))
+
+        #Latency, throughput and size of the model, details in inference.json
+        if benchmark_inference:
+            if sample_x:
+                with profiler.stage("benchmark_inference"):
+                    results = run_inference_benchmark(model, sample_x[0], benchmark_batch_sizes, benchmark_repeats,
+                                                      benchmark_warmup)
+                write_inference_results(exp_path, results, benchmark_repeats, benchmark_warmup)
+            else:
+                logger.warning("No test data provided. Only measuring the model size.")
+                results = []
+            metrics.update(inference_metrics(results, model_path, model))
+
+        #Timestamp
+        metrics["timestamp"] = datetime.datetime.now().isoformat()
 
-    #Timestamp
-    metrics["timestamp"] = datetime.datetime.now().isoformat()
+        # Save the model's metrics
+        with profiler.stage("write_metrics"):
+            with open(metrics_path, 'w') as f:
+                json.dump(metrics, f, indent=2)
+        profiler.record_artifact("metrics", metrics_path)
+        logger.info(f"Saved metrics to {metrics_path}")
 
-    # Save the model's metrics
-    with open(metrics_path, 'w') as f:
-        json.dump(metrics, f, indent=2)
-    logger.info(f"Saved metrics to {metrics_path}")
+        #Save model parameters
+        config_path = os.path.join(exp_path, "config.json")
+        model_info = get_model_info(model)
 
-    #Save model parameters
-    config_path = os.path.join(exp_path, "config.json")
-    model_info = get_model_info(model)
+        config = {
+            "model_name": model_info.get("model_name", "UnknownModel"),
+            "parameters": model_info.get("parameters", {}),
+            "dataset": dataset_name,
+            "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "model_artifact": model_artifact
+        }
 
-    config = {
-        "model_name": model_info.get("model_name", "UnknownModel"),
-        "parameters": model_info.get("parameters", {}),
-        "dataset": dataset_name,
-        "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+        with profiler.stage("write_config"):
+            with open(config_path, 'w') as f:
+                json.dump(config, f, indent=2)
+        profiler.record_artifact("config", config_path)
+        logger.info(f"Saved config to {config_path}")
 
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
-    logger.info(f"Saved config to {config_path}")
+    #Save the profile (and the Chrome trace if asked)
+    profiler.write(os.path.join(exp_path, PROFILE_FILENAME))
+    if trace:
+        profiler.write_chrome_trace(os.path.join(exp_path, TRACE_FILENAME))
 
     #Success message
     logger.info(f"Successfully packaged model in {exp_folder}")
-    logger.info(f"config.json, metrics.json and model.pkl have been created")
+    logger.info(f"config.json, metrics.json and {model_artifact.get('file', model_artifact.get('blob'))} have been created")
 
-    return exp_path 
+    return exp_path
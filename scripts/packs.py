@@ -0,0 +1,215 @@
+import io
+import os
+import json
+import time
+import shutil
+import struct
+import logging
+from scripts.defaults import DEFAULT_COMPACT_MIN_AGE_SECONDS as DEFAULT_MIN_AGE_SECONDS, DEFAULT_PACK_EXPERIMENTS
+
+logger = logging.getLogger(__name__)
+
+# Archive packs of compacted experiments, under the experiments root: .packs/pack-<time_ns>.mlpack
+PACKS_DIRNAME = ".packs"
+PACK_SUFFIX = ".mlpack"
+# Layout: MAGIC | file payloads ... | JSON index | footer (index offset as uint64, MAGIC)
+PACK_MAGIC = b"MLPACK01"
+_FOOTER = struct.Struct("<Q8s")
+
+# Parsed indexes, keyed by pack path and invalidated when the file changes
+_index_cache = {}
+
+
+class PackEntry:
+    """Location of one packed file: pack path, offset and size of its bytes, original mtime."""
+
+    __slots__ = ("pack", "offset", "size", "mtime_ns")
+
+    def __init__(self, pack, offset, size, mtime_ns):
+        self.pack, self.offset, self.size, self.mtime_ns = pack, offset, size, mtime_ns
+
+
+def pack_paths(experiments_dir):
+    """Pack files of an experiments root, oldest first."""
+    folder = os.path.join(experiments_dir, PACKS_DIRNAME)
+    try:
+        names = sorted(e.name for e in os.scandir(folder) if e.name.endswith(PACK_SUFFIX))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(folder, name) for name in names]
+
+
+def read_pack_index(path):
+    """{experiment: {relative path: PackEntry}} of one pack, read from its footer and index only."""
+    st = os.stat(path)
+    cached = _index_cache.get(path)
+    if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+        return cached[1]
+    with open(path, 'rb') as f:
+        f.seek(-_FOOTER.size, os.SEEK_END)
+        index_offset, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{path} is not an experiment pack")
+        f.seek(index_offset)
+        raw = json.loads(f.read(st.st_size - _FOOTER.size - index_offset))
+    index = {exp: {name: PackEntry(path, *values) for name, values in files.items()}
+             for exp, files in raw["experiments"].items()}
+    _index_cache[path] = ((st.st_mtime_ns, st.st_size), index)
+    return index
+
+
+def packed_experiments(experiments_dir):
+    """{experiment: {relative path: PackEntry}} over all packs, later packs win."""
+    experiments = {}
+    for path in pack_paths(experiments_dir):
+        experiments.update(read_pack_index(path))
+    return experiments
+
+
+class PackReader:
+    """
+    Reads packed files while keeping each pack open, so loading thousands of documents
+    costs one open per pack plus a seek and a read per document.
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def read(self, entry):
+        f = self.files.get(entry.pack)
+        if f is None:
+            f = self.files[entry.pack] = open(entry.pack, 'rb')
+        f.seek(entry.offset)
+        return f.read(entry.size)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_packed(exp_path):
+    """True when the experiment has no folder but is stored in a pack of its root."""
+    if os.path.isdir(exp_path):
+        return False
+    root, exp = os.path.split(os.path.abspath(exp_path))
+    return exp in packed_experiments(root)
+
+
+def open_experiment_file(exp_path, relpath):
+    """
+    Open a file of an experiment for binary reading, from its folder or from a pack.
+
+    Packed files are returned as an in-memory buffer. Raises FileNotFoundError when neither exists.
+    """
+    path = os.path.join(exp_path, relpath)
+    if os.path.exists(path):
+        return open(path, 'rb')
+    root, exp = os.path.split(os.path.abspath(exp_path))
+    entry = packed_experiments(root).get(exp, {}).get(relpath.replace(os.sep, "/"))
+    if entry is None:
+        raise FileNotFoundError(path)
+    with PackReader() as reader:
+        return io.BytesIO(reader.read(entry))
+
+
+def _experiment_files(exp_path):
+    """(relative path, full path) of every regular file of an experiment folder, subfolders included."""
+    for folder, _, names in os.walk(exp_path):
+        for name in names:
+            full = os.path.join(folder, name)
+            yield os.path.relpath(full, exp_path).replace(os.sep, "/"), full
+
+
+def completed_experiments(experiments_dir, min_age_seconds=DEFAULT_MIN_AGE_SECONDS):
+    """Experiment folders with metrics.json and config.json and no file modified in the last min_age_seconds."""
+    from scripts.experiment_catalog import natural_key
+    cutoff = time.time() - min_age_seconds
+    names = []
+    for entry in os.scandir(experiments_dir):
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        if not all(os.path.exists(os.path.join(entry.path, f)) for f in ("metrics.json", "config.json")):
+            continue
+        if all(os.stat(full).st_mtime <= cutoff for _, full in _experiment_files(entry.path)):
+            names.append(entry.name)
+    return sorted(names, key=natural_key)
+
+
+def write_pack(experiments_dir, names):
+    """
+    Pack the files of the given experiment folders into one new pack file and return its path.
+
+    The pack is written under a temporary name, synced, then moved into place with os.replace,
+    so readers never see a partial pack. The folders themselves are left untouched.
+    """
+    folder = os.path.join(experiments_dir, PACKS_DIRNAME)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"pack-{time.time_ns()}{PACK_SUFFIX}")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    index = {}
+    with open(tmp_path, 'wb') as out:
+        out.write(PACK_MAGIC)
+        for name in names:
+            files = index[name] = {}
+            for relpath, full in _experiment_files(os.path.join(experiments_dir, name)):
+                offset = out.tell()
+                with open(full, 'rb') as f:
+                    shutil.copyfileobj(f, out)
+                files[relpath] = [offset, out.tell() - offset, os.stat(full).st_mtime_ns]
+        index_offset = out.tell()
+        out.write(json.dumps({"version": 1, "experiments": index}).encode())
+        out.write(_FOOTER.pack(index_offset, PACK_MAGIC))
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def compact_experiments(experiments_dir="experiments", min_age_seconds=DEFAULT_MIN_AGE_SECONDS,
+                        pack_experiments=DEFAULT_PACK_EXPERIMENTS, dry_run=False):
+    """
+    Move completed experiments into archive packs and delete their folders.
+
+    Parameters:
+    -----------
+    experiments_dir : str
+        Experiments root
+    min_age_seconds : int
+        Only experiments whose files are all older than this are packed
+    pack_experiments : int
+        Maximum number of experiments per pack
+    dry_run : bool
+        Only return what would be packed
+
+    Returns:
+    --------
+    dict
+        experiments (names packed), packs (paths written), files (number of files packed)
+    """
+    from scripts.package_results import _read_next_exp_hint, _write_next_exp_hint, _scan_max_exp_number
+
+    names = completed_experiments(experiments_dir, min_age_seconds)
+    stats = {"experiments": names, "packs": [], "files": 0}
+    if dry_run or not names:
+        return stats
+
+    # The packed folders disappear from the directory listing: make sure their numbers are never reused
+    next_exp = max(_read_next_exp_hint(experiments_dir) or 0, _scan_max_exp_number(experiments_dir) + 1)
+    _write_next_exp_hint(experiments_dir, next_exp)
+
+    for start in range(0, len(names), pack_experiments):
+        chunk = names[start:start + pack_experiments]
+        path = write_pack(experiments_dir, chunk)
+        stats["packs"].append(path)
+        for name, files in read_pack_index(path).items():
+            stats["files"] += len(files)
+            shutil.rmtree(os.path.join(experiments_dir, name))
+    logger.info(f"Packed {len(names)} experiments ({stats['files']} files) into {len(stats['packs'])} packs")
+    return stats
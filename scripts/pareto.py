@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from scripts.compare_metrics import lower_is_better, numeric_column
+
+Objective = namedtuple("Objective", ["metric", "maximize", "weight"])
+
+
+def parse_objectives(specs):
+    """
+    Parse objectives written as 'metric[:max|min][:weight]', e.g. 'accuracy:max:2' or 'latency_p95_ms'.
+
+    Without a direction, latency, size and loss metrics are minimized and the others maximized
+    (see lower_is_better). The weight (default 1) is only used by the weighted score, it cannot be
+    negative and at least one objective needs a positive weight.
+    """
+    objectives = []
+    for spec in specs:
+        parts = spec.split(":")
+        if not parts[0] or len(parts) > 3:
+            raise ValueError(f"Cannot parse objective '{spec}', expected e.g. 'accuracy:max' or 'latency_p95_ms:min:0.5'")
+        direction = parts[1].lower() if len(parts) > 1 and parts[1] else None
+        if direction not in (None, "max", "min"):
+            raise ValueError(f"Objective direction must be 'max' or 'min', got '{parts[1]}'")
+        try:
+            weight = float(parts[2]) if len(parts) > 2 else 1.0
+        except ValueError:
+            raise ValueError(f"Objective weight must be a number, got '{parts[2]}'")
+        if not 0 <= weight < np.inf:
+            raise ValueError(f"Objective weight must be a non-negative number, got '{parts[2]}'")
+        maximize = not lower_is_better(parts[0]) if direction is None else direction == "max"
+        objectives.append(Objective(parts[0], maximize, weight))
+    if objectives and not sum(o.weight for o in objectives) > 0:
+        # The weighted score divides by the total weight
+        raise ValueError("At least one objective needs a positive weight")
+    return objectives
+
+
+def _cost_matrix(metrics_df, objectives):
+    """Objective values as a float matrix where smaller is better, and the mask of complete rows."""
+    values = np.column_stack([numeric_column(metrics_df, o.metric).to_numpy(dtype=float) * (-1.0 if o.maximize else 1.0)
+                              for o in objectives]) if objectives else np.empty((len(metrics_df), 0))
+    return values, ~np.isnan(values).any(axis=1)
+
+
+def _skyline_2d(costs):
+    """Non-dominated rows of an (n, 2) cost matrix: one lexicographic sort and a running minimum."""
+    n = len(costs)
+    order = np.lexsort((costs[:, 1], costs[:, 0]))
+    a, b = costs[order, 0], costs[order, 1]
+    running = np.minimum.accumulate(b)
+    # Index of the first row reaching the running minimum, it has the smallest first cost among its ties
+    is_new = np.r_[True, b[1:] < running[:-1]]
+    first_min = np.maximum.accumulate(np.where(is_new, np.arange(n), 0))
+    prev_min = np.r_[np.inf, running[:-1]]
+    prev_a = np.r_[np.inf, a[first_min][:-1]]
+    dominated = (prev_min < b) | ((prev_min == b) & (prev_a < a))
+    keep = np.empty(n, dtype=bool)
+    keep[order] = ~dominated
+    return keep
+
+
+def _dominated_by(front, block, front_rows=256):
+    """
+    For each row of block, True when some row of front dominates it (<= everywhere, < somewhere).
+
+    The front is checked a slice at a time and only the block rows not dominated yet go on to the
+    next slice. The front is ordered by sum of costs, so its first rows eliminate most of a block.
+    """
+    dominated = np.zeros(len(block), dtype=bool)
+    pending = np.arange(len(block))
+    for start in range(0, len(front), front_rows):
+        if not len(pending):
+            break
+        f, rows = front[start:start + front_rows], block[pending]
+        # One (front, block) comparison per objective, no 3-D temporary
+        no_worse = np.ones((len(f), len(rows)), dtype=bool)
+        better = np.zeros((len(f), len(rows)), dtype=bool)
+        for j in range(block.shape[1]):
+            no_worse &= f[:, j, None] <= rows[None, :, j]
+            better |= f[:, j, None] < rows[None, :, j]
+        hit = (no_worse & better).any(axis=0)
+        dominated[pending[hit]] = True
+        pending = pending[~hit]
+    return dominated
+
+
+def _skyline_nd(costs, block_size=1024):
+    """
+    Non-dominated rows of an (n, k) cost matrix, vectorized block-nested-loop.
+
+    Rows are visited by increasing sum of costs: a row can only be dominated by rows with a smaller
+    sum, so every row kept is final and each block is only compared with the front found so far,
+    then its survivors with each other, never with all n rows.
+    """
+    # Sum of min-max normalized costs: still smaller for a dominating row, and no metric (e.g. bytes)
+    # outweighs the others in the visiting order
+    low, high = costs.min(axis=0), costs.max(axis=0)
+    order = np.argsort(((costs - low) / np.where(high > low, high - low, 1.0)).sum(axis=1), kind="stable")
+    front = np.empty((0, costs.shape[1]))
+    keep = np.zeros(len(costs), dtype=bool)
+    for start in range(0, len(order), block_size):
+        idx = order[start:start + block_size]
+        idx = idx[~_dominated_by(front, costs[idx])]
+        block = costs[idx]
+        idx = idx[~_dominated_by(block, block)]
+        keep[idx] = True
+        front = np.concatenate([front, costs[idx]])
+    return keep
+
+
+def pareto_front(metrics_df, objectives):
+    """
+    Experiments not dominated by any other on the given objectives.
+
+    An experiment dominates another when it is at least as good on every objective and strictly
+    better on one. Experiments missing one of the objectives are left out of the front.
+
+    Returns:
+    --------
+    pd.Series
+        Boolean, indexed like metrics_df, True for the experiments on the front
+    """
+    costs, complete = _cost_matrix(metrics_df, objectives)
+    on_front = np.zeros(len(metrics_df), dtype=bool)
+    if complete.any():
+        rows = np.flatnonzero(complete)
+        if costs.shape[1] == 1:
+            on_front[rows] = costs[rows, 0] == costs[rows, 0].min()
+        elif costs.shape[1] == 2:
+            on_front[rows] = _skyline_2d(costs[rows])
+        else:
+            on_front[rows] = _skyline_nd(costs[rows])
+    return pd.Series(on_front, index=metrics_df.index)
+
+
+def weighted_scores(metrics_df, objectives):
+    """
+    Weighted score in [0, 1] (1 is best): each objective is min-max normalized over the experiments,
+    flipped when minimized, then averaged with the objective weights. NaN when a value is missing.
+    """
+    costs, _ = _cost_matrix(metrics_df, objectives)
+    low, high = np.nanmin(costs, axis=0, initial=np.inf), np.nanmax(costs, axis=0, initial=-np.inf)
+    span = np.where(high > low, high - low, 1.0)
+    goodness = (high - costs) / span
+    weights = np.array([o.weight for o in objectives], dtype=float)
+    return pd.Series(goodness @ weights / weights.sum(), index=metrics_df.index)
+
+
+def pareto_ranking(metrics_df, objectives, include_dominated=False):
+    """
+    Experiments of the Pareto front ranked by weighted score, best first.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Indexed by experiment, with the columns rank, one per objective, score and pareto_optimal.
+        Dominated experiments are only included (ranked after the front) with include_dominated.
+    """
+    on_front = pareto_front(metrics_df, objectives)
+    scores = weighted_scores(metrics_df, objectives)
+    table = pd.DataFrame({o.metric: numeric_column(metrics_df, o.metric) for o in objectives})
+    table["score"] = scores
+    table["pareto_optimal"] = on_front
+    table = table[table[[o.metric for o in objectives]].notna().all(axis=1)]
+    if not include_dominated:
+        table = table[table["pareto_optimal"]]
+    table = table.sort_values(["pareto_optimal", "score"], ascending=[False, False], kind="stable")
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table
+
+
+def describe_objectives(objectives):
+    return ", ".join(f"{'max' if o.maximize else 'min'} {o.metric}" + (f" x{o.weight:g}" if o.weight != 1 else "")
+                     for o in objectives)
+
+
+def pareto_recommendation(metrics_df, objectives, configs_df=None):
+    """One-line recommendation: the best weighted score among the non-dominated experiments."""
+    from scripts.compare_metrics import describe_experiment
+    ranking = pareto_ranking(metrics_df, objectives)
+    if ranking.empty:
+        return None
+    best = ranking.index[0]
+    dominated = int(_cost_matrix(metrics_df, objectives)[1].sum()) - len(ranking)
+    return (f"MULTI-OBJECTIVE RECOMMENDATION ({describe_objectives(objectives)}): Model '{best}'"
+            f"{describe_experiment(configs_df, best)} has the best weighted score ({ranking['score'].iloc[0]:.4f}) "
+            f"among {len(ranking)} Pareto-optimal experiments, {dominated} dominated experiments filtered out")
+
+
+def plot_pareto(metrics_df, objectives, on_front=None):
+    """Scatter of the first two objectives (at least two are needed), the Pareto front highlighted."""
+    import matplotlib.pyplot as plt
+    if on_front is None:
+        on_front = pareto_front(metrics_df, objectives)
+    x, y = (numeric_column(metrics_df, o.metric) for o in objectives[:2])
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.scatter(x[~on_front], y[~on_front], s=12, color="lightgrey", label="dominated")
+    front = pd.DataFrame({"x": x[on_front], "y": y[on_front]}).sort_values("x")
+    # With more objectives the front is not a line in these two dimensions
+    ax.plot(front["x"], front["y"], marker="o", linestyle="-" if len(objectives) == 2 else "none",
+            color="tab:red", label="Pareto front")
+    ax.set(xlabel=objectives[0].metric, ylabel=objectives[1].metric, title="Pareto front")
+    ax.legend(loc="best")
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Folder of the experiment holding the cached predictions, one .npy file per array
+PREDICTIONS_DIRNAME = "predictions"
+PREDICTION_FILES = {
+    "y_true": "y_true.npy",
+    "y_pred": "y_pred.npy",
+    "y_proba": "y_proba.npy",
+    "classes": "classes.npy",
+}
+
+
+def _as_saveable(values):
+    # Object arrays (e.g. string labels from pandas) cannot be memory-mapped, store them as fixed-width strings
+    values = np.asarray(values)
+    return values.astype(str) if values.dtype == object else values
+
+
+class PredictionRecorder:
+    """
+    Writes the labels, predictions and probabilities of every evaluated batch to disk as they arrive.
+
+    Only the per-row outputs are kept (never the features). Each batch is appended to a raw part
+    file per array, so memory stays bounded by the batch size whatever the number of rows, and
+    finalize() turns the parts into plain .npy files that re-evaluation can memory-map instead of
+    loading the model again. Without a folder, the arrays go to a temporary directory removed by
+    close() (e.g. when they are only needed for the curves).
+    """
+
+    # Rows copied at a time from the part files into the final .npy files
+    COPY_ROWS = 1 << 20
+
+    def __init__(self, model=None, folder=None):
+        self.classes = getattr(model, "classes_", None)
+        self.has_proba = model is not None and hasattr(model, "predict_proba")
+        self.folder = folder
+        self.temporary = folder is None
+        self.n_rows = 0
+        self.finalized = False
+        # Per array, runs of batches sharing the same dtype and row shape (string labels can get wider)
+        self.segments = {"y_true": [], "y_pred": [], "y_proba": []}
+        self._files = {}
+
+    def _append(self, name, values):
+        values = np.ascontiguousarray(_as_saveable(values))
+        segments = self.segments[name]
+        if not segments or segments[-1]["dtype"] != values.dtype or segments[-1]["shape"] != values.shape[1:]:
+            if self.folder is None:
+                self.folder = tempfile.mkdtemp(prefix="predictions-")
+            os.makedirs(self.folder, exist_ok=True)
+            if name in self._files:
+                self._files[name].close()
+            path = os.path.join(self.folder, f"{PREDICTION_FILES[name]}.{len(segments)}.part")
+            segments.append({"path": path, "dtype": values.dtype, "shape": values.shape[1:], "rows": 0})
+            self._files[name] = open(path, 'wb')
+        self._files[name].write(values.tobytes())
+        segments[-1]["rows"] += len(values)
+
+    def add(self, y_true, y_pred, y_proba=None):
+        y_true = np.asarray(y_true).ravel()
+        self._append("y_true", y_true)
+        self._append("y_pred", np.asarray(y_pred).ravel())
+        if y_proba is not None:
+            # float32 halves the size of the cached probabilities, plenty for metrics and curves
+            self._append("y_proba", np.asarray(y_proba, dtype=np.float32))
+        self.n_rows += len(y_true)
+
+    def _close_parts(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def finalize(self):
+        """Turn the part files into one .npy file per array and return the folder (None when nothing was recorded)."""
+        if self.finalized or not self.n_rows:
+            return self.folder
+        self._close_parts()
+        for name, segments in self.segments.items():
+            if not segments:
+                continue
+            dtype = np.result_type(*[segment["dtype"] for segment in segments])
+            rows = sum(segment["rows"] for segment in segments)
+            out = np.lib.format.open_memmap(os.path.join(self.folder, PREDICTION_FILES[name]), mode='w+',
+                                            dtype=dtype, shape=(rows, *segments[0]["shape"]))
+            start = 0
+            for segment in segments:
+                if segment["rows"]:
+                    part = np.memmap(segment["path"], dtype=segment["dtype"], mode='r',
+                                     shape=(segment["rows"], *segment["shape"]))
+                    for offset in range(0, segment["rows"], self.COPY_ROWS):
+                        block = part[offset:offset + self.COPY_ROWS]
+                        out[start + offset:start + offset + len(block)] = block
+                    start += segment["rows"]
+                    del part
+                os.remove(segment["path"])
+            out.flush()
+            del out
+        if self.classes is not None and self.segments["y_proba"]:
+            np.save(os.path.join(self.folder, PREDICTION_FILES["classes"]), _as_saveable(self.classes))
+        self.finalized = True
+        return self.folder
+
+    def arrays(self):
+        """The recorded arrays, memory-mapped, with the same keys as load_predictions."""
+        folder = self.finalize()
+        if folder is None:
+            return {}
+        return {name: np.load(os.path.join(folder, filename), mmap_mode='r')
+                for name, filename in PREDICTION_FILES.items() if os.path.exists(os.path.join(folder, filename))}
+
+    def close(self):
+        """Remove what is left of the part files, and the whole folder when it is temporary."""
+        self._close_parts()
+        if self.temporary and self.folder is not None:
+            shutil.rmtree(self.folder, ignore_errors=True)
+            return
+        for segments in self.segments.values():
+            for segment in segments:
+                if os.path.exists(segment["path"]):
+                    os.remove(segment["path"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def has_predictions(exp_path):
+    folder = os.path.join(exp_path, PREDICTIONS_DIRNAME)
+    return all(os.path.exists(os.path.join(folder, PREDICTION_FILES[name])) for name in ("y_true", "y_pred"))
+
+
+def load_predictions(exp_path, mmap_mode='r'):
+    """
+    Load the cached arrays of an experiment, memory-mapped by default.
+
+    Returns a dict with y_true and y_pred, plus y_proba and classes when the model had predict_proba.
+    Experiments compacted into a pack are read into memory instead.
+    """
+    from scripts.packs import open_experiment_file
+    folder = os.path.join(exp_path, PREDICTIONS_DIRNAME)
+    arrays = {}
+    for name, filename in PREDICTION_FILES.items():
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            arrays[name] = np.load(path, mmap_mode=mmap_mode)
+            continue
+        try:
+            with open_experiment_file(exp_path, f"{PREDICTIONS_DIRNAME}/{filename}") as f:
+                arrays[name] = np.load(f)
+        except FileNotFoundError:
+            pass
+    if "y_true" not in arrays or "y_pred" not in arrays:
+        raise FileNotFoundError(f"No cached predictions in {folder}")
+    return arrays
@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Files written next to metrics.json when profiling is enabled
+PROFILE_FILENAME = "profile.json"
+TRACE_FILENAME = "trace.json"
+CPROFILE_FILENAME = "cprofile.prof"
+
+
+def peak_rss_bytes():
+    """
+    Peak resident set size of the current process since it started, None when the platform does not report it.
+
+    In a reused worker process this is the peak of every earlier run too, see StageProfiler for
+    the part a single run is responsible for.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageProfiler:
+    """
+    Collects timing spans for the stages of a run, plus the size of the artifacts it writes.
+
+    Usage:
+        profiler = StageProfiler("package_results")
+        with profiler.stage("save_model"):
+            ...
+        profiler.record_artifact("model", model_path)
+        profiler.write("experiments/exp1/profile.json")
+
+    Memory is reported as peak_rss_growth_bytes: how much the run (or a stage) raised the peak RSS
+    of the process. The process peak never goes down, so in a reused worker (package_results_batch)
+    a run that stays below the peak of an earlier, larger model reports 0 rather than that model's peak.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.started_peak_rss = peak_rss_bytes()
+        self.stages = []
+        self.artifacts = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        start_peak_rss = peak_rss_bytes()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, start)
+            if start_peak_rss is not None:
+                self.stages[-1]["peak_rss_growth_bytes"] = peak_rss_bytes() - start_peak_rss
+
+    def add(self, name, seconds, start=None, parent=None):
+        """Record a span. Spans without a start are totals over many calls (e.g. predict over all batches)."""
+        entry = {"name": name, "seconds": seconds}
+        if start is not None:
+            entry["start"] = start - self.started
+        if parent is not None:
+            entry["parent"] = parent
+        self.stages.append(entry)
+
+    def record_artifact(self, name, path):
+        """Remember how many bytes an artifact file takes on disk."""
+        self.artifacts[name] = {"file": os.path.basename(path), "bytes": os.path.getsize(path)}
+
+    def to_dict(self):
+        peak_rss = peak_rss_bytes()
+        growth = None if peak_rss is None else peak_rss - self.started_peak_rss
+        return {
+            "name": self.name,
+            "total_seconds": time.perf_counter() - self.started,
+            "peak_rss_growth_bytes": growth,
+            "process_peak_rss_bytes": peak_rss,
+            "stages": self.stages,
+            "artifacts": self.artifacts,
+        }
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_chrome_trace(self, path):
+        """Export the spans in the Chrome trace event format (open with chrome://tracing or Perfetto)."""
+        events = []
+        parents = {}
+        for entry in self.stages:
+            if "start" in entry:
+                parents[entry["name"]] = entry["start"]
+                events.append({"name": entry["name"], "ph": "X", "pid": os.getpid(), "tid": 1,
+                               "ts": entry["start"] * 1e6, "dur": entry["seconds"] * 1e6})
+        # Totals without their own start are drawn one after the other inside their parent span
+        offsets = {}
+        for entry in self.stages:
+            if "start" not in entry:
+                parent = entry.get("parent")
+                ts = offsets.get(parent, parents.get(parent, 0.0))
+                offsets[parent] = ts + entry["seconds"]
+                events.append({"name": entry["name"], "ph": "X", "pid": os.getpid(), "tid": 2,
+                                "ts": ts * 1e6, "dur": entry["seconds"] * 1e6})
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+@contextmanager
+def cprofile_to(path):
+    """Run the block under cProfile and dump the stats to path (no-op when path is None)."""
+    if path is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+
+def profiles_to_frame(profiles):
+    """Turn {experiment: profile.json} into one row per experiment with the seconds of each stage."""
+    import pandas as pd
+    rows = {}
+    for exp, profile in profiles.items():
+        row = {"total_seconds": profile.get("total_seconds")}
+        for entry in profile.get("stages", []):
+            row[f"{entry['name']}_seconds"] = entry["seconds"]
+        if profile.get("peak_rss_growth_bytes") is not None:
+            row["peak_rss_growth_mb"] = profile["peak_rss_growth_bytes"] / 1e6
+        # Older profiles only have the peak of the whole process
+        process_peak = profile.get("process_peak_rss_bytes", profile.get("peak_rss_bytes"))
+        if process_peak is not None:
+            row["process_peak_rss_mb"] = process_peak / 1e6
+        for name, artifact in profile.get("artifacts", {}).items():
+            row[f"{name}_bytes"] = artifact["bytes"]
+        rows[exp] = row
+    return pd.DataFrame.from_dict(rows, orient='index')
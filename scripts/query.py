@@ -0,0 +1,228 @@
+import re
+import json
+import operator
+from collections import namedtuple
+from scripts.experiment_catalog import natural_key
+
+# Documents a query can look into, config.json first: a bare key such as 'model_name' is searched there first
+QUERY_FILENAMES = ("config.json", "metrics.json")
+# Explicit prefixes, e.g. 'metrics.accuracy' or 'config.parameters.max_depth'
+FILENAME_PREFIXES = {"config.": "config.json", "metrics.": "metrics.json"}
+
+_CONDITION_RE = re.compile(r"^\s*([\w.\-]+)\s*(==|!=|>=|<=|=|>|<)\s*(.+?)\s*$")
+_OPERATORS = {"==": operator.eq, "!=": operator.ne, ">=": operator.ge, "<=": operator.le,
+              ">": operator.gt, "<": operator.lt}
+
+Condition = namedtuple("Condition", ["key", "op", "value"])
+
+
+def _parse_value(text):
+    """Quoted text stays a string, otherwise numbers, booleans and null are recognized."""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("null", "none"):
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_conditions(expressions):
+    """
+    Parse filter expressions such as "model_name == RandomForestClassifier and parameters.n_estimators >= 200".
+
+    expressions is a string or a list of strings; conditions joined with 'and' (or given as
+    separate strings) must all hold. Supported operators: == (or =), !=, >=, <=, >, <.
+    """
+    if isinstance(expressions, str):
+        expressions = [expressions]
+    conditions = []
+    for expression in expressions or []:
+        for part in re.split(r"\s+and\s+", expression.strip(), flags=re.IGNORECASE):
+            if not part:
+                continue
+            match = _CONDITION_RE.match(part)
+            if not match:
+                raise ValueError(f"Cannot parse filter '{part}', expected e.g. 'parameters.n_estimators >= 200'")
+            key, op, value = match.groups()
+            conditions.append(Condition(key, "==" if op == "=" else op, _parse_value(value)))
+    return conditions
+
+
+def _sql_test(condition):
+    """WHERE clause and parameters testing one fields row, using the num_value or text_value index."""
+    op, value = condition.op, condition.value
+    if value is None:
+        if op not in ("==", "!="):
+            raise ValueError(f"Only == and != can be used with null ('{condition.key}')")
+        clause = "num_value IS NULL AND text_value IS NULL"
+        return (clause if op == "==" else f"NOT ({clause})"), ()
+    sql_op = "=" if op == "==" else op
+    if isinstance(value, (bool, float)):
+        return f"num_value {sql_op} ?", (float(value),)
+    return f"text_value {sql_op} ?", (value,)
+
+
+def resolve_key(catalogs, key):
+    """
+    Find which (catalog, filename, key) holds a field.
+
+    catalogs is a list of ExperimentCatalog (the metrics and configs roots may differ). The lookup
+    goes through the (filename, key, ...) indexes and never scans the fields table.
+    """
+    for prefix, filename in FILENAME_PREFIXES.items():
+        if key.startswith(prefix) and not _has_key(catalogs, filename, key):
+            key = key[len(prefix):]
+            for catalog in catalogs:
+                if _has_key([catalog], filename, key):
+                    return catalog, filename, key
+    for filename in QUERY_FILENAMES:
+        for catalog in catalogs:
+            if _has_key([catalog], filename, key):
+                return catalog, filename, key
+    return None
+
+
+def _has_key(catalogs, filename, key):
+    return any(catalog.conn.execute("SELECT 1 FROM fields WHERE filename = ? AND key = ? LIMIT 1",
+                                    (filename, key)).fetchone() for catalog in catalogs)
+
+
+def select_experiments(catalogs, conditions):
+    """
+    Names of the experiments matching every condition, in natural order.
+
+    Each condition is one indexed lookup on the fields table of the catalog holding its key,
+    the conditions on the same catalog are combined with INTERSECT inside SQLite.
+    A key no experiment has matches nothing.
+    """
+    if not isinstance(catalogs, (list, tuple)):
+        catalogs = [catalogs]
+    per_catalog = {}
+    for condition in conditions:
+        resolved = resolve_key(catalogs, condition.key)
+        if resolved is None:
+            return []
+        catalog, filename, key = resolved
+        clause, params = _sql_test(condition)
+        per_catalog.setdefault(id(catalog), (catalog, []))[1].append(
+            (f"SELECT experiment FROM fields WHERE filename = ? AND key = ? AND {clause}", (filename, key, *params)))
+
+    selected = None
+    for catalog, queries in per_catalog.values():
+        sql = " INTERSECT ".join(q for q, _ in queries)
+        params = [p for _, qp in queries for p in qp]
+        names = {row[0] for row in catalog.conn.execute(sql, params)}
+        selected = names if selected is None else selected & names
+    if selected is None:
+        # No condition: every experiment with metrics
+        selected = {row[0] for catalog in catalogs for row in catalog.conn.execute(
+            "SELECT experiment FROM documents WHERE filename = 'metrics.json'")}
+    return sorted(selected, key=natural_key)
+
+
+def load_selected(catalog, filename, experiments):
+    """{experiment: document} of filename for the selected experiments only, in natural order."""
+    catalog.store_selection(experiments)
+    rows = catalog.conn.execute(
+        "SELECT experiment, payload FROM documents WHERE filename = ? "
+        "AND experiment IN (SELECT experiment FROM selected)", (filename,)).fetchall()
+    rows.sort(key=lambda row: natural_key(row[0]))
+    return {name: json.loads(payload) for name, payload in rows}
+
+
+def best_per_group(catalogs, group_key, metric="accuracy", experiments=None, ascending=False):
+    """
+    Best experiment of each value of group_key (e.g. 'model_name') by metric, computed in SQLite.
+
+    Both fields are read through the (filename, key) indexes and joined per experiment, a window
+    function then keeps the best row of each group. experiments optionally restricts the groups to
+    the output of select_experiments.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Columns group, experiment, <metric>, count (experiments in the group), best group first
+    """
+    import pandas as pd
+    if not isinstance(catalogs, (list, tuple)):
+        catalogs = [catalogs]
+    columns = ["group", "experiment", metric, "count"]
+    group, value = resolve_key(catalogs, group_key), resolve_key(catalogs, metric)
+    if group is None or value is None:
+        return pd.DataFrame(columns=columns)
+    if group[0] is not value[0]:
+        raise ValueError("Grouping needs the metrics and the configs in the same experiments folder")
+    catalog = group[0]
+
+    restrict = ""
+    if experiments is not None:
+        catalog.store_selection(experiments)
+        restrict = "AND experiment IN (SELECT experiment FROM selected)"
+    order = "ASC" if ascending else "DESC"
+    sql = f"""
+        WITH grouped AS (
+            SELECT experiment, COALESCE(text_value, num_value) AS grp FROM fields
+            WHERE filename = ? AND key = ? {restrict}
+        ), scored AS (
+            SELECT experiment, num_value AS score FROM fields
+            WHERE filename = ? AND key = ? AND num_value IS NOT NULL {restrict}
+        ), ranked AS (
+            SELECT grp, experiment, score,
+                   ROW_NUMBER() OVER (PARTITION BY grp ORDER BY score {order}, length(experiment), experiment) AS position,
+                   COUNT(*) OVER (PARTITION BY grp) AS n
+            FROM grouped JOIN scored USING (experiment)
+        )
+        SELECT grp, experiment, score, n FROM ranked WHERE position = 1
+        ORDER BY score {order}, length(experiment), experiment
+    """
+    rows = catalog.conn.execute(sql, (group[1], group[2], value[1], value[2])).fetchall()
+    return pd.DataFrame(rows, columns=columns)
+
+
+def field_keys(catalog, filename="config.json"):
+    """Distinct flattened keys of one document type, e.g. to offer group-by choices."""
+    rows = catalog.conn.execute("SELECT DISTINCT key FROM fields WHERE filename = ? ORDER BY key", (filename,))
+    return [row[0] for row in rows]
+
+
+def filter_frame(df, conditions):
+    """Apply the same conditions to a DataFrame with flattened columns (e.g. an exported experiment table)."""
+    import pandas as pd
+    mask = pd.Series(True, index=df.index)
+    for condition in conditions:
+        key = condition.key
+        if key not in df.columns:
+            for prefix in FILENAME_PREFIXES:
+                if key.startswith(prefix) and key[len(prefix):] in df.columns:
+                    key = key[len(prefix):]
+                    break
+            else:
+                return df.iloc[0:0]
+        column = df[key]
+        if condition.value is None:
+            test = column.isna() if condition.op == "==" else column.notna()
+        elif isinstance(condition.value, (bool, float)):
+            test = _OPERATORS[condition.op](pd.to_numeric(column, errors='coerce'), float(condition.value))
+        else:
+            test = _OPERATORS[condition.op](column.astype(str), condition.value) & column.notna()
+        mask &= test.fillna(False).astype(bool)
+    return df[mask]
+
+
+def best_per_group_frame(df, group_key, metric="accuracy", ascending=False):
+    """best_per_group on a DataFrame with flattened columns (e.g. an exported experiment table)."""
+    import pandas as pd
+    columns = ["group", "experiment", metric, "count"]
+    if group_key not in df.columns or metric not in df.columns:
+        return pd.DataFrame(columns=columns)
+    frame = pd.DataFrame({"group": df[group_key], metric: pd.to_numeric(df[metric], errors='coerce')})
+    frame = frame.dropna().rename_axis("experiment").reset_index()
+    frame = frame.sort_values(metric, ascending=ascending, kind='stable')
+    counts = frame.groupby("group", sort=False)["experiment"].transform("size")
+    best = frame.assign(count=counts).drop_duplicates("group")
+    return best[columns].reset_index(drop=True)
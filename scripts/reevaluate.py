@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import logging
+import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scripts.defaults import DEFAULT_BATCH_SIZE
+from scripts.evaluation import ConfusionMatrixAccumulator, confusion_matrix_metrics, bootstrap_metrics
+from scripts.experiment_catalog import natural_key
+from scripts.io_utils import write_json_atomic
+from scripts.curves import curves_from_predictions, write_curves
+from scripts.packs import packed_experiments
+from scripts.predictions import PREDICTIONS_DIRNAME, PREDICTION_FILES, has_predictions, load_predictions
+
+logger = logging.getLogger(__name__)
+
+
+def metrics_from_predictions(predictions, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Compute the metrics.json scores from cached predictions.
+
+    The memory-mapped arrays are read in slices of batch_size rows, so memory stays bounded
+    whatever the size of the test set. Uses the same confusion-matrix metrics as packaging,
+    so a metric added there is picked up here without touching any model.
+    """
+    y_true, y_pred = predictions["y_true"], predictions["y_pred"]
+    accumulator = ConfusionMatrixAccumulator()
+    for start in range(0, len(y_true), batch_size):
+        accumulator.update(y_true[start:start + batch_size], y_pred[start:start + batch_size])
+    return confusion_matrix_metrics(accumulator)
+
+
+def reevaluate_experiment(exp_path, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Recompute the metrics of one experiment from its predictions folder and update metrics.json.
+
+    Values that do not come from the predictions (timestamp, latency, model size, ...) are kept.
+    The file is replaced atomically so readers never see a partial metrics.json.
+    Binary classifiers with cached probabilities also get their ROC/PR curves rebuilt, and
+    bootstrap confidence intervals are recomputed with the same settings when there were any.
+    """
+    metrics_path = os.path.join(exp_path, "metrics.json")
+    try:
+        with open(metrics_path) as f:
+            metrics = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        metrics = {}
+    predictions = load_predictions(exp_path)
+    metrics.update(metrics_from_predictions(predictions, batch_size))
+    if metrics.get("bootstrap_resamples"):
+        metrics.update(bootstrap_metrics(metrics["confusion_matrix"], metrics["bootstrap_resamples"],
+                                         metrics.get("confidence_level", 0.95)))
+    scores, curves = curves_from_predictions(predictions)
+    if scores is not None:
+        metrics.update(scores)
+        write_curves(exp_path, curves)
+    metrics["reevaluated_at"] = datetime.datetime.now().isoformat()
+    write_json_atomic(metrics_path, metrics)
+    return metrics
+
+
+def _reevaluate_one(exp_path, batch_size):
+    start = time.perf_counter()
+    result = {"experiment": os.path.basename(exp_path), "error": None}
+    try:
+        reevaluate_experiment(exp_path, batch_size)
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def find_experiments_with_predictions(experiments_dir="experiments"):
+    """
+    Experiment folders that have cached predictions, in natural order (exp2 before exp10).
+
+    Only loose folders are listed, see packed_experiments_with_predictions for the compacted ones.
+    """
+    names = sorted((e.name for e in os.scandir(experiments_dir) if e.is_dir()), key=natural_key)
+    return [os.path.join(experiments_dir, name) for name in names
+            if has_predictions(os.path.join(experiments_dir, name))]
+
+
+def packed_experiments_with_predictions(experiments_dir="experiments"):
+    """
+    Names of the experiments compacted into a pack with cached predictions, in natural order.
+
+    They are not re-evaluated: packs are read-only archives, and a metrics.json written next to
+    them would be compacted later into a pack that hides the rest of the experiment.
+    """
+    y_true = f"{PREDICTIONS_DIRNAME}/{PREDICTION_FILES['y_true']}"
+    names = [name for name, files in packed_experiments(experiments_dir).items()
+             if y_true in files and not os.path.isdir(os.path.join(experiments_dir, name))]
+    return sorted(names, key=natural_key)
+
+
+def reevaluate_experiments(experiments_dir="experiments", n_jobs=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Recompute metrics.json for every experiment with cached predictions, in parallel.
+
+    No model is unpickled: each worker only memory-maps the predictions of one experiment.
+    Experiments packaged without predictions are skipped, and so are the experiments already
+    compacted into packs (see packed_experiments_with_predictions).
+
+    Returns:
+    --------
+    tuple
+        (results, skipped): one dict per re-evaluated experiment in natural order (experiment,
+        seconds, error), and the names of the packed experiments that were left out
+    """
+    exp_paths = find_experiments_with_predictions(experiments_dir)
+    skipped = packed_experiments_with_predictions(experiments_dir)
+    start = time.perf_counter()
+    results = [None] * len(exp_paths)
+    if n_jobs == 1:
+        results = [_reevaluate_one(path, batch_size) for path in exp_paths]
+    elif exp_paths:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = {pool.submit(_reevaluate_one, path, batch_size): i for i, path in enumerate(exp_paths)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+    failed = sum(1 for r in results if r["error"])
+    logger.info(f"Re-evaluated {len(exp_paths) - failed}/{len(exp_paths)} experiments in {time.perf_counter() - start:.2f}s")
+    return results, skipped
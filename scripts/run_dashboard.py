@@ -9,57 +9,202 @@ Original file is located at
 
 import streamlit as st  # For visualization
 import pandas as pd  # For organizing experimental metrics data, need to display in tables
-import matplotlib.pyplot as plt  # For creating bar charts
-from pathlib import Path  # For cross-platform file path handling
-import json  # Because the metric files we need to read are in JSON format
-from scripts.compare_metrics import give_recommendation # Because we need to call the recommendation model function from compare_metrics
-import glob # for path finding
+import matplotlib.pyplot as plt  # For closing the charts replaced by a newer version
+from scripts.compare_metrics import give_recommendation, leaderboard, lower_is_better, select_metric_columns, plot_metrics as compare_plot_metrics # Because we need to call the recommendation model function from compare_metrics
+from scripts.experiment_catalog import load_documents, natural_key, ExperimentCatalog # Incremental on-disk index of the experiment JSON files
+from scripts.experiment_watcher import ExperimentWatcher # Reports which experiment folders changed
+from scripts.profiling import PROFILE_FILENAME, profiles_to_frame # Packaging cost recorded in profile.json
+from scripts.curves import load_curves, plot_curves # ROC/PR curves stored in curves.npz at packaging time
+from scripts.experiment_table import read_experiment_table, read_table_schema, metric_columns # Columnar export written by `mlops export`
+from scripts.query import parse_conditions, select_experiments, best_per_group, field_keys, filter_frame, best_per_group_frame # Filters and group-bys on the indexed config/metrics fields
+from scripts.pareto import Objective, pareto_ranking, pareto_recommendation, plot_pareto # Pareto front of several metrics
+from scripts.streaming_evaluation import STREAM_KEY, load_timeseries # Snapshots and windowed metrics of streaming evaluations
 import os # Import the operating system module for path operation
+import threading # The metrics store is shared between Streamlit sessions
 
-# Wrapper function for running inside a notebook
-def run_dashboard_ui():
-    """
-    Run the Streamlit dashboard from a notebook or external script.
-    Usage:
-        from scripts.run_dashboard import run_dashboard_ui
-        run_dashboard_ui()
-    """
-    import subprocess
-    script_path = os.path.abspath(__file__)
-    subprocess.Popen(["streamlit", "run", script_path])  # Launch Streamlit in a non-blocking way
+# Wrapper function for running inside a notebook (kept importable from here, see dashboard_launcher)
+from scripts.dashboard_launcher import run_dashboard_ui
 
 # Build a function to load all metrics content in the experiment folder and save it as a dict
+# Only new or changed metrics.json files are parsed, the rest comes from the catalog
 def load_all_metrics(exp_dir="experiments"):
-    metrics = {}
-    for path in glob.glob(os.path.join(Path(exp_dir), "*/metrics.json")):
-        with open(path) as f:
-            data = json.load(f)
-        # Extract experiment name from path
-        exp_name = os.path.basename(os.path.dirname(path))
-        metrics[exp_name] = data
-    return metrics
+    return load_documents(exp_dir, "metrics.json")
+
+# Keeps the loaded metrics in memory between reruns and only reloads the experiments that changed
+class MetricsStore:
+    """
+    In-memory copy of all metrics.json files with a version number.
+
+    A file watcher reports new or changed experiment folders, and update() refreshes just
+    those through the catalog. The version only increases when something changed, so it is
+    used as the cache key of everything derived from the metrics.
+    """
+
+    def __init__(self, exp_dir="experiments"):
+        self.exp_dir = exp_dir
+        self.version = 0
+        self._lock = threading.Lock()
+        self.metrics = load_all_metrics(exp_dir)
+        try:
+            self.watcher = ExperimentWatcher(exp_dir, filenames=("metrics.json",)).start()
+        except Exception:
+            # No watchdog or no experiments folder yet: fall back to a stat-only catalog refresh
+            self.watcher = None
+
+    def update(self):
+        """Apply the pending changes and return the current version."""
+        with self._lock:
+            # A new connection per update: Streamlit reruns happen in different threads
+            with ExperimentCatalog(self.exp_dir) as catalog:
+                if self.watcher is None:
+                    if catalog.refresh("metrics.json") == 0:
+                        return self.version
+                    self.metrics = catalog.load("metrics.json", refresh=False)
+                else:
+                    changed = self.watcher.drain()
+                    # Several events are reported per written file, only real content changes count
+                    if not changed or catalog.refresh("metrics.json", changed) == 0:
+                        return self.version
+                    reloaded = catalog.load("metrics.json", refresh=False, experiments=changed)
+                    for name in changed:
+                        if name in reloaded:
+                            self.metrics[name] = reloaded[name]
+                        else:
+                            self.metrics.pop(name, None)
+                    self.metrics = dict(sorted(self.metrics.items(), key=lambda item: natural_key(item[0])))
+            self.version += 1
+            return self.version
+
+
+# One store (and one watcher) per experiments folder for the whole Streamlit server
+@st.cache_resource
+def get_metrics_store(exp_dir="experiments"):
+    return MetricsStore(exp_dir)
+
+# Every cache below is keyed by the store version, which grows with each change on disk: only the latest
+# frames and charts are kept, and a few results per version for the other lookups (filters, metrics...)
+DASHBOARD_CACHE_ENTRIES = 8
+
+# The last figure of each cached chart, shared by all sessions like the chart caches themselves
+@st.cache_resource
+def get_open_charts():
+    return {}
+
+# A new chart evicts the previous one from its cache (max_entries=1), close it so pyplot releases it too
+def replace_chart(name, fig):
+    charts = get_open_charts()
+    previous = charts.get(name)
+    if previous is not None and previous is not fig:
+        plt.close(previous)
+    charts[name] = fig
+    return fig
+
+# The derived DataFrame only depends on the store version, the store itself is not hashed
+@st.cache_data(max_entries=1)
+def get_metrics_frame(version, _store):
+    return pd.DataFrame.from_dict(_store.metrics, orient='index')
+
+# An exported table is memory-mapped and only its metric columns are read, once per file version
+@st.cache_data(max_entries=1)
+def get_table_frame(version, table_path):
+    return read_experiment_table(table_path, metric_columns(table_path))
+
+# The whole table (configs included) is only read when filtering or grouping an exported table
+@st.cache_data(max_entries=1)
+def get_full_table_frame(version, table_path):
+    return read_experiment_table(table_path)
+
+# Experiments matching a filter, answered by the catalog indexes once per (version, filter)
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_selection(version, where, exp_dir):
+    with ExperimentCatalog(exp_dir) as catalog:
+        catalog.refresh("config.json")
+        return select_experiments(catalog, parse_conditions(where))
+
+# Config fields offered as group-by choices
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_config_keys(version, exp_dir):
+    with ExperimentCatalog(exp_dir) as catalog:
+        catalog.refresh("config.json")
+        return field_keys(catalog, "config.json")
+
+# Best experiment per value of a config field, computed in SQLite on the (filtered) experiments
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_groups(version, group_by, priority_metric, _experiments, exp_dir):
+    with ExperimentCatalog(exp_dir) as catalog:
+        return best_per_group(catalog, group_by, priority_metric, experiments=list(_experiments),
+                              ascending=lower_is_better(priority_metric))
+
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_recommendation(version, priority_metric, _metrics_df):
+    return give_recommendation(_metrics_df, priority_metric=priority_metric)
+
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_leaderboard(version, priority_metric, k, _metrics_df):
+    return leaderboard(_metrics_df, priority_metric, k=k)
+
+# Numeric metric columns offered as objectives
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_numeric_metrics(version, _metrics_df):
+    return list(select_metric_columns(_metrics_df).columns)
+
+# Pareto front and weighted-score ranking, once per (version, objectives)
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_pareto_ranking(version, objectives, include_dominated, _metrics_df):
+    return pareto_ranking(_metrics_df, list(objectives), include_dominated)
+
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_pareto_recommendation(version, objectives, _metrics_df):
+    return pareto_recommendation(_metrics_df, list(objectives))
+
+@st.cache_resource(max_entries=1)
+def build_pareto_chart(version, objectives, _metrics_df):
+    return replace_chart("pareto", plot_pareto(_metrics_df, list(objectives)))
+
+# Windowed metrics of one streaming evaluation, re-read when its metrics.json snapshot changes
+@st.cache_data(max_entries=DASHBOARD_CACHE_ENTRIES)
+def get_timeseries(version, exp_path):
+    return load_timeseries(exp_path)
+
+# Only numeric metrics are drawn, large result sets are shown as one box plot per metric
+def make_metrics_chart(metrics_df, top_k=None, sort_by=None):
+    return compare_plot_metrics(metrics_df, top_k=top_k, sort_by=sort_by)
+
+# Build the comparison chart once per version
+@st.cache_resource(max_entries=1)
+def build_metrics_chart(version, top_k, sort_by, _metrics_df):
+    return replace_chart("metrics", make_metrics_chart(_metrics_df, top_k, sort_by))
+
+# The stored curves of the selected experiments, read once per (version, selection), nothing is recomputed
+@st.cache_resource(max_entries=1)
+def build_curves_chart(version, experiments, exp_dir):
+    curves = {exp: load_curves(os.path.join(exp_dir, exp)) for exp in experiments}
+    return replace_chart("curves", plot_curves({exp: c for exp, c in curves.items() if c is not None}))
 
 # Build a function to create plots
-def plot_metrics(metrics_dict):
+def plot_metrics(metrics_dict, metrics_df=None, version=None, top_k=None, sort_by=None):
     """
     Plot all the metrics
     arguments: metrics_dict : dictionary
+               metrics_df, version : already built DataFrame and its store version, to reuse the cached chart
+               top_k, sort_by : only chart the best top_k experiments by the sort_by metric
     return: None
     """
     # first transpose the previously constructed dictionary format metrics
     # to make the X-axis represent different experiments and the Y-axis represent values
-    metrics_df = pd.DataFrame(metrics_dict).T
+    if metrics_df is None:
+        metrics_df = pd.DataFrame(metrics_dict).T
     # First display as a df table
     st.write("Experiment Metrics Data Table:")
     st.dataframe(metrics_df)
     #then use a bar chart to show comparison between different experiments
     st.write("🔎 Metrics Comparison Chart:")
-    fig, ax = plt.subplots()
-    metrics_df.plot(kind='bar', ax=ax)
-    plt.title("Experiment Metrics Comparison")
-    plt.ylabel("Score")
-    plt.xticks(rotation=45) # in case the name is too long
-    st.pyplot(fig)
+    if version is None:
+        fig = make_metrics_chart(metrics_df, top_k, sort_by)
+        st.pyplot(fig)
+        plt.close(fig)
+    else:
+        st.pyplot(build_metrics_chart(version, top_k, sort_by, metrics_df))
 
 
     
@@ -68,22 +213,124 @@ if __name__ == "__main__":
     st.title("Experiment Comparison Platform")
     st.markdown("The system will automatically compare multiple model experiments, their metrics, and provide recommendations.")
 
-    # Load the results of the first function load_metrics into a new variable
-    metrics = load_all_metrics()
+    exp_dir = "experiments"
+    # Either an exported Arrow/Parquet table (mlops export), or the live experiment folders
+    table_path = st.sidebar.text_input("Exported experiment table (.arrow / .parquet), empty for live folders", "")
+    # Filter on config.json / metrics.json fields, e.g. parameters.n_estimators >= 200
+    where = st.sidebar.text_input("Filter experiments (e.g. model_name == RandomForestClassifier and parameters.n_estimators >= 200)", "").strip()
+    use_table = bool(table_path) and os.path.exists(table_path)
+    if use_table:
+        version = f"{table_path}:{os.stat(table_path).st_mtime_ns}"
+        metrics_df = get_table_frame(version, table_path)
+        # Group-by choices from the schema only, no column is read for them
+        config_keys = [c for c in read_table_schema(table_path).names if c != "experiment" and c not in metrics_df.columns]
+    else:
+        # Load the results of the first function load_metrics into a new variable
+        # The store is cached across reruns, only changed experiments are reloaded
+        store = get_metrics_store(exp_dir)
+        version = store.update()
+        metrics_df = get_metrics_frame(version, store) if store.metrics else None
+        config_keys = get_config_keys(version, exp_dir)
+    if where and metrics_df is not None:
+        try:
+            if use_table:
+                selected = filter_frame(get_full_table_frame(version, table_path), parse_conditions(where)).index
+            else:
+                selected = get_selection(version, where, exp_dir)
+            metrics_df = metrics_df.loc[metrics_df.index.intersection(selected, sort=False)]
+            # Everything derived from the metrics is cached per (version, filter)
+            version = f"{version}|{where}"
+        except ValueError as e:
+            st.sidebar.error(str(e))
+    group_by = st.sidebar.selectbox("Best experiment per", ["(none)"] + list(config_keys))
     # If these loaded metrics are empty
-    if len(metrics) == 0:
+    if metrics_df is None or metrics_df.empty:
         st.warning("No experiments have been found, please upload experiment folders containing metrics.json first.")
     else:
     # Visualization + Recommendation output
-        plot_metrics(metrics)
+        metrics = metrics_df.index
+        # Limit the chart to the best experiments when there are many of them
+        chart_top_k = st.number_input("Experiments shown in the chart (0 = all)", min_value=0, value=0)
+        plot_metrics(None, metrics_df, version, top_k=int(chart_top_k) or None, sort_by="accuracy")
 
         st.markdown("## System Recommendation")
-        available_metrics = list(next(iter(metrics.values())).keys())
-        # we just want to give these priority metric options
-        metric_options = [m for m in ["accuracy", "f1_score", "precision", "recall", "loss"] if m in available_metrics]
+        available_metrics = set(metrics_df.columns)
+        # we just want to give these priority metric options, latency and size rank the smallest value first
+        metric_options = [m for m in ["accuracy", "f1_score", "precision", "recall", "loss",
+                                      "latency_p50_ms", "latency_p95_ms", "latency_p99_ms", "throughput_rows_per_s",
+                                      "model_size_bytes", "model_memory_bytes"] if m in available_metrics]
         priority_metric = st.selectbox("Select priority metric", metric_options)
 
-        # Convert metrics dictionary to DataFrame before calling give_recommendation
-        metrics_df = pd.DataFrame.from_dict(metrics, orient='index')
-        model_suggestion = give_recommendation(metrics_df, priority_metric=priority_metric)  
-        st.success(model_suggestion)
\ No newline at end of file
+        # Leaderboard of the best experiments for the selected metric
+        top_k = st.number_input("Number of experiments in the leaderboard", min_value=1, value=min(20, len(metrics)))
+        st.dataframe(get_leaderboard(version, priority_metric, int(top_k), metrics_df))
+
+        # Recommendations are cached per (version, priority metric), changing the selectbox does not reload anything
+        model_suggestion = get_recommendation(version, priority_metric, metrics_df)
+        st.success(model_suggestion)
+
+        # Best experiment of each group, e.g. per model_name
+        if group_by != "(none)":
+            st.markdown(f"## Best Experiment per {group_by}")
+            if use_table:
+                full_df = get_full_table_frame(version.split("|")[0], table_path)
+                groups = best_per_group_frame(full_df.loc[metrics_df.index], group_by, priority_metric,
+                                              lower_is_better(priority_metric))
+            else:
+                groups = get_groups(version, group_by, priority_metric, tuple(metrics_df.index), exp_dir)
+            st.dataframe(groups, hide_index=True)
+
+        # Trade-offs between quality and cost metrics: dominated experiments are filtered out
+        st.markdown("## Multi-objective Recommendation (Pareto front)")
+        numeric_metrics = get_numeric_metrics(version, metrics_df)
+        chosen = st.multiselect("Objectives", numeric_metrics,
+                                default=[m for m in ("accuracy", "latency_p95_ms", "model_size_bytes") if m in numeric_metrics])
+        objectives = []
+        for metric in chosen:
+            direction_col, weight_col = st.columns(2)
+            direction = direction_col.selectbox(f"{metric} direction", ["max", "min"],
+                                                index=int(lower_is_better(metric)), key=f"direction_{metric}")
+            weight = weight_col.number_input(f"{metric} weight", min_value=0.0, value=1.0, step=0.1, key=f"weight_{metric}")
+            objectives.append(Objective(metric, direction == "max", weight))
+        if objectives and sum(o.weight for o in objectives) > 0:
+            objectives = tuple(objectives)
+            show_dominated = st.checkbox("Also list dominated experiments")
+            st.dataframe(get_pareto_ranking(version, objectives, show_dominated, metrics_df))
+            pareto_summary = get_pareto_recommendation(version, objectives, metrics_df)
+            if pareto_summary:
+                st.success(pareto_summary)
+            if len(objectives) >= 2:
+                st.pyplot(build_pareto_chart(version, objectives, metrics_df))
+
+        # Experiments evaluated online: metrics.json is a snapshot updated as labeled data arrives
+        if STREAM_KEY in metrics_df.columns and not use_table:
+            streams = metrics_df[STREAM_KEY].dropna()
+            streams = streams[streams.map(lambda state: isinstance(state, dict))]
+            if len(streams):
+                st.markdown("## Streaming Evaluation")
+                streamed = st.selectbox("Experiment", list(streams.index))
+                state = streams[streamed]
+                st.caption(f"{state.get('rows', 0)} rows in {state.get('batches', 0)} batches, "
+                           f"last snapshot {state.get('updated_at')}")
+                timeseries = get_timeseries(version, os.path.join(exp_dir, streamed))
+                if not timeseries.empty:
+                    st.line_chart(timeseries.set_index("end_row")[["accuracy", "f1_score", "precision", "recall"]])
+
+        # ROC / Precision-Recall curves of binary classifiers packaged with predict_proba
+        if "roc_auc" in metrics_df.columns:
+            with_curves = list(metrics_df.index[pd.to_numeric(metrics_df["roc_auc"], errors='coerce').notna()])
+            st.markdown("## ROC / Precision-Recall Curves")
+            selected = st.multiselect("Experiments to overlay", with_curves, default=with_curves[:5])
+            if selected:
+                st.pyplot(build_curves_chart(version, tuple(selected), exp_dir))
+
+        # Packaging cost across experiments, only loaded on demand
+        if st.checkbox("Show packaging cost"):
+            profiles = load_documents(exp_dir, PROFILE_FILENAME)
+            if not profiles:
+                st.info("No profile.json found, package experiments again to record their packaging cost.")
+            else:
+                profile_df = profiles_to_frame(profiles)
+                st.markdown("## Packaging Cost")
+                st.line_chart(profile_df[[c for c in profile_df.columns if c.endswith("_seconds")]])
+                st.dataframe(profile_df)
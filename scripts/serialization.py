@@ -0,0 +1,130 @@
+import os
+import json
+import pickle
+import logging
+
+# Supported formats for the model artifact and the file written for each of them
+MODEL_FILENAMES = {
+    "pickle": "model.pkl",
+    "joblib": "model.joblib",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def detect_model_format(path):
+    """Guess the serialization format from the file extension."""
+    return "joblib" if str(path).endswith((".joblib", ".jbl")) else "pickle"
+
+
+def _dump(model, f_or_path, model_format, compress):
+    if model_format == "joblib":
+        import joblib
+        joblib.dump(model, f_or_path, compress=compress)
+    elif hasattr(f_or_path, "write"):
+        pickle.dump(model, f_or_path, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        with open(f_or_path, 'wb') as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def save_model(model, exp_path, model_format="pickle", compress=0, blob_store=None):
+    """
+    Serialize the model into the experiment folder.
+
+    Parameters:
+    -----------
+    model : object
+        Trained model
+    exp_path : str
+        Experiment folder
+    model_format : str
+        'pickle' or 'joblib'
+    compress : int
+        joblib compression level from 0 to 9. Level 0 keeps the NumPy arrays uncompressed,
+        so the model can later be loaded with mmap_mode and shared between processes.
+    blob_store : BlobStore or None
+        Store the model once in this content-addressed store (see scripts/blob_store.py) instead of
+        the experiment folder. The artifact then references the blob by digest.
+
+    Returns:
+    --------
+    dict
+        Artifact description stored in config.json under 'model_artifact'
+    """
+    if model_format not in MODEL_FILENAMES:
+        raise ValueError(f"Unknown model format '{model_format}', expected one of {list(MODEL_FILENAMES)}")
+
+    if blob_store is not None:
+        # Hashed while it is written, stored only if no identical model is there yet
+        blob = blob_store.write(lambda f: _dump(model, f, model_format, compress))
+        artifact = {"blob": blob["digest"], "bytes": blob["bytes"], "format": model_format}
+    else:
+        filename = MODEL_FILENAMES[model_format]
+        _dump(model, os.path.join(exp_path, filename), model_format, compress)
+        artifact = {"file": filename, "format": model_format}
+    if model_format == "joblib":
+        artifact["compress"] = compress
+    return artifact
+
+
+def load_model(path, model_format=None, mmap_mode=None):
+    """
+    Load a model file, or the model of an experiment folder.
+
+    For an experiment folder the format is read from config.json, older experiments
+    without 'model_artifact' fall back to model.pkl.
+    mmap_mode (e.g. 'r') only applies to uncompressed joblib artifacts: their NumPy arrays
+    are memory-mapped instead of read into memory. Compressed artifacts are read into memory
+    with a warning.
+    """
+    from scripts.packs import is_packed, open_experiment_file
+    if os.path.isdir(path) or is_packed(path):
+        artifact = read_model_artifact(path)
+        model_format = artifact["format"]
+        if mmap_mode and artifact.get("compress", 0) > 0:
+            # The arrays of a compressed joblib file are not stored as raw bytes that could be mapped
+            logger.warning(f"{path} holds a compressed model (compress={artifact['compress']}), "
+                           f"loading it into memory instead of memory-mapping it")
+            mmap_mode = None
+        if not artifact.get("blob") and not os.path.isdir(path):
+            # Compacted experiment: the model file is read from its pack (no memory-mapping)
+            with open_experiment_file(path, artifact["file"]) as f:
+                return _load(f, model_format)
+        path = artifact_path(path, artifact)
+    model_format = model_format or detect_model_format(path)
+
+    if model_format == "joblib":
+        return _load(path, model_format, mmap_mode)
+    with open(path, 'rb') as f:
+        return _load(f, model_format)
+
+
+def _load(f_or_path, model_format, mmap_mode=None):
+    if model_format == "joblib":
+        import joblib
+        return joblib.load(f_or_path, mmap_mode=mmap_mode)
+    return pickle.load(f_or_path)
+
+
+def read_model_artifact(exp_path):
+    """Return the 'model_artifact' entry of an experiment's config.json."""
+    from scripts.packs import open_experiment_file
+    try:
+        with open_experiment_file(exp_path, "config.json") as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        config = {}
+    return config.get("model_artifact", {"file": MODEL_FILENAMES["pickle"], "format": "pickle"})
+
+
+def artifact_path(exp_path, artifact):
+    """
+    Path of the model file described by a model_artifact entry.
+
+    Blobs live in the store of the experiments root, i.e. the parent folder of the experiment.
+    """
+    if artifact.get("blob"):
+        from scripts.blob_store import BlobStore
+        return BlobStore(os.path.dirname(os.path.abspath(exp_path))).path(artifact["blob"])
+    return os.path.join(exp_path, artifact["file"])
@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import logging
+import datetime
+import numpy as np
+from scripts.defaults import DEFAULT_STREAM_FLUSH_SECONDS
+from scripts.evaluation import ConfusionMatrixAccumulator, confusion_matrix_metrics, bootstrap_metrics
+from scripts.io_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Windowed metrics, one JSON line per closed window, next to metrics.json
+TIMESERIES_FILENAME = "metrics_timeseries.jsonl"
+# Key of metrics.json holding the state of a streaming evaluation (rows, labels, timestamps)
+STREAM_KEY = "stream"
+# Values of a previous offline evaluation that no longer describe the streamed data
+STALE_KEYS = ("confidence_intervals", "confidence_level", "bootstrap_resamples", "roc_auc", "pr_auc")
+
+
+class StreamingEvaluator:
+    """
+    Running confusion-matrix metrics of an experiment, fed with labeled batches as they arrive.
+
+    Usage:
+        with StreamingEvaluator("experiments/exp3", window_rows=10_000) as evaluator:
+            for y_true, y_pred in labeled_traffic():
+                evaluator.update(y_true, y_pred)
+
+    Only the confusion matrix is kept, O(n_classes²) memory whatever the number of rows.
+    metrics.json is rewritten atomically (see write_json_atomic) by the first batch arriving after
+    flush_seconds or flush_rows rows since the previous snapshot, and when the evaluator is closed,
+    so compare-metrics, --watch, the dashboard and the API pick the snapshots up through the catalog
+    like any other change, without predicting anything again.
+    Values not computed here (inference benchmark, model size, ...) are kept.
+
+    With window_rows, the metrics of each consecutive window of window_rows rows are appended to
+    metrics_timeseries.jsonl. With resume, the counts of a previous streaming evaluation of the
+    same experiment are loaded from metrics.json and the stream continues from there, including
+    the rows of its unfinished window, so windows stay aligned on multiples of window_rows.
+    A window of a stream run with another window_rows is dropped and a fresh one starts.
+    """
+
+    def __init__(self, exp_path, flush_seconds=DEFAULT_STREAM_FLUSH_SECONDS, flush_rows=None, window_rows=None,
+                 bootstrap=0, confidence=0.95, resume=False):
+        self.exp_path = exp_path
+        self.metrics_path = os.path.join(exp_path, "metrics.json")
+        self.timeseries_path = os.path.join(exp_path, TIMESERIES_FILENAME)
+        self.flush_seconds = flush_seconds
+        self.flush_rows = flush_rows
+        self.window_rows = window_rows
+        self.bootstrap = bootstrap
+        self.confidence = confidence
+
+        self.base = self._read_metrics()
+        state = self.base.get(STREAM_KEY) if resume else None
+        if isinstance(state, dict) and state.get("labels"):
+            self.accumulator = ConfusionMatrixAccumulator(state["labels"])
+            self.accumulator.matrix = np.asarray(self.base["confusion_matrix"], dtype=np.int64)
+            self.batches, self.windows = state.get("batches", 0), state.get("windows", 0)
+            self.started_at = state.get("started_at")
+            self.window = self._restore_window(state)
+        else:
+            self.accumulator = ConfusionMatrixAccumulator()
+            self.batches = self.windows = 0
+            self.started_at = datetime.datetime.now().isoformat()
+            # The windows of a previous stream do not belong to this one
+            if os.path.exists(self.timeseries_path):
+                os.remove(self.timeseries_path)
+            self.window = ConfusionMatrixAccumulator()
+        self._pending_windows = []
+        self._flushed_at = time.monotonic()
+        self._flushed_rows = self.accumulator.n_samples
+
+    def _restore_window(self, state):
+        """The unfinished window saved by the previous snapshot, when it used the same window_rows."""
+        window = ConfusionMatrixAccumulator()
+        saved = state.get("window")
+        if not (self.window_rows and isinstance(saved, dict) and saved.get("labels")):
+            return window
+        if saved.get("window_rows") != self.window_rows:
+            logger.warning(f"Window of {saved.get('window_rows')} rows in {self.metrics_path}, "
+                           f"starting a new window of {self.window_rows} rows")
+            return window
+        window = ConfusionMatrixAccumulator(saved["labels"])
+        window.matrix = np.asarray(saved["matrix"], dtype=np.int64)
+        return window
+
+    def _read_metrics(self):
+        try:
+            with open(self.metrics_path) as f:
+                metrics = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return metrics if isinstance(metrics, dict) else {}
+
+    @property
+    def n_samples(self):
+        return self.accumulator.n_samples
+
+    def update(self, y_true, y_pred):
+        """Add one batch of labels and predictions, and write a snapshot when one is due."""
+        y_true, y_pred = np.asarray(y_true).ravel(), np.asarray(y_pred).ravel()
+        self.accumulator.update(y_true, y_pred)
+        self.batches += 1
+        if self.window_rows:
+            self._update_windows(y_true, y_pred)
+        if self._flush_due():
+            self.flush()
+
+    def _update_windows(self, y_true, y_pred):
+        # A batch can close several windows, each window gets exactly window_rows rows
+        first_row = self.n_samples - len(y_true)
+        start = 0
+        while start < len(y_true):
+            take = min(len(y_true) - start, self.window_rows - self.window.n_samples)
+            self.window.update(y_true[start:start + take], y_pred[start:start + take])
+            start += take
+            if self.window.n_samples == self.window_rows:
+                self._close_window(first_row + start)
+
+    def _close_window(self, end_row):
+        scores = confusion_matrix_metrics(self.window)
+        scores.pop("confusion_matrix")
+        # Six decimals are plenty for a chart and keep each line around 150 bytes
+        scores = {name: round(value, 6) for name, value in scores.items()}
+        self.windows += 1
+        self._pending_windows.append({"timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                                      "window": self.windows, "rows": self.window.n_samples,
+                                      "end_row": end_row, **scores})
+        self.window = ConfusionMatrixAccumulator()
+
+    def _flush_due(self):
+        if self.flush_rows and self.n_samples - self._flushed_rows >= self.flush_rows:
+            return True
+        return time.monotonic() - self._flushed_at >= self.flush_seconds
+
+    def snapshot(self):
+        """The metrics.json content for the rows seen so far."""
+        metrics = {k: v for k, v in self.base.items() if k not in STALE_KEYS}
+        metrics.update(confusion_matrix_metrics(self.accumulator))
+        if self.bootstrap and self.n_samples:
+            metrics.update(bootstrap_metrics(self.accumulator.matrix, self.bootstrap, self.confidence))
+        now = datetime.datetime.now().isoformat()
+        metrics["timestamp"] = now
+        metrics[STREAM_KEY] = {
+            "rows": self.n_samples,
+            "batches": self.batches,
+            "windows": self.windows,
+            "labels": [] if self.accumulator.labels is None else self.accumulator.labels.tolist(),
+            "started_at": self.started_at,
+            "updated_at": now,
+        }
+        if self.window_rows and self.window.labels is not None:
+            # Rows of the unfinished window, picked up again by resume
+            metrics[STREAM_KEY]["window"] = {"window_rows": self.window_rows,
+                                             "labels": self.window.labels.tolist(),
+                                             "matrix": self.window.matrix.tolist()}
+        return metrics
+
+    def flush(self):
+        """Append the closed windows to the time series and replace metrics.json with a new snapshot."""
+        if self._pending_windows:
+            lines = "".join(json.dumps(window) + "\n" for window in self._pending_windows)
+            with open(self.timeseries_path, "a") as f:
+                f.write(lines)
+            self._pending_windows = []
+        metrics = self.snapshot()
+        write_json_atomic(self.metrics_path, metrics)
+        self._flushed_at = time.monotonic()
+        self._flushed_rows = self.n_samples
+        return metrics
+
+    def close(self):
+        """Write the final snapshot (the rows of an unfinished window are only in the cumulative metrics)."""
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def evaluate_stream(exp_path, batches, model=None, flush_seconds=DEFAULT_STREAM_FLUSH_SECONDS, flush_rows=None,
+                    window_rows=None, bootstrap=0, confidence=0.95, resume=False):
+    """
+    Evaluate an experiment on an iterator of labeled batches, updating its metrics.json as it goes.
+
+    Parameters:
+    -----------
+    exp_path : str
+        Experiment folder, its model is loaded from there when model is None
+    batches : iterable
+        (x, y) batches, e.g. from iter_labeled_batches, or any generator fed by live traffic
+    model : object or None
+        Fitted model used to predict each batch
+    flush_seconds, flush_rows, window_rows, bootstrap, confidence, resume :
+        See StreamingEvaluator
+
+    Returns:
+    --------
+    dict
+        The final metrics.json content
+    """
+    if model is None:
+        from scripts.serialization import load_model
+        model = load_model(exp_path)
+    evaluator = StreamingEvaluator(exp_path, flush_seconds, flush_rows, window_rows, bootstrap, confidence, resume)
+    try:
+        for x, y in batches:
+            evaluator.update(y, model.predict(x))
+    finally:
+        # Interrupted streams still leave a snapshot of everything evaluated so far
+        metrics = evaluator.close()
+    logger.info(f"Streamed {evaluator.n_samples} rows in {evaluator.batches} batches into {evaluator.metrics_path}")
+    return metrics
+
+
+def load_timeseries(exp_path):
+    """Windowed metrics of a streaming evaluation as a DataFrame (empty when there are none)."""
+    import pandas as pd
+    from scripts.packs import open_experiment_file
+    try:
+        f = open_experiment_file(exp_path, TIMESERIES_FILENAME)
+    except FileNotFoundError:
+        return pd.DataFrame()
+    rows = []
+    with f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                # Last line cut by a crash in the middle of an append
+                continue
+    return pd.DataFrame(rows)
@@ -0,0 +1,196 @@
+import os
+import time
+import bisect
+import threading
+import pandas as pd
+from scripts.compare_metrics import give_recommendation, leaderboard, lower_is_better, plot_metrics
+from scripts.defaults import DEFAULT_WATCH_DEBOUNCE_SECONDS, DEFAULT_WATCH_MAX_LATENCY_SECONDS, DEFAULT_WATCH_TOP_K
+from scripts.experiment_catalog import ExperimentCatalog, natural_key
+from scripts.experiment_watcher import ExperimentWatcher
+
+
+class IncrementalLeaderboard:
+    """
+    Experiments kept sorted by one metric, best first, updated one experiment at a time.
+
+    Entries are (sort value, natural key, experiment) tuples in a list maintained with bisect,
+    so updating an experiment is a binary search plus a small memmove, and reading the top k
+    does not depend on how many experiments were recorded.
+    """
+
+    def __init__(self, metric="accuracy", ascending=None):
+        self.metric = metric
+        self.ascending = lower_is_better(metric) if ascending is None else ascending
+        self._entries = []
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, exp, value):
+        return (value if self.ascending else -value, natural_key(exp), exp)
+
+    def update(self, exp, metrics):
+        """Insert, move or remove (metrics None or without the metric) one experiment."""
+        old = self._keys.pop(exp, None)
+        if old is not None:
+            del self._entries[bisect.bisect_left(self._entries, old)]
+        value = (metrics or {}).get(self.metric)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+            return
+        entry = self._keys[exp] = self._entry(exp, float(value))
+        bisect.insort(self._entries, entry)
+
+    def rank(self, exp):
+        """1-based rank of an experiment, None when it has no value for the metric."""
+        entry = self._keys.get(exp)
+        return None if entry is None else bisect.bisect_left(self._entries, entry) + 1
+
+    def top(self, k):
+        """Names of the best k experiments."""
+        return [entry[2] for entry in self._entries[:k]]
+
+
+class MetricsWatch:
+    """
+    Long-running compare-metrics: keeps every metrics.json/config.json in memory and the leaderboard
+    sorted, and only reloads the experiments reported by the file watcher.
+
+    The outputs (leaderboard, recommendation, saved chart) are only rebuilt once no file event
+    arrived for debounce_seconds, or max_latency_seconds after the first event of a burst when
+    files keep changing, and only from the best top_k experiments, so a refresh costs the same
+    with 100 or 100 000 experiments.
+    """
+
+    def __init__(self, metrics_dir="experiments", configs_dir="experiments", priority_metric="accuracy",
+                 top_k=DEFAULT_WATCH_TOP_K, save_path=None, debounce_seconds=DEFAULT_WATCH_DEBOUNCE_SECONDS,
+                 max_latency_seconds=DEFAULT_WATCH_MAX_LATENCY_SECONDS):
+        self.metrics_dir, self.configs_dir = metrics_dir, configs_dir
+        self.priority_metric = priority_metric
+        self.top_k = top_k or DEFAULT_WATCH_TOP_K
+        self.save_path = save_path
+        self.debounce_seconds = debounce_seconds
+        self.max_latency_seconds = max_latency_seconds
+        self.board = IncrementalLeaderboard(priority_metric)
+        self.metrics, self.configs = {}, {}
+        self.refreshes = 0
+        self._event = threading.Event()
+        self._watchers = []
+
+        with ExperimentCatalog(metrics_dir) as catalog:
+            self.metrics = catalog.load("metrics.json")
+        with ExperimentCatalog(configs_dir) as catalog:
+            self.configs = catalog.load("config.json")
+        for exp, doc in self.metrics.items():
+            self.board.update(exp, doc)
+
+    def apply(self, changed_metrics, changed_configs=()):
+        """Reload only the given experiments through the catalog and update the leaderboard."""
+        for root, filename, documents, changed in ((self.metrics_dir, "metrics.json", self.metrics, changed_metrics),
+                                                   (self.configs_dir, "config.json", self.configs, changed_configs)):
+            changed = list(changed)
+            if not changed:
+                continue
+            with ExperimentCatalog(root) as catalog:
+                catalog.refresh(filename, changed)
+                reloaded = catalog.load(filename, refresh=False, experiments=changed)
+            for exp in changed:
+                if exp in reloaded:
+                    documents[exp] = reloaded[exp]
+                else:
+                    documents.pop(exp, None)
+                if filename == "metrics.json":
+                    self.board.update(exp, documents.get(exp))
+
+    def top_frames(self):
+        """Metrics and configs DataFrames of the best top_k experiments only."""
+        top = self.board.top(self.top_k)
+        metrics_df = pd.DataFrame.from_dict({exp: self.metrics[exp] for exp in top}, orient='index')
+        configs = {exp: self.configs[exp] for exp in top if exp in self.configs}
+        return metrics_df, pd.DataFrame.from_dict(configs, orient='index') if configs else None
+
+    def render(self):
+        """Print the leaderboard and the recommendation, and redraw the saved chart."""
+        metrics_df, configs_df = self.top_frames()
+        self.refreshes += 1
+        print(f"\n[{time.strftime('%H:%M:%S')}] {len(self.metrics)} experiments, "
+              f"top {len(metrics_df)} by {self.priority_metric}:")
+        if metrics_df.empty:
+            print(f"No experiment has a {self.priority_metric} value yet")
+            return None
+        print(leaderboard(metrics_df, self.priority_metric))
+        recommendations = give_recommendation(metrics_df, configs_df, self.priority_metric)
+        if "summary" in recommendations:
+            print(recommendations["summary"])
+        if self.save_path:
+            import matplotlib.pyplot as plt
+            plt.close(plot_metrics(metrics_df, self.save_path, sort_by=self.priority_metric))
+        return recommendations
+
+    def start(self):
+        """Start one file watcher per experiments root."""
+        roots = {os.path.abspath(self.metrics_dir): ["metrics.json"]}
+        roots.setdefault(os.path.abspath(self.configs_dir), []).append("config.json")
+        for root, filenames in roots.items():
+            watcher = ExperimentWatcher(root, filenames=filenames, on_change=lambda names: self._event.set())
+            self._watchers.append((watcher.start(), filenames))
+        return self
+
+    def stop(self):
+        for watcher, _ in self._watchers:
+            watcher.stop()
+        self._watchers = []
+
+    def _drain(self):
+        changed_metrics, changed_configs = set(), set()
+        for watcher, filenames in self._watchers:
+            names = watcher.drain()
+            if "metrics.json" in filenames:
+                changed_metrics |= names
+            if "config.json" in filenames:
+                changed_configs |= names
+        return changed_metrics, changed_configs
+
+    def run(self, max_refreshes=None):
+        """
+        Render once, then refresh after each burst of file events until interrupted
+        (or after max_refreshes renders).
+        """
+        self.render()
+        while max_refreshes is None or self.refreshes < max_refreshes:
+            self._event.wait()
+            # Debounce: wait until no file event arrived for debounce_seconds, a sweep writing
+            # many experiments triggers one refresh instead of one per file. A sweep that never
+            # stops writing still gets a refresh every max_latency_seconds
+            first_event = time.monotonic()
+            self._event.clear()
+            while True:
+                remaining = self.max_latency_seconds - (time.monotonic() - first_event)
+                if remaining <= 0 or not self._event.wait(min(self.debounce_seconds, remaining)):
+                    break
+                self._event.clear()
+            changed_metrics, changed_configs = self._drain()
+            if not changed_metrics and not changed_configs:
+                continue
+            self.apply(changed_metrics, changed_configs)
+            self.render()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def watch_compare_metrics(metrics_dir="experiments", configs_dir="experiments", save_path=None,
+                          priority_metric="accuracy", top_k=DEFAULT_WATCH_TOP_K,
+                          debounce_seconds=DEFAULT_WATCH_DEBOUNCE_SECONDS, max_refreshes=None,
+                          max_latency_seconds=DEFAULT_WATCH_MAX_LATENCY_SECONDS):
+    """Run compare-metrics in watch mode until Ctrl+C (see MetricsWatch)."""
+    with MetricsWatch(metrics_dir, configs_dir, priority_metric, top_k, save_path, debounce_seconds,
+                      max_latency_seconds) as watch:
+        try:
+            watch.run(max_refreshes)
+        except KeyboardInterrupt:
+            pass
+    return watch
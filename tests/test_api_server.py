@@ -0,0 +1,86 @@
+import json
+import asyncio
+from scripts.api_server import ExperimentAPI, TestClient, start_server
+
+def write_experiment(root, name, accuracy, model_name="RandomForestClassifier"):
+    (root / name).mkdir(exist_ok=True)
+    (root / name / "config.json").write_text(json.dumps({"model_name": model_name, "dataset": "iris"}))
+    (root / name / "metrics.json").write_text(json.dumps({"accuracy": accuracy}))
+
+def make_client(root, n=5):
+    for i in range(1, n + 1):
+        write_experiment(root, f"exp{i}", 0.7 + i / 100, "LogisticRegression" if i % 2 else "RandomForestClassifier")
+    return TestClient(ExperimentAPI(str(root), refresh_seconds=0))
+
+# test pagination, filters and single experiments
+def test_experiments(tmp_path):
+    client = make_client(tmp_path)
+    page = client.get("/experiments?limit=2&offset=2").json()
+    assert [item["experiment"] for item in page["items"]] == ["exp3", "exp4"]
+    assert (page["total"], page["next_offset"]) == (5, 4)
+    assert client.get("/experiments?where=model_name == RandomForestClassifier").json()["total"] == 2
+    assert client.get("/experiments/exp2").json()["config"]["model_name"] == "RandomForestClassifier"
+    assert client.get("/experiments/exp9").status == 404
+    assert client.get("/experiments?limit=0").status == 400
+    assert client.get("/experiments?limit=0").json()["error"] == "'limit' must be between 1 and 1000"
+    assert client.get("/experiments?offset=-1").json()["error"] == "'offset' must be >= 0"
+
+# test the leaderboard and recommendation endpoints
+def test_leaderboard_and_recommendations(tmp_path):
+    client = make_client(tmp_path)
+    board = client.get("/leaderboard?metric=accuracy&limit=2&offset=1").json()
+    assert [(row["experiment"], row["rank"]) for row in board["items"]] == [("exp4", 2), ("exp3", 3)]
+    assert board["total"] == 5
+    summary = client.get("/recommendations?metric=accuracy").json()["recommendations"]["summary"]
+    assert summary.startswith("RECOMMENDATION: Model 'exp5' (LogisticRegression on iris)")
+
+# test that the ETag follows the experiments root and conditional requests get a 304
+def test_etag(tmp_path):
+    client = make_client(tmp_path)
+    first = client.get("/leaderboard")
+    etag = first.headers["ETag"]
+    assert client.get("/leaderboard", {"If-None-Match": etag}).status == 304
+    write_experiment(tmp_path, "exp6", 0.99)
+    changed = client.get("/leaderboard", {"If-None-Match": etag})
+    assert changed.status == 200 and changed.headers["ETag"] != etag
+    assert changed.json()["items"][0]["experiment"] == "exp6"
+
+# test that percent-encoded paths and queries resolve, and a 304 never hides a 404 or a 400
+def test_encoded_paths_and_conditional_errors(tmp_path):
+    client = make_client(tmp_path)
+    write_experiment(tmp_path, "exp 7", 0.5)
+    assert client.get("/experiments/exp%207").json()["experiment"] == "exp 7"
+    assert client.get("/experiments?where=model_name%20%3D%3D%20RandomForestClassifier").json()["total"] == 3
+    etag = client.get("/health").headers["ETag"]
+    assert client.get("/experiments/exp9", {"If-None-Match": etag}).status == 404
+    assert client.get("/nowhere", {"If-None-Match": etag}).status == 404
+    assert client.get("/experiments?limit=0", {"If-None-Match": etag}).status == 400
+    assert client.get("/experiments/exp%207", {"If-None-Match": etag}).status == 304
+
+# test the asyncio server with concurrent keep-alive connections
+def test_server_concurrent(tmp_path):
+    make_client(tmp_path)
+    app = ExperimentAPI(str(tmp_path))
+
+    async def fetch(port, paths):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        statuses = []
+        for path in paths:
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+            await writer.drain()
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            length = int(head.lower().split("content-length:")[1].split("\r\n")[0])
+            body = json.loads(await reader.readexactly(length))
+            statuses.append((int(head.split(" ")[1]), body))
+        writer.close()
+        return statuses
+
+    async def main():
+        server = await start_server(app, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(*[fetch(port, ["/health", "/leaderboard?limit=1"]) for _ in range(20)])
+
+    for (health, board) in asyncio.run(main()):
+        assert health == (200, {"status": "ok", "experiments": 5, "fingerprint": app.fingerprint})
+        assert board[1]["items"][0]["experiment"] == "exp5"
@@ -0,0 +1,37 @@
+import json
+import pandas as pd
+from pathlib import Path
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from scripts.batch_packaging import package_results_batch, write_shared_test_data, open_shared_test_data
+from scripts.package_results import evaluate_classification_model
+from scripts.serialization import save_model
+
+# test that the shared test set is memory-mapped back with its column names
+def test_shared_test_data(tmp_path):
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    spec = write_shared_test_data(tmp_path, [(X[:100], y[:100]), (X[100:], y[100:])])
+    test_x, test_y = open_shared_test_data(spec)
+    assert isinstance(test_x, pd.DataFrame)
+    assert (test_x.to_numpy() == X.to_numpy()).all()
+    assert (test_y == y.to_numpy()).all()
+
+# test that every model gets its own experiment with the same metrics as a sequential evaluation
+def test_package_results_batch(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    models = [RandomForestClassifier(n_estimators=n, random_state=0).fit(X, y) for n in (5, 10)]
+    models.append(LogisticRegression(max_iter=500).fit(X, y))
+    # one of the models is given as a file path
+    save_model(models[2], tmp_path)
+
+    out_dir = tmp_path / "experiments"
+    results = package_results_batch(models[:2] + [str(tmp_path / "model.pkl")], X, y,
+                                    output_dir=str(out_dir), n_jobs=2)
+
+    assert all(r["error"] is None for r in results)
+    assert len({r["exp_path"] for r in results}) == 3
+    for model, result in zip(models, results):
+        metrics = json.loads((Path(result["exp_path"]) / "metrics.json").read_text())
+        assert metrics["accuracy"] == evaluate_classification_model(model, X, y)["accuracy"]
+        assert result["seconds"] > 0
@@ -0,0 +1,20 @@
+import json
+from benchmarks.generate import generate_experiment_tree
+from benchmarks.run_benchmarks import run_benchmarks
+from scripts.compare_metrics import load_exp_metrics, load_exp_configs
+
+# test that the generator creates realistic experiment folders
+def test_generate_experiment_tree(tmp_path):
+    generate_experiment_tree(tmp_path, 5)
+    metrics = load_exp_metrics(tmp_path)
+    configs = load_exp_configs(tmp_path)
+    assert list(metrics) == [f"exp{i}" for i in range(1, 6)]
+    assert "parameters" in configs["exp1"]
+    assert (tmp_path / "exp5" / "model.pkl").exists()
+
+# smoke test of the whole suite on tiny inputs, the report must be JSON serializable
+def test_run_benchmarks(tmp_path):
+    report = run_benchmarks(sizes=[10], test_rows=[500], repeat=1, memory=False, workdir=str(tmp_path))
+    stages = {r["stage"] for r in report["results"]}
+    assert {"load_exp_metrics_cold", "give_recommendation", "plot_metrics", "package_results"} <= stages
+    json.dumps(report)
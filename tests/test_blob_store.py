@@ -0,0 +1,47 @@
+import os
+import json
+import time
+import shutil
+from pathlib import Path
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from scripts.blob_store import BlobStore, collect_garbage
+from scripts.package_results import package_results
+from scripts.serialization import load_model
+
+def list_blobs(root):
+    return sorted(digest for digest, _ in BlobStore(root).iter_blobs())
+
+# test that identical models are stored once and every experiment loads its model from the blob
+def test_dedup_package_results(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    exp_paths = [Path(package_results(model, X, y, dataset_name=f"d{i}", output_dir=tmp_path, dedup=True))
+                 for i in range(3)]
+    joblib_exp = Path(package_results(model, X, y, output_dir=tmp_path, dedup=True, model_format="joblib"))
+
+    assert len(list_blobs(tmp_path)) == 2
+    configs = [json.loads((p / "config.json").read_text()) for p in exp_paths]
+    assert len({c["model_artifact"]["blob"] for c in configs}) == 1
+    assert not (exp_paths[0] / "model.pkl").exists()
+    for exp_path in exp_paths + [joblib_exp]:
+        assert (load_model(str(exp_path)).predict(X) == model.predict(X)).all()
+
+# test that gc only removes unreferenced blobs older than the grace period
+def test_gc(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    kept = Path(package_results(LogisticRegression(max_iter=500).fit(X, y), X, y, output_dir=tmp_path, dedup=True))
+    dropped = Path(package_results(RandomForestClassifier(n_estimators=3).fit(X, y), X, y, output_dir=tmp_path,
+                                   dedup=True))
+    dropped_blob = json.loads((dropped / "config.json").read_text())["model_artifact"]["blob"]
+    shutil.rmtree(dropped)
+
+    assert collect_garbage(tmp_path)["removed"] == 0
+    old = time.time() - 7200
+    os.utime(BlobStore(tmp_path).path(dropped_blob), (old, old))
+    assert collect_garbage(tmp_path, dry_run=True)["removed"] == 1
+    stats = collect_garbage(tmp_path)
+    assert stats["removed"] == 1 and stats["kept"] == 1
+    assert dropped_blob not in list_blobs(tmp_path)
+    assert load_model(str(kept)) is not None
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from pathlib import Path
+from click.testing import CliRunner
+from cli.cli import cli
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Heavy dependencies that must only be imported by the commands that need them
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "sklearn", "streamlit", "pyarrow"]
+# Budget for `import cli.cli` (cumulative import time, in microseconds)
+IMPORT_TIME_BUDGET_US = 300_000
+
+# test that importing the CLI entry point does not load any heavy dependency
+def test_cli_import_is_light():
+    code = f"import sys, cli.cli; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+# import-time regression benchmark, based on python -X importtime
+def test_cli_import_time_budget():
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import cli.cli"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    line = next(l for l in out.stderr.splitlines() if l.rstrip().endswith("| cli.cli"))
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < IMPORT_TIME_BUDGET_US
+
+# test the hello command and the help output
+def test_hello_and_help():
+    runner = CliRunner()
+    assert runner.invoke(cli, ["hello"]).output == "Hello from the MLOps CLI!\n"
+    result = runner.invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    assert "compare-metrics" in result.output
@@ -5,7 +5,9 @@ from scripts.compare_metrics import (
     load_exp_configs,
     conversion_to_df,
     plot_metrics,
-    give_recommendation
+    give_recommendation,
+    leaderboard,
+    lower_is_better
 )
 
 # test load_exp_metrics
@@ -61,3 +63,79 @@ def test_plot_metrics(tmp_path):
     fig = plot_metrics(df, save_path)
     assert save_path.exists()
     assert fig is not None
+
+# test the fallback order of give_recommendation when the priority metric is missing
+def test_give_recommendation_fallback():
+    df = pd.DataFrame({
+        "accuracy": [0.95, None, None, None],
+        "f1_score": [None, 0.8, None, None],
+        "loss": [None, None, 0.3, None],
+        "timestamp": ["2025-01-01T00:00:00"] * 4,
+    }, index=["exp1", "exp2", "exp3", "exp4"])
+    recs = give_recommendation(df, priority_metric="recall")
+    assert recs["exp1"] == "Good performance (accuracy: 0.9500)"
+    assert recs["exp2"] == "Average performance (F1-score: 0.8000)"
+    assert recs["exp3"] == "Performance based on loss: 0.3000"
+    assert recs["exp4"] == "Error 404 No metrics available for evaluation"
+    assert "summary" not in recs
+
+# test the top-k leaderboard
+def test_leaderboard():
+    df = pd.DataFrame({"accuracy": [0.6, 0.95, None, 0.75], "loss": [0.4, 0.1, 0.2, 0.3]},
+                      index=["exp1", "exp2", "exp3", "exp4"])
+    board = leaderboard(df, "accuracy", k=2)
+    assert list(board.index) == ["exp2", "exp4"]
+    assert list(board["tier"]) == ["Good", "Average"]
+    assert list(leaderboard(df, "loss", ascending=True).index) == ["exp2", "exp3", "exp4", "exp1"]
+
+# test that large result sets are plotted as a distribution of the numeric metrics only
+def test_plot_metrics_large(tmp_path):
+    n = 500
+    df = pd.DataFrame({
+        "accuracy": [i / n for i in range(n)],
+        "loss": [0.0] * n,
+        "timestamp": ["2025-01-01T00:00:00"] * n,
+        "confusion_matrix": [[[1, 0], [0, 1]]] * n,
+    }, index=[f"exp{i}" for i in range(n)])
+    fig = plot_metrics(df, tmp_path / "plot.png")
+    assert [t.get_text() for t in fig.axes[0].get_xticklabels()] == ["accuracy", "loss"]
+
+    fig = plot_metrics(df, top_k=5, sort_by="accuracy")
+    assert [t.get_text() for t in fig.axes[0].get_xticklabels()] == [f"exp{i}" for i in range(499, 494, -1)]
+
+# test that latency and size metrics rank the smallest value first
+def test_lower_is_better_ranking():
+    df = pd.DataFrame({"accuracy": [0.9, 0.8, 0.95], "latency_p95_ms": [2.0, 0.5, 4.0]},
+                      index=["exp1", "exp2", "exp3"])
+    assert list(leaderboard(df, "latency_p95_ms").index) == ["exp2", "exp1", "exp3"]
+    assert "tier" not in leaderboard(df, "latency_p95_ms").columns
+    recs = give_recommendation(df, priority_metric="latency_p95_ms")
+    assert recs["exp2"] == "Rank 1/3 (latency_p95_ms: 0.5000) (BEST MODEL)"
+    assert "'exp2'" in recs["summary"]
+
+# test that throughput ranks the largest value first and gets a rank instead of a Good/Average/Poor tier
+def test_throughput_higher_is_better():
+    df = pd.DataFrame({"throughput_rows_per_s": [1500.0, 90000.0, 0.5]}, index=["exp1", "exp2", "exp3"])
+    assert not lower_is_better("throughput_rows_per_s")
+    assert list(leaderboard(df, "throughput_rows_per_s").index) == ["exp2", "exp1", "exp3"]
+    assert "tier" not in leaderboard(df, "throughput_rows_per_s").columns
+    recs = give_recommendation(df, priority_metric="throughput_rows_per_s")
+    assert recs["exp2"] == "Rank 1/3 (throughput_rows_per_s: 90000.0000) (BEST MODEL)"
+    assert recs["exp3"] == "Rank 3/3 (throughput_rows_per_s: 0.5000)"
+    assert "'exp2'" in recs["summary"]
+
+# test that overlapping confidence intervals are shown and flagged as ties with the best model
+def test_tied_winners():
+    df = pd.DataFrame({
+        "accuracy": [0.90, 0.88, 0.70],
+        "confidence_intervals": [{"accuracy": [0.86, 0.94]}, {"accuracy": [0.84, 0.92]}, {"accuracy": [0.65, 0.75]}],
+        "confidence_level": [0.95] * 3,
+    }, index=["exp1", "exp2", "exp3"])
+    recs = give_recommendation(df, priority_metric="accuracy")
+    assert recs["exp1"] == "Average performance (accuracy: 0.9000 [0.8600, 0.9400]) (BEST MODEL)"
+    assert recs["exp2"].endswith("(TIED WITH BEST)")
+    assert "TIED" not in recs["exp3"]
+    assert "statistically tied with exp2 (overlapping 95% confidence intervals)" in recs["summary"]
+    board = leaderboard(df, "accuracy")
+    assert list(board["tied_with_best"]) == [True, True, False]
+    assert list(board["accuracy_low"]) == [0.86, 0.84, 0.65]
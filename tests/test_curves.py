@@ -0,0 +1,41 @@
+import json
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import load_breast_cancer, load_iris
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score, average_precision_score, roc_curve
+from scripts.curves import binary_curves, downsample, load_curves
+from scripts.package_results import package_results
+
+# test that the one-sort sweep matches sklearn, ties and single-class labels included
+def test_binary_curves_match_sklearn():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 1000).astype(bool)
+    scores = np.round(rng.random(1000) * 0.5 + y * 0.3, 2)
+    curves = binary_curves(y, scores)
+    assert np.isclose(curves["roc_auc"], roc_auc_score(y, scores))
+    assert np.isclose(curves["pr_auc"], average_precision_score(y, scores))
+    fpr, tpr, _ = roc_curve(y, scores, drop_intermediate=False)
+    assert np.allclose(curves["roc_fpr"], fpr) and np.allclose(curves["roc_tpr"], tpr)
+    assert binary_curves(np.ones(5), np.arange(5)) is None
+
+# test that downsampling keeps both ends of the curve
+def test_downsample():
+    keep = downsample(10_000, 200)
+    assert len(keep) == 200 and keep[0] == 0 and keep[-1] == 9_999
+    assert list(downsample(5, 200)) == [0, 1, 2, 3, 4]
+
+# test that packaging a binary classifier stores the AUCs and compact curves, multiclass gets none
+def test_package_results_curves(tmp_path):
+    X, y = load_breast_cancer(return_X_y=True)
+    model = LogisticRegression(max_iter=5000).fit(X, y)
+    exp_path = Path(package_results(model, X, y, output_dir=tmp_path, batch_size=100, curve_points=50))
+    metrics = json.loads((exp_path / "metrics.json").read_text())
+    assert np.isclose(metrics["roc_auc"], roc_auc_score(y, model.predict_proba(X)[:, 1]))
+    curves = load_curves(exp_path)
+    assert len(curves["roc_fpr"]) <= 50 and curves["pr_precision"].dtype == np.float32
+
+    X, y = load_iris(return_X_y=True)
+    exp_path = Path(package_results(LogisticRegression(max_iter=500).fit(X, y), X, y, output_dir=tmp_path))
+    assert "roc_auc" not in json.loads((exp_path / "metrics.json").read_text())
+    assert load_curves(exp_path) is None
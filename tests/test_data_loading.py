@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.data_loading import iter_labeled_batches, read_columns, parse_dtype
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "age": rng.integers(20, 80, size=250),
+        "chol": rng.normal(200, 30, size=250),
+        "label": rng.integers(0, 2, size=250),
+    })
+
+def collect(batches):
+    xs, ys = zip(*batches)
+    return pd.concat(xs, ignore_index=True), np.concatenate(ys)
+
+# test that CSV, Parquet and Feather inputs are streamed in chunks with the label split out
+@pytest.mark.parametrize("suffix,engine", [(".csv", "c"), (".csv", "pyarrow"), (".parquet", "c"), (".feather", "c")])
+def test_iter_labeled_batches(tmp_path, frame, suffix, engine):
+    path = tmp_path / f"test{suffix}"
+    if suffix == ".csv":
+        frame.to_csv(path, index=False)
+    elif suffix == ".parquet":
+        frame.to_parquet(path)
+    else:
+        frame.to_feather(path)
+
+    batches = list(iter_labeled_batches(path, "label", chunksize=100, engine=engine))
+    assert [len(y) for _, y in batches] == [100, 100, 50]
+    x, y = collect(batches)
+    assert list(x.columns) == ["age", "chol"]
+    assert (y == frame["label"].to_numpy()).all()
+    assert np.allclose(x["chol"], frame["chol"])
+    assert read_columns(path) == ["age", "chol", "label"]
+
+# test explicit dtypes and downcasting of the feature columns
+def test_dtype_and_downcast(tmp_path, frame):
+    path = tmp_path / "test.csv"
+    frame.to_csv(path, index=False)
+    x, y = collect(iter_labeled_batches(path, "label", dtype=parse_dtype("float32")))
+    assert (x.dtypes == np.float32).all()
+    assert y.dtype.kind == "i"
+    x, _ = collect(iter_labeled_batches(path, "label", downcast=True))
+    assert x["age"].dtype == np.int8 and x["chol"].dtype == np.float32
@@ -0,0 +1,53 @@
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, confusion_matrix
+from scripts.evaluation import ConfusionMatrixAccumulator, metrics_from_confusion_matrix, bootstrap_confidence_intervals
+from scripts.package_results import evaluate_classification_model
+
+# test that batched accumulation gives the same matrix as sklearn, even when labels appear late
+def test_accumulator_matches_sklearn():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 4, size=1000)
+    y_pred = rng.integers(0, 4, size=1000)
+    y_true[:500] = np.minimum(y_true[:500], 1)
+    y_pred[:500] = np.minimum(y_pred[:500], 1)
+
+    acc = ConfusionMatrixAccumulator()
+    for start in range(0, 1000, 128):
+        acc.update(y_true[start:start + 128], y_pred[start:start + 128])
+    assert acc.labels.tolist() == [0, 1, 2, 3]
+    assert (acc.matrix == confusion_matrix(y_true, y_pred)).all()
+
+# test that the metrics derived from the confusion matrix match sklearn's weighted scores
+def test_metrics_from_confusion_matrix():
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 3, size=500)
+    y_pred = np.where(rng.random(500) < 0.7, y_true, 3)
+    scores = metrics_from_confusion_matrix(confusion_matrix(y_true, y_pred))
+    assert np.isclose(scores["accuracy"], accuracy_score(y_true, y_pred))
+    assert np.isclose(scores["f1_score"], f1_score(y_true, y_pred, average="weighted"))
+    assert np.isclose(scores["precision"], precision_score(y_true, y_pred, average="weighted", zero_division=0))
+    assert np.isclose(scores["recall"], recall_score(y_true, y_pred, average="weighted", zero_division=0))
+
+# test that the batch size does not change the evaluation result
+def test_evaluate_batch_size():
+    X, y = load_iris(return_X_y=True)
+    model = RandomForestClassifier(random_state=0).fit(X[::2], y[::2])
+    assert evaluate_classification_model(model, X, y, batch_size=7) == evaluate_classification_model(model, X, y)
+
+# test that the multinomial bootstrap matches resampling rows, and stays fast for a million rows
+def test_bootstrap_confidence_intervals():
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 3, size=400)
+    y_pred = np.where(rng.random(400) < 0.8, y_true, rng.integers(0, 3, size=400))
+    cm = confusion_matrix(y_true, y_pred)
+    intervals = bootstrap_confidence_intervals(cm, n_resamples=2000)
+    rows = rng.integers(0, 400, size=(2000, 400))
+    by_rows = np.percentile((y_true[rows] == y_pred[rows]).mean(axis=1), [2.5, 97.5])
+    assert np.allclose(intervals["accuracy"], by_rows, atol=0.01)
+    assert intervals["f1_score"][0] < metrics_from_confusion_matrix(cm)["f1_score"] < intervals["f1_score"][1]
+
+    big = (cm * 2500).astype(np.int64)
+    low, high = bootstrap_confidence_intervals(big, n_resamples=5000)["accuracy"]
+    assert high - low < 0.005
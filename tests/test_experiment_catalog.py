@@ -0,0 +1,54 @@
+import json
+import os
+from scripts.experiment_catalog import ExperimentCatalog, flatten_dict, load_documents
+
+def write_json(path, data):
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(data))
+
+# test flatten_dict, nested parameters become dotted keys
+def test_flatten_dict():
+    flat = flatten_dict({"model_name": "RF", "parameters": {"n_estimators": 100, "max_depth": None}})
+    assert flat == {"model_name": "RF", "parameters.n_estimators": 100, "parameters.max_depth": None}
+
+# test that documents are returned in natural experiment order
+def test_load_documents_order(tmp_path):
+    for i in (10, 2, 1):
+        write_json(tmp_path / f"exp{i}" / "metrics.json", {"accuracy": i / 10})
+    assert list(load_documents(tmp_path, "metrics.json")) == ["exp1", "exp2", "exp10"]
+
+# test that a refresh only re-parses added, changed or removed experiments
+def test_refresh_is_incremental(tmp_path):
+    write_json(tmp_path / "exp1" / "metrics.json", {"accuracy": 0.5})
+    write_json(tmp_path / "exp2" / "metrics.json", {"accuracy": 0.6})
+    with ExperimentCatalog(tmp_path) as catalog:
+        assert catalog.refresh("metrics.json") == 2
+        assert catalog.refresh("metrics.json") == 0
+
+    # the catalog is persistent, a new instance does not re-parse anything
+    path = tmp_path / "exp1" / "metrics.json"
+    write_json(path, {"accuracy": 0.75})
+    os.utime(path, ns=(1, 1))
+    (tmp_path / "exp2" / "metrics.json").unlink()
+    with ExperimentCatalog(tmp_path) as catalog:
+        assert catalog.refresh("metrics.json") == 2
+        assert catalog.load("metrics.json") == {"exp1": {"accuracy": 0.75}}
+
+# test that a missing experiments directory gives an empty result and is not created
+def test_missing_directory(tmp_path):
+    assert load_documents(tmp_path / "nothing", "metrics.json") == {}
+    assert not (tmp_path / "nothing").exists()
+
+# test that refreshing and loading more experiments than the SQLite variable limit works
+def test_many_experiments(tmp_path):
+    import sqlite3
+    import pytest
+    write_json(tmp_path / "exp1" / "metrics.json", {"accuracy": 0.9})
+    names = ["exp1"] + [f"missing{i}" for i in range(1000)]
+    with ExperimentCatalog(tmp_path) as catalog:
+        if not hasattr(catalog.conn, "setlimit"):
+            pytest.skip("Connection.setlimit needs Python 3.11")
+        # Builds use limits from 999 to 250000, lower it so the test does not depend on the build
+        catalog.conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 100)
+        assert catalog.refresh("metrics.json", names) == 1
+        assert catalog.load("metrics.json", experiments=names) == {"exp1": {"accuracy": 0.9}}
@@ -0,0 +1,40 @@
+import json
+import pyarrow as pa
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from scripts.compare_metrics import run_compare_metrics
+from scripts.experiment_table import export_experiment_table, read_experiment_table, read_table_schema, metric_columns
+from scripts.package_results import package_results
+
+def package_two(root):
+    X, y = load_iris(return_X_y=True)
+    package_results(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y), X, y, output_dir=root,
+                    bootstrap=100)
+    package_results(LogisticRegression(max_iter=500).fit(X, y), X, y, output_dir=root)
+
+# test that configs are flattened into typed columns and metrics keep their shape
+def test_export_types(tmp_path):
+    package_two(tmp_path)
+    for name in ("experiments.arrow", "experiments.parquet"):
+        path = export_experiment_table(tmp_path, str(tmp_path / name))
+        schema = read_table_schema(path)
+        assert schema.field("parameters.n_estimators").type == pa.int64()
+        assert schema.field("accuracy").type == pa.float64()
+        assert "accuracy" in metric_columns(path) and "model_name" not in metric_columns(path)
+
+        df = read_experiment_table(path)
+        assert list(df.index) == ["exp1", "exp2"]
+        assert df.loc["exp1", "parameters.n_estimators"] == 5
+        assert df.loc["exp2", "model_name"] == "LogisticRegression"
+        assert len(df.loc["exp1", "confidence_intervals"]["accuracy"]) == 2
+
+# test that only the requested columns are read, and compare-metrics gives the same result from the table
+def test_projection_and_compare(tmp_path):
+    package_two(tmp_path)
+    path = export_experiment_table(tmp_path)
+    assert list(read_experiment_table(path, ["accuracy", "missing"]).columns) == ["accuracy"]
+
+    _, from_json, _ = run_compare_metrics(tmp_path, tmp_path, priority_metric="accuracy")
+    _, from_table, _ = run_compare_metrics(table_path=path, priority_metric="accuracy")
+    assert from_table == from_json
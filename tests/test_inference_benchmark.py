@@ -0,0 +1,33 @@
+import json
+from pathlib import Path
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LogisticRegression
+from scripts.inference_benchmark import run_inference_benchmark, model_memory_bytes
+from scripts.package_results import package_results
+
+# test that every batch size is timed and capped to the size of the test set
+def test_run_inference_benchmark():
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    results = run_inference_benchmark(model, X, batch_sizes=(1, 32, 1000), repeats=5, warmup=1)
+    assert [r["batch_size"] for r in results] == [1, 32, 150]
+    assert all(0 < r["p50_ms"] <= r["p99_ms"] and r["rows_per_second"] > 0 for r in results)
+
+# test that the in-memory footprint grows with the model
+def test_model_memory_bytes():
+    assert model_memory_bytes(list(range(100_000))) > model_memory_bytes([1])
+
+# test that packaging with the benchmark stores the serving cost as metrics, also for streamed data
+def test_package_results_benchmark(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    batches = ((X[i:i + 50], y[i:i + 50]) for i in range(0, len(X), 50))
+    exp_path = Path(package_results(model, test_batches=batches, output_dir=tmp_path, benchmark_inference=True,
+                                    benchmark_batch_sizes=(1, 16), benchmark_repeats=3))
+    metrics = json.loads((exp_path / "metrics.json").read_text())
+    assert metrics["accuracy"] > 0.9
+    assert metrics["model_size_bytes"] == (exp_path / "model.pkl").stat().st_size
+    assert metrics["latency_p50_ms"] <= metrics["latency_p99_ms"]
+    assert metrics["model_memory_bytes"] > 0 and metrics["throughput_rows_per_s"] > 0
+    detail = json.loads((exp_path / "inference.json").read_text())
+    assert [b["batch_size"] for b in detail["batches"]] == [1, 16]
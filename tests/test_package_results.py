@@ -1,7 +1,7 @@
 from sklearn.datasets import load_iris
 from sklearn.ensemble import RandomForestClassifier
 from pathlib import Path
-from scripts.package_results import evaluate_classification_model, get_model_info, package_results
+from scripts.package_results import evaluate_classification_model, get_model_info, package_results, get_next_exp_number, allocate_exp_dir
 
 # test the evaluate_classification_model function, using the iris dataset from sklearn
 def test_evaluate_model():
@@ -29,3 +29,32 @@ def test_package_results(tmp_path):
     assert (exp_path / "metrics.json").exists()
     assert (exp_path / "config.json").exists()
     assert (exp_path / "model.pkl").exists()
+
+def _allocate_many(args):
+    from scripts.package_results import allocate_exp_dir
+    out_dir, n = args
+    return [allocate_exp_dir(out_dir)[0] for _ in range(n)]
+
+# test that concurrent processes never get the same experiment number
+def test_allocate_exp_dir_concurrent(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+    out_dir = str(tmp_path / "experiments")
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        nums = [n for chunk in pool.map(_allocate_many, [(out_dir, 10)] * 4) for n in chunk]
+    assert sorted(nums) == list(range(1, 41))
+
+# test that the next number comes from the hint file instead of a directory scan
+def test_get_next_exp_number_hint(tmp_path):
+    (tmp_path / "exp3").mkdir()
+    assert get_next_exp_number(tmp_path) == 4
+    allocate_exp_dir(tmp_path)
+    (tmp_path / ".next_exp").write_text("7")
+    assert get_next_exp_number(tmp_path) == 7
+
+# test that a slower process never moves the hint file backwards
+def test_next_exp_hint_only_moves_forward(tmp_path):
+    from scripts.package_results import _write_next_exp_hint
+    _write_next_exp_hint(tmp_path, 9)
+    _write_next_exp_hint(tmp_path, 4)
+    assert (tmp_path / ".next_exp").read_text() == "9"
+    assert allocate_exp_dir(tmp_path)[0] == 9
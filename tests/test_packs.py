@@ -0,0 +1,67 @@
+import os
+import json
+from pathlib import Path
+from sklearn.datasets import load_breast_cancer
+from sklearn.linear_model import LogisticRegression
+from scripts.compare_metrics import load_exp_metrics, load_exp_configs
+from scripts.curves import load_curves
+from scripts.experiment_catalog import ExperimentCatalog
+from scripts.package_results import package_results, get_next_exp_number
+from scripts.packs import compact_experiments, pack_paths
+from scripts.predictions import load_predictions
+from scripts.serialization import load_model
+
+def package_some(root, n):
+    X, y = load_breast_cancer(return_X_y=True)
+    model = LogisticRegression(max_iter=5000).fit(X, y)
+    return X, model, [Path(package_results(model, X, y, output_dir=root)) for _ in range(n)]
+
+# test that compacted experiments disappear from disk but load exactly as before
+def test_compact_and_read_back(tmp_path):
+    X, model, exp_paths = package_some(tmp_path, 3)
+    before = load_exp_metrics(tmp_path)
+
+    stats = compact_experiments(tmp_path, min_age_seconds=0, pack_experiments=2)
+    assert stats["experiments"] == ["exp1", "exp2", "exp3"]
+    assert len(pack_paths(tmp_path)) == 2
+    assert not any(p.exists() for p in exp_paths)
+
+    assert load_exp_metrics(tmp_path) == before
+    assert load_exp_configs(tmp_path)["exp2"]["model_name"] == "LogisticRegression"
+    assert (load_model(str(exp_paths[0])).predict(X) == model.predict(X)).all()
+    assert (load_predictions(exp_paths[1])["y_pred"] == model.predict(X)).all()
+    assert len(load_curves(exp_paths[2])["roc_fpr"]) > 0
+
+# test that a warm catalog does not re-parse packed documents and numbers are never reused
+def test_compact_keeps_catalog_and_numbers(tmp_path):
+    package_some(tmp_path, 2)
+    with ExperimentCatalog(tmp_path) as catalog:
+        catalog.refresh("metrics.json")
+    compact_experiments(tmp_path, min_age_seconds=0)
+    with ExperimentCatalog(tmp_path) as catalog:
+        assert catalog.refresh("metrics.json") == 0
+
+    os.remove(tmp_path / ".next_exp")
+    assert get_next_exp_number(tmp_path) == 3
+    _, _, (exp_path,) = package_some(tmp_path, 1)
+    assert exp_path.name == "exp3"
+    assert list(load_exp_metrics(tmp_path)) == ["exp1", "exp2", "exp3"]
+
+# test that recently written experiments are left alone
+def test_compact_min_age(tmp_path):
+    package_some(tmp_path, 1)
+    assert compact_experiments(tmp_path)["experiments"] == []
+    assert (tmp_path / "exp1" / "metrics.json").exists()
+
+# test that allocation trusts the hint written by compaction without reading the pack indexes
+def test_allocation_trusts_hint(tmp_path, monkeypatch):
+    import scripts.package_results as package_module
+    package_some(tmp_path, 2)
+    compact_experiments(tmp_path, min_age_seconds=0)
+    (tmp_path / "exp3").mkdir()
+
+    def no_packs(experiments_dir):
+        raise AssertionError("the pack indexes were read")
+    monkeypatch.setattr(package_module, "packed_experiments", no_packs)
+    assert package_module.allocate_exp_dir(tmp_path)[0] == 4
+
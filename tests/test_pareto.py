@@ -0,0 +1,58 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.compare_metrics import run_compare_metrics
+from scripts.pareto import parse_objectives, pareto_front, pareto_ranking, weighted_scores
+
+def brute_force_front(costs):
+    no_worse = (costs[:, None, :] <= costs[None]).all(axis=2)
+    better = (costs[:, None, :] < costs[None]).any(axis=2)
+    return ~(no_worse & better).any(axis=0)
+
+# test parsing of objectives and their default directions
+def test_parse_objectives():
+    accuracy, latency, size = parse_objectives(["accuracy", "latency_p95_ms:min:0.5", "model_size_bytes:max"])
+    assert (accuracy.maximize, latency.maximize, latency.weight, size.maximize) == (True, False, 0.5, True)
+    with pytest.raises(ValueError):
+        parse_objectives(["accuracy:up"])
+
+# test that negative weights and an all-zero total weight are rejected
+def test_parse_objectives_weights():
+    assert parse_objectives(["accuracy:max:0", "latency_p95_ms:min:1"])[0].weight == 0
+    for specs in (["accuracy:max:-1", "latency_p95_ms:min:2"], ["accuracy:max:0", "latency_p95_ms:min:0"],
+                  ["accuracy:max:nan"], ["accuracy:max:inf"]):
+        with pytest.raises(ValueError):
+            parse_objectives(specs)
+
+# test the skyline against a pairwise comparison, ties and duplicates included
+@pytest.mark.parametrize("k", [2, 3, 4])
+def test_front_matches_brute_force(k):
+    rng = np.random.default_rng(k)
+    df = pd.DataFrame(rng.integers(0, 8, (400, k)), columns=[f"m{i}" for i in range(k)],
+                      index=[f"exp{i}" for i in range(400)])
+    objectives = parse_objectives([f"m{i}:{'max' if i % 2 else 'min'}" for i in range(k)])
+    costs = df.to_numpy(dtype=float) * [(-1 if i % 2 else 1) for i in range(k)]
+    assert (pareto_front(df, objectives).to_numpy() == brute_force_front(costs)).all()
+
+# test that experiments missing a metric are left out and the front is ranked by weighted score
+def test_pareto_ranking():
+    df = pd.DataFrame({"accuracy": [0.9, 0.85, 0.8, 0.95, 0.99],
+                       "latency_p95_ms": [10.0, 5.0, 20.0, 30.0, np.nan]},
+                      index=["exp1", "exp2", "exp3", "exp4", "exp5"])
+    objectives = parse_objectives(["accuracy", "latency_p95_ms"])
+    assert list(pareto_front(df, objectives)[lambda s: s].index) == ["exp1", "exp2", "exp4"]
+    ranking = pareto_ranking(df, parse_objectives(["accuracy:max:1", "latency_p95_ms:min:3"]))
+    assert list(ranking.index) == ["exp2", "exp1", "exp4"]
+    assert weighted_scores(df, objectives)["exp3"] == pytest.approx(((0.8 - 0.8) / 0.15 + (30 - 20) / 25) / 2)
+
+# test the multi-objective output of compare-metrics
+def test_compare_metrics_objectives(tmp_path, capsys):
+    for name, accuracy, latency in [("exp1", 0.9, 10.0), ("exp2", 0.85, 5.0), ("exp3", 0.8, 20.0)]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "metrics.json").write_text(json.dumps({"accuracy": accuracy, "latency_p95_ms": latency}))
+    _, recommendations, _ = run_compare_metrics(str(tmp_path), str(tmp_path), save_path=str(tmp_path / "plot.png"),
+                                                objectives=["accuracy", "latency_p95_ms:min:3"])
+    assert "Model 'exp2'" in recommendations["pareto_summary"]
+    assert "1 dominated experiments filtered out" in recommendations["pareto_summary"]
+    assert "Pareto front (max accuracy, min latency_p95_ms x3)" in capsys.readouterr().out
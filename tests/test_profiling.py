@@ -0,0 +1,62 @@
+import json
+import time
+from pathlib import Path
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LogisticRegression
+from scripts.package_results import package_results
+from scripts.profiling import StageProfiler, profiles_to_frame
+
+# test that spans, totals and artifacts end up in the profile and the Chrome trace
+def test_stage_profiler(tmp_path):
+    profiler = StageProfiler("test")
+    with profiler.stage("evaluate"):
+        time.sleep(0.01)
+    profiler.add("predict", 0.005, parent="evaluate")
+    artifact = tmp_path / "a.bin"
+    artifact.write_bytes(b"x" * 10)
+    profiler.record_artifact("model", artifact)
+
+    profile = profiler.to_dict()
+    assert profile["stages"][0]["name"] == "evaluate" and profile["stages"][0]["seconds"] >= 0.01
+    assert profile["artifacts"]["model"] == {"file": "a.bin", "bytes": 10}
+
+    profiler.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert [e["name"] for e in events] == ["evaluate", "predict"]
+
+# test that memory is reported as the growth of the process peak, not as the peak of an earlier run
+def test_peak_rss_growth(monkeypatch):
+    import scripts.profiling as profiling
+    peaks = iter([100, 100, 900, 900, 900, 900, 900, 900, 900])
+    monkeypatch.setattr(profiling, "peak_rss_bytes", lambda: next(peaks))
+    first = StageProfiler("large model")
+    with first.stage("evaluate"):
+        pass
+    assert first.stages[0]["peak_rss_growth_bytes"] == 800
+    assert first.to_dict()["peak_rss_growth_bytes"] == 800
+
+    # Same worker process, smaller model: the process peak stays at 900
+    second = StageProfiler("small model")
+    with second.stage("evaluate"):
+        pass
+    profile = second.to_dict()
+    assert profile["peak_rss_growth_bytes"] == 0 and profile["stages"][0]["peak_rss_growth_bytes"] == 0
+    assert profile["process_peak_rss_bytes"] == 900
+    assert profiles_to_frame({"exp2": profile}).loc["exp2", "peak_rss_growth_mb"] == 0
+
+# test that package_results writes profile.json, and the optional trace and cProfile files
+def test_package_results_profile(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    exp_path = Path(package_results(model, X, y, output_dir=tmp_path, trace=True, cprofile=True))
+
+    profile = json.loads((exp_path / "profile.json").read_text())
+    stages = [s["name"] for s in profile["stages"]]
+    assert stages[:3] == ["allocate", "save_model", "predict"]
+    assert {"evaluate", "write_metrics", "write_config"} <= set(stages)
+    assert profile["artifacts"]["model"]["bytes"] == (exp_path / "model.pkl").stat().st_size
+    assert (exp_path / "trace.json").exists()
+    assert (exp_path / "cprofile.prof").exists()
+
+    df = profiles_to_frame({"exp1": profile})
+    assert "predict_seconds" in df.columns
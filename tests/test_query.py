@@ -0,0 +1,76 @@
+import json
+import pytest
+from scripts.compare_metrics import run_compare_metrics
+from scripts.experiment_catalog import ExperimentCatalog
+from scripts.experiment_table import export_experiment_table, read_experiment_table
+from scripts.query import (
+    parse_conditions,
+    select_experiments,
+    best_per_group,
+    best_per_group_frame,
+    filter_frame,
+    load_selected
+)
+
+EXPERIMENTS = [
+    ("exp1", "RandomForestClassifier", {"n_estimators": 100}, 0.81),
+    ("exp2", "RandomForestClassifier", {"n_estimators": 300}, 0.86),
+    ("exp3", "LogisticRegression", {"C": 1.0}, 0.84),
+    ("exp4", "LogisticRegression", {"C": 0.1}, 0.79),
+    ("exp10", "RandomForestClassifier", {"n_estimators": 500}, 0.85),
+]
+
+@pytest.fixture
+def experiments(tmp_path):
+    for name, model_name, parameters, accuracy in EXPERIMENTS:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "config.json").write_text(json.dumps({
+            "model_name": model_name, "parameters": parameters, "dataset": "iris",
+            "created_at": "2025-01-01 00:00:00"}))
+        (tmp_path / name / "metrics.json").write_text(json.dumps({"accuracy": accuracy}))
+    return tmp_path
+
+def open_catalog(root):
+    catalog = ExperimentCatalog(root)
+    catalog.refresh("metrics.json")
+    catalog.refresh("config.json")
+    return catalog
+
+# test parsing of filter expressions and their values
+def test_parse_conditions():
+    conditions = parse_conditions(["model_name == 'Random Forest' and parameters.n_estimators >= 200", "debug = true"])
+    assert [(c.key, c.op, c.value) for c in conditions] == [
+        ("model_name", "==", "Random Forest"), ("parameters.n_estimators", ">=", 200.0), ("debug", "==", True)]
+    with pytest.raises(ValueError):
+        parse_conditions("accuracy")
+
+# test that filters on config and metrics fields are combined
+def test_select_experiments(experiments):
+    with open_catalog(experiments) as catalog:
+        assert select_experiments(catalog, parse_conditions("model_name == RandomForestClassifier")) == ["exp1", "exp2", "exp10"]
+        assert select_experiments(catalog, parse_conditions(
+            "model_name == RandomForestClassifier and parameters.n_estimators >= 200 and metrics.accuracy > 0.855")) == ["exp2"]
+        assert select_experiments(catalog, parse_conditions("created_at >= '2025-01-01'")) == ["exp1", "exp2", "exp3", "exp4", "exp10"]
+        assert select_experiments(catalog, parse_conditions("unknown_field == 1")) == []
+        assert list(load_selected(catalog, "metrics.json", ["exp10", "exp3"])) == ["exp3", "exp10"]
+
+# test the best experiment per group, in SQLite and on an exported table
+def test_best_per_group(experiments):
+    with open_catalog(experiments) as catalog:
+        groups = best_per_group(catalog, "model_name", "accuracy")
+        filtered = best_per_group(catalog, "model_name", "accuracy", experiments=["exp1", "exp4"])
+    assert groups.values.tolist() == [["RandomForestClassifier", "exp2", 0.86, 3], ["LogisticRegression", "exp3", 0.84, 2]]
+    assert filtered["experiment"].tolist() == ["exp1", "exp4"]
+
+    table_df = read_experiment_table(export_experiment_table(str(experiments)))
+    assert best_per_group_frame(table_df, "model_name", "accuracy").values.tolist() == groups.values.tolist()
+    assert filter_frame(table_df, parse_conditions("parameters.C < 0.5")).index.tolist() == ["exp4"]
+
+# test that compare-metrics only loads the matching experiments
+def test_compare_metrics_where(experiments, capsys):
+    metrics_df, recommendations, _ = run_compare_metrics(
+        str(experiments), str(experiments), save_path=str(experiments / "plot.png"),
+        where=["model_name == LogisticRegression"], group_by="model_name")
+    assert list(metrics_df.index) == ["exp3", "exp4"]
+    assert recommendations["summary"].startswith("RECOMMENDATION: Model 'exp3' (LogisticRegression on iris)")
+    assert "Best experiment per model_name" in capsys.readouterr().out
@@ -0,0 +1,82 @@
+import json
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import LinearSVC
+from scripts.package_results import package_results
+from scripts.predictions import load_predictions, has_predictions
+from scripts.reevaluate import reevaluate_experiments
+
+# test that packaging caches labels, predictions and probabilities as memory-mappable arrays
+def test_package_results_saves_predictions(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    exp_path = package_results(model, X, y, output_dir=tmp_path, batch_size=40)
+    predictions = load_predictions(exp_path)
+    assert isinstance(predictions["y_pred"], np.memmap)
+    assert (predictions["y_true"] == y).all()
+    assert (predictions["y_pred"] == model.predict(X)).all()
+    assert predictions["y_proba"].shape == (150, 3)
+    assert (predictions["classes"] == model.classes_).all()
+
+# test that models without predict_proba and disabled caching are handled
+def test_predictions_optional(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    exp_path = package_results(LinearSVC().fit(X, y), X, y, output_dir=tmp_path)
+    assert "y_proba" not in load_predictions(exp_path)
+    exp_path = package_results(LinearSVC().fit(X, y), X, y, output_dir=tmp_path, save_predictions=False)
+    assert not has_predictions(exp_path)
+
+# test that the recorder streams every batch to disk, including string labels getting wider
+def test_prediction_recorder_writes_to_disk(tmp_path):
+    from scripts.predictions import PredictionRecorder
+    folder = tmp_path / "predictions"
+    with PredictionRecorder(folder=str(folder)) as recorder:
+        recorder.add(np.array(["a", "b"], dtype=object), np.array(["a", "a"], dtype=object))
+        recorder.add(np.array(["ccc"], dtype=object), np.array(["b"], dtype=object))
+        assert recorder.n_rows == 3 and len(list(folder.glob("*.part"))) == 3
+        arrays = recorder.arrays()
+    assert list(arrays["y_true"]) == ["a", "b", "ccc"] and list(arrays["y_pred"]) == ["a", "a", "b"]
+    assert sorted(p.name for p in folder.iterdir()) == ["y_pred.npy", "y_true.npy"]
+
+    # Without a folder the arrays only live in a temporary directory
+    with PredictionRecorder() as recorder:
+        recorder.add([0, 1], [1, 1])
+        assert len(recorder.arrays()["y_true"]) == 2
+    assert not Path(recorder.folder).exists()
+
+# test that re-evaluation rebuilds the metrics from the cache only and keeps the other values
+def test_reevaluate_experiments(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    exp_paths = [Path(package_results(model, X, y, output_dir=tmp_path)) for _ in range(3)]
+    expected = json.loads((exp_paths[0] / "metrics.json").read_text())
+    for exp_path in exp_paths:
+        (exp_path / "model.pkl").unlink()
+        (exp_path / "metrics.json").write_text(json.dumps({"accuracy": 0.0, "timestamp": "kept"}))
+    (tmp_path / "exp9").mkdir()
+
+    results, skipped = reevaluate_experiments(tmp_path, n_jobs=2)
+    assert skipped == []
+    assert [r["experiment"] for r in results] == ["exp1", "exp2", "exp3"]
+    assert not any(r["error"] for r in results)
+    metrics = json.loads((exp_paths[1] / "metrics.json").read_text())
+    assert metrics["timestamp"] == "kept"
+    assert metrics["accuracy"] == expected["accuracy"]
+    assert metrics["confusion_matrix"] == expected["confusion_matrix"]
+
+# test that experiments compacted into packs are reported and left untouched
+def test_reevaluate_skips_packed_experiments(tmp_path):
+    from scripts.packs import compact_experiments
+    from scripts.reevaluate import packed_experiments_with_predictions
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    package_results(model, X, y, output_dir=tmp_path)
+    compact_experiments(tmp_path, min_age_seconds=0)
+    package_results(model, X, y, output_dir=tmp_path)
+
+    assert packed_experiments_with_predictions(tmp_path) == ["exp1"]
+    results, skipped = reevaluate_experiments(tmp_path, n_jobs=1)
+    assert [r["experiment"] for r in results] == ["exp2"] and skipped == ["exp1"]
+    assert not (tmp_path / "exp1").exists()
@@ -0,0 +1,52 @@
+import json
+import time
+from scripts.experiment_watcher import ExperimentWatcher
+from scripts.run_dashboard import MetricsStore
+
+def write_metrics(root, name, accuracy):
+    (root / name).mkdir(exist_ok=True)
+    (root / name / "metrics.json").write_text(json.dumps({"accuracy": accuracy}))
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.05)
+    return condition()
+
+# test that the watcher only reports experiment folders with a watched file
+def test_watcher_notify(tmp_path):
+    watcher = ExperimentWatcher(tmp_path)
+    watcher.notify(str(tmp_path / "exp1" / "metrics.json"), str(tmp_path / "exp2" / "model.pkl"),
+                   str(tmp_path / "metrics.json"))
+    assert watcher.generation == 1
+    assert watcher.drain() == {"exp1"}
+    assert watcher.drain() == set()
+
+# test that the store picks up new experiments and only bumps its version on changes
+def test_metrics_store_update(tmp_path):
+    write_metrics(tmp_path, "exp1", 0.8)
+    store = MetricsStore(str(tmp_path))
+    try:
+        assert store.update() == 0
+        write_metrics(tmp_path, "exp2", 0.9)
+        assert wait_for(lambda: store.update() == 1 and "exp2" in store.metrics)
+        assert list(store.metrics) == ["exp1", "exp2"]
+        assert store.metrics["exp2"]["accuracy"] == 0.9
+        assert store.update() == 1
+    finally:
+        if store.watcher is not None:
+            store.watcher.stop()
+
+# test that a new version of a cached chart closes the figure it replaces
+def test_chart_cache_closes_superseded_figures():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from scripts.run_dashboard import build_metrics_chart
+    df = pd.DataFrame({"accuracy": [0.8, 0.9]}, index=["exp1", "exp2"])
+    first = build_metrics_chart(1, None, None, df)
+    second = build_metrics_chart(2, None, None, df)
+    assert first is not second
+    assert not plt.fignum_exists(first.number) and plt.fignum_exists(second.number)
+    assert build_metrics_chart(2, None, None, df) is second
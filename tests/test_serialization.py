@@ -0,0 +1,47 @@
+import json
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from scripts.package_results import package_results
+from scripts.serialization import load_model
+
+# test that the model format is recorded in config.json and used when loading the experiment
+def test_joblib_round_trip(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    exp_path = Path(package_results(model, X, y, output_dir=tmp_path, model_format="joblib", compress=3))
+
+    config = json.loads((exp_path / "config.json").read_text())
+    assert config["model_artifact"] == {"file": "model.joblib", "format": "joblib", "compress": 3}
+    assert not (exp_path / "model.pkl").exists()
+    assert (load_model(str(exp_path)).predict(X) == model.predict(X)).all()
+
+# test that uncompressed joblib models can be memory-mapped
+def test_mmap_loading(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    exp_path = package_results(model, X, y, output_dir=tmp_path, model_format="joblib")
+    loaded = load_model(exp_path, mmap_mode="r")
+    assert isinstance(loaded.coef_, np.memmap)
+    assert (loaded.predict(X) == model.predict(X)).all()
+
+# test that compressed joblib models ignore mmap_mode and are read into memory
+def test_mmap_loading_compressed(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    exp_path = package_results(model, X, y, output_dir=tmp_path, model_format="joblib", compress=3)
+    loaded = load_model(exp_path, mmap_mode="r")
+    assert not isinstance(loaded.estimators_[0].tree_.value, np.memmap)
+    assert (loaded.predict(X) == model.predict(X)).all()
+
+# test that experiments without a model_artifact entry still load their model.pkl
+def test_default_pickle(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    exp_path = Path(package_results(model, X, y, output_dir=tmp_path))
+    config = json.loads((exp_path / "config.json").read_text())
+    del config["model_artifact"]
+    (exp_path / "config.json").write_text(json.dumps(config))
+    assert (load_model(str(exp_path)).predict(X) == model.predict(X)).all()
@@ -0,0 +1,76 @@
+import json
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from scripts.compare_metrics import load_exp_metrics, select_metric_columns, conversion_to_df
+from scripts.evaluation import iter_batches
+from scripts.package_results import package_results
+from scripts.streaming_evaluation import StreamingEvaluator, evaluate_stream, load_timeseries
+
+def labels(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, 3, n)
+    y_pred = np.where(rng.random(n) < 0.8, y_true, rng.integers(0, 3, n))
+    return y_true, y_pred
+
+# test that the streamed metrics match sklearn and offline-only values are handled
+def test_matches_full_evaluation(tmp_path):
+    (tmp_path / "metrics.json").write_text(json.dumps({"accuracy": 0.1, "latency_p95_ms": 2.0, "roc_auc": 0.9}))
+    y_true, y_pred = labels()
+    with StreamingEvaluator(str(tmp_path)) as evaluator:
+        for start in range(0, len(y_true), 333):
+            evaluator.update(y_true[start:start + 333], y_pred[start:start + 333])
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["accuracy"] == accuracy_score(y_true, y_pred)
+    assert np.isclose(metrics["f1_score"], f1_score(y_true, y_pred, average="weighted"))
+    assert metrics["latency_p95_ms"] == 2.0 and "roc_auc" not in metrics
+    assert metrics["stream"]["rows"] == 5000 and metrics["stream"]["labels"] == [0, 1, 2]
+
+# test snapshots every flush_rows rows and windows split across batches
+def test_flush_and_windows(tmp_path):
+    y_true, y_pred = labels(2500)
+    evaluator = StreamingEvaluator(str(tmp_path), flush_seconds=3600, flush_rows=1000, window_rows=600)
+    evaluator.update(y_true[:900], y_pred[:900])
+    assert not (tmp_path / "metrics.json").exists()
+    evaluator.update(y_true[900:1500], y_pred[900:1500])
+    assert json.loads((tmp_path / "metrics.json").read_text())["stream"]["rows"] == 1500
+    evaluator.update(y_true[1500:], y_pred[1500:])
+    evaluator.close()
+
+    timeseries = load_timeseries(str(tmp_path))
+    assert timeseries["end_row"].tolist() == [600, 1200, 1800, 2400]
+    assert timeseries["accuracy"].iloc[1] == round(accuracy_score(y_true[600:1200], y_pred[600:1200]), 6)
+
+# test that a resumed stream continues the counts of the previous one
+def test_resume(tmp_path):
+    y_true, y_pred = labels(3000)
+    with StreamingEvaluator(str(tmp_path)) as evaluator:
+        evaluator.update(y_true[:1000], y_pred[:1000])
+    with StreamingEvaluator(str(tmp_path), resume=True) as evaluator:
+        evaluator.update(y_true[1000:], y_pred[1000:])
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["stream"]["rows"] == 3000 and metrics["stream"]["batches"] == 2
+    assert metrics["accuracy"] == accuracy_score(y_true, y_pred)
+
+# test that a resumed stream finishes the unfinished window of the previous one
+def test_resume_window(tmp_path):
+    y_true, y_pred = labels(3000)
+    with StreamingEvaluator(str(tmp_path), window_rows=600) as evaluator:
+        evaluator.update(y_true[:1000], y_pred[:1000])
+    with StreamingEvaluator(str(tmp_path), window_rows=600, resume=True) as evaluator:
+        evaluator.update(y_true[1000:], y_pred[1000:])
+    timeseries = load_timeseries(str(tmp_path))
+    assert timeseries["end_row"].tolist() == [600, 1200, 1800, 2400, 3000]
+    assert timeseries["accuracy"].iloc[1] == round(accuracy_score(y_true[600:1200], y_pred[600:1200]), 6)
+
+# test streaming a packaged experiment, the snapshot is read by compare without predicting again
+def test_evaluate_stream_experiment(tmp_path):
+    X, y = load_iris(return_X_y=True)
+    exp_path = package_results(LogisticRegression(max_iter=500).fit(X[::2], y[::2]), X[::2], y[::2],
+                               output_dir=str(tmp_path), save_predictions=False)
+    metrics = evaluate_stream(exp_path, iter_batches(X, y, batch_size=20), window_rows=50)
+    assert metrics["stream"]["rows"] == 150 and len(load_timeseries(exp_path)) == 3
+    loaded = load_exp_metrics(str(tmp_path))
+    assert loaded["exp1"]["accuracy"] == metrics["accuracy"]
+    assert "stream" not in select_metric_columns(conversion_to_df(loaded)).columns
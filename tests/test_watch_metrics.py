@@ -0,0 +1,77 @@
+import json
+import threading
+import pytest
+from scripts.watch_metrics import IncrementalLeaderboard, MetricsWatch
+
+def write_experiment(root, name, accuracy, model_name="RandomForestClassifier"):
+    (root / name).mkdir(exist_ok=True)
+    (root / name / "config.json").write_text(json.dumps({"model_name": model_name, "dataset": "iris"}))
+    (root / name / "metrics.json").write_text(json.dumps({"accuracy": accuracy, "latency_p95_ms": 10 * accuracy}))
+
+# test that the leaderboard stays sorted through inserts, moves and removals
+def test_incremental_leaderboard():
+    board = IncrementalLeaderboard("accuracy")
+    for exp, accuracy in [("exp1", 0.8), ("exp2", 0.9), ("exp10", 0.9), ("exp3", 0.7)]:
+        board.update(exp, {"accuracy": accuracy})
+    assert board.top(3) == ["exp2", "exp10", "exp1"]
+    board.update("exp3", {"accuracy": 0.95})
+    board.update("exp2", None)
+    board.update("exp1", {"f1_score": 0.5})
+    assert board.top(10) == ["exp3", "exp10"]
+    assert board.rank("exp10") == 2 and board.rank("exp1") is None
+
+    latency = IncrementalLeaderboard("latency_p95_ms")
+    latency.update("exp1", {"latency_p95_ms": 5.0})
+    latency.update("exp2", {"latency_p95_ms": 2.0})
+    assert latency.top(1) == ["exp2"]
+
+# test that only the changed experiments are reloaded and the outputs come from the top k
+def test_apply_and_render(tmp_path, capsys):
+    for i, accuracy in enumerate([0.8, 0.85, 0.7], start=1):
+        write_experiment(tmp_path, f"exp{i}", accuracy)
+    watch = MetricsWatch(str(tmp_path), str(tmp_path), top_k=2, save_path=str(tmp_path / "plot.png"))
+    write_experiment(tmp_path, "exp4", 0.95, "LogisticRegression")
+    watch.apply({"exp4"}, {"exp4"})
+    recommendations = watch.render()
+    assert list(watch.top_frames()[0].index) == ["exp4", "exp2"]
+    assert recommendations["summary"].startswith("RECOMMENDATION: Model 'exp4' (LogisticRegression on iris)")
+    assert (tmp_path / "plot.png").exists()
+    assert "4 experiments, top 2 by accuracy" in capsys.readouterr().out
+
+# test that the watch loop refreshes once after a burst of new experiments
+def test_watch_run(tmp_path):
+    pytest.importorskip("watchdog")
+    write_experiment(tmp_path, "exp1", 0.8)
+    with MetricsWatch(str(tmp_path), str(tmp_path), debounce_seconds=0.3) as watch:
+        runner = threading.Thread(target=watch.run, kwargs={"max_refreshes": 2}, daemon=True)
+        runner.start()
+        for i in range(2, 6):
+            write_experiment(tmp_path, f"exp{i}", 0.8 + i / 100)
+        runner.join(timeout=10)
+    assert not runner.is_alive()
+    assert watch.refreshes == 2
+    assert watch.board.top(1) == ["exp5"]
+
+# test that a sweep that never stops writing still refreshes after max_latency_seconds
+def test_watch_max_latency(tmp_path):
+    pytest.importorskip("watchdog")
+    write_experiment(tmp_path, "exp1", 0.8)
+    stop = threading.Event()
+
+    def keep_writing():
+        i = 2
+        while not stop.is_set():
+            write_experiment(tmp_path, f"exp{i}", 0.5)
+            i += 1
+            stop.wait(0.05)
+
+    with MetricsWatch(str(tmp_path), str(tmp_path), debounce_seconds=0.5, max_latency_seconds=0.5) as watch:
+        runner = threading.Thread(target=watch.run, kwargs={"max_refreshes": 3}, daemon=True)
+        writer = threading.Thread(target=keep_writing, daemon=True)
+        runner.start()
+        writer.start()
+        runner.join(timeout=10)
+        stop.set()
+        writer.join()
+    assert not runner.is_alive()
+    assert watch.refreshes == 3